@@ -0,0 +1,5 @@
+"""
+Ad-hoc performance benchmarks. Run from backend/, e.g.
+
+    python -m benchmarks.bench_rag_modes
+"""
@@ -0,0 +1,101 @@
+"""
+Voice session start: cold (everything loaded per job) vs. warm (prewarmed process).
+
+Measures the room-independent part of a session start in fresh processes,
+without a LiveKit room: VAD and plugin loading, the system prompt fetch
+and pipeline construction. With --first-request it also measures time to
+first LLM token of the session's first turn, with and without the
+connection warm-up (needs OPENAI_API_KEY). Needs the backend running at
+BACKEND_URL for the prompt fetch:
+
+    python -m benchmarks.bench_agent_startup --rounds 5 --first-request
+"""
+import os
+import time
+import asyncio
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, List
+
+from benchmarks.common import summarize
+
+
+async def start_session(components: Dict):
+    """The per-job work the entrypoint does once the participant has joined."""
+    from livekit.agents import llm
+    from livekit.agents.pipeline import VoicePipelineAgent
+    from voice import create_stt, fetch_system_prompt, before_llm_cb, close_backend_client
+
+    initial_ctx = llm.ChatContext()
+    initial_ctx.append(role="system", text=await fetch_system_prompt())
+    VoicePipelineAgent(
+        vad=components["vad"],
+        stt=create_stt(components["stt"]),
+        llm=components["llm"],
+        tts=components["tts"],
+        chat_ctx=initial_ctx,
+        before_llm_cb=before_llm_cb,
+    )
+    await close_backend_client()
+
+
+async def first_token(components: Dict, warm_up: bool) -> float:
+    from livekit.agents import llm
+    from voice import warm_connections
+
+    if warm_up:
+        await warm_connections(components["openai_client"])
+    chat_ctx = llm.ChatContext().append(role="user", text="Say hello.")
+    start = time.perf_counter()
+    stream = components["llm"].chat(chat_ctx=chat_ctx)
+    async for _ in stream:
+        break
+    elapsed = time.perf_counter() - start
+    await stream.aclose()
+    return elapsed
+
+
+def run(mode: str, first_request: bool) -> Dict[str, float]:
+    """One session start in this (fresh) process."""
+    # Imported first: module imports are paid when the worker process starts, in both modes
+    from voice.prewarm import StartupTimer, load_components, prewarm
+
+    if mode == "warm":
+        proc = SimpleNamespace(userdata={}, pid=os.getpid())
+        prewarm(proc)  # runs while the process is idle, before a job is assigned
+        start = time.perf_counter()
+        components = proc.userdata
+    else:
+        start = time.perf_counter()
+        components = load_components(StartupTimer("Cold load"))
+
+    async def session() -> Dict[str, float]:
+        await start_session(components)
+        result = {"start": time.perf_counter() - start}
+        if first_request:
+            result["first_token"] = await first_token(components, warm_up=mode == "warm")
+        return result
+
+    return asyncio.run(session())
+
+
+def main(rounds: int, first_request: bool):
+    context = multiprocessing.get_context("spawn")
+    for mode in ("cold", "warm"):
+        results: List[Dict[str, float]] = []
+        for _ in range(rounds):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                results.append(pool.submit(run, mode, first_request).result())
+        print(summarize(f"{mode} start", [r["start"] for r in results]))
+        if first_request:
+            print(summarize(f"{mode} ttft", [r["first_token"] for r in results]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--first-request", action="store_true")
+    args = parser.parse_args()
+    main(args.rounds, args.first_request)
@@ -0,0 +1,73 @@
+"""
+Chunking engines: character splitter vs. token-aware sentence chunker.
+
+Chunks docs/samples page by page through each engine the way ingestion
+does, then reports chunk counts, chunking time, chunk length in model
+tokens (and how many chunks exceed the model limit and get truncated),
+embedding time and recall@3 on the labelled README questions:
+
+    python -m benchmarks.bench_chunking --token-sizes 128 256
+"""
+import time
+import argparse
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from settings import CHUNK_SIZE, CHUNK_OVERLAP, CHUNK_OVERLAP_TOKENS
+from benchmarks.common import LABELLED_QUERIES, recall_at_3, sample_documents
+
+
+def chunk_corpus(make_splitter: Callable) -> Tuple[List[str], float]:
+    documents = list(sample_documents())
+    start = time.perf_counter()
+    chunks = []
+    for _, pages in documents:
+        splitter = make_splitter()
+        for page_number, text in pages:
+            chunks.extend(splitter.feed(text, page_number))
+        chunks.extend(splitter.finish())
+    return [chunk.text for chunk in chunks], time.perf_counter() - start
+
+
+def main(token_sizes: List[int], overlap_tokens: int):
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from rag.chunking import StreamingSplitter, TokenChunker
+    from rag.embeddings import create_embeddings, create_token_counter, token_limit
+
+    embeddings = create_embeddings()
+    counter = create_token_counter(embeddings)
+    limit = token_limit(embeddings)
+    query_vectors = np.asarray([embeddings.embed_query(query) for query, _ in LABELLED_QUERIES])
+
+    character = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    engines = {f"character:{CHUNK_SIZE}": lambda: StreamingSplitter(character, CHUNK_SIZE)}
+    for size in token_sizes:
+        engines[f"token:{min(size, limit)}"] = (
+            lambda size=size: TokenChunker(counter, min(size, limit), overlap_tokens)
+        )
+
+    print(f"model limit={limit} tokens, token overlap={overlap_tokens}")
+    for name, make_splitter in engines.items():
+        chunks, chunk_seconds = chunk_corpus(make_splitter)
+        lengths = np.asarray(counter.lengths(chunks))
+
+        start = time.perf_counter()
+        vectors = np.asarray(embeddings.embed_documents(chunks))
+        embed_seconds = time.perf_counter() - start
+
+        print(
+            f"{name:<16} chunks={len(chunks):<5} chunk={chunk_seconds * 1000:7.1f}ms "
+            f"embed={embed_seconds:6.2f}s  tokens p50={np.median(lengths):5.0f} "
+            f"p95={np.percentile(lengths, 95):5.0f} max={lengths.max():5d} "
+            f"truncated={int((lengths > limit).sum()):<4} "
+            f"recall@3={recall_at_3(chunks, vectors, query_vectors):.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--token-sizes", nargs="+", type=int, default=[128, 256])
+    parser.add_argument("--overlap-tokens", type=int, default=CHUNK_OVERLAP_TOKENS)
+    args = parser.parse_args()
+    main(args.token_sizes, args.overlap_tokens)
@@ -0,0 +1,114 @@
+"""
+Embedding backends: encode throughput, memory, and parity with fp32 PyTorch.
+
+Each configuration is loaded in a fresh process so its resident memory is
+measured in isolation. The corpus is docs/samples, chunked the way
+ingestion chunks it:
+
+    python -m benchmarks.bench_embeddings --configs base:torch base:onnx-int8 small:onnx-int8
+
+Parity is the cosine between each chunk's vector and the base:torch
+vector (only meaningful within a tier); recall@3 uses the labelled
+README questions with exact search over the chunk vectors.
+"""
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+import numpy as np
+
+from settings import CHUNK_SIZE, CHUNK_OVERLAP
+from benchmarks.common import LABELLED_QUERIES, recall_at_3, sample_documents, unit
+
+BASELINE = "base:torch"
+
+
+def load_chunks() -> List[str]:
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    chunks = []
+    for _, pages in sample_documents():
+        chunks.extend(splitter.split_text("\n".join(text for _, text in pages)))
+    return chunks
+
+
+def rss_mb() -> float:
+    """Resident set size from /proc (Linux only)."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def run_config(config: str, threads: int, chunks: List[str], queries: List[str], rounds: int) -> Tuple:
+    from rag.embeddings import create_embeddings
+
+    tier, backend = config.split(":")
+    before = rss_mb()
+    start = time.perf_counter()
+    embeddings = create_embeddings(tier=tier, backend=backend, threads=threads)
+    embeddings.embed_documents(chunks[:8])  # warm up
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        vectors = embeddings.embed_documents(chunks)
+    throughput = rounds * len(chunks) / (time.perf_counter() - start)
+
+    query_latencies = []
+    query_vectors = []
+    for query in queries:
+        start = time.perf_counter()
+        query_vectors.append(embeddings.embed_query(query))
+        query_latencies.append(time.perf_counter() - start)
+
+    return (
+        np.asarray(vectors, dtype=np.float32),
+        np.asarray(query_vectors, dtype=np.float32),
+        load_seconds,
+        throughput,
+        float(np.median(query_latencies)),
+        rss_mb() - before,
+    )
+
+
+def main(configs: List[str], threads: int, rounds: int):
+    chunks = load_chunks()
+    queries = [query for query, _ in LABELLED_QUERIES]
+    print(f"{len(chunks)} chunks, {rounds} rounds, threads={threads or 'default'}")
+
+    if BASELINE not in configs:
+        configs = [BASELINE, *configs]
+
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for config in configs:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results[config] = pool.submit(run_config, config, threads, chunks, queries, rounds).result()
+
+    baseline = unit(results[BASELINE][0])
+    for config, (vectors, query_vectors, load_s, throughput, query_s, memory) in results.items():
+        if config.split(":")[0] == BASELINE.split(":")[0]:
+            cosines = np.sum(unit(vectors) * baseline, axis=1)
+            parity = f"cos mean={cosines.mean():.4f} min={cosines.min():.4f}"
+        else:
+            parity = "cos n/a (other tier)"
+        print(
+            f"{config:<18} load={load_s:6.1f}s  {throughput:7.1f} chunks/s  "
+            f"query p50={query_s * 1000:6.1f}ms  rss=+{memory:6.0f}MB  "
+            f"dim={vectors.shape[1]:<4} {parity}  recall@3={recall_at_3(chunks, vectors, query_vectors):.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--configs", nargs="+", default=["base:torch", "base:onnx", "base:onnx-int8", "small:onnx-int8"],
+                        help="tier:backend pairs, e.g. base:onnx-int8")
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    main(args.configs, args.threads, args.rounds)
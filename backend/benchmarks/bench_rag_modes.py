@@ -0,0 +1,58 @@
+"""
+Per-turn retrieval latency: backend /query over HTTP vs in-process RAGService.
+
+Needs the backend running at BACKEND_URL with documents ingested, and the
+same CHROMA_PERSIST_DIR. Start the backend with RAG_CACHE_ENABLED=false
+so both modes measure real retrievals:
+
+    python -m benchmarks.bench_rag_modes --iterations 50
+"""
+import os
+
+os.environ.setdefault("RAG_CACHE_ENABLED", "false")
+
+import time
+import asyncio
+import argparse
+
+from settings import HTTP_TIMEOUT_RAG, TOP_K_RESULTS
+from voice import backend_client
+from rag.service import RAGService
+from benchmarks.common import SAMPLE_QUERIES, summarize
+
+
+async def http_retrieve(query: str):
+    resp = await backend_client.request(
+        "POST", "/query", endpoint="query", timeout=HTTP_TIMEOUT_RAG, json={"query": query}
+    )
+    resp.raise_for_status()
+    return resp.json()["results"]
+
+
+async def measure(retrieve, iterations: int):
+    await retrieve(SAMPLE_QUERIES[0])  # warm up connections / model
+    latencies = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        await retrieve(SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)])
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def main(iterations: int):
+    local = RAGService(read_only=True)
+    local.warmup()
+
+    async def inprocess_retrieve(query: str):
+        return await local.retrieve(query, top_k=TOP_K_RESULTS)
+
+    print(summarize("http", await measure(http_retrieve, iterations)))
+    print(summarize("inprocess", await measure(inprocess_retrieve, iterations)))
+    await backend_client.close_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
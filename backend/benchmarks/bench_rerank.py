@@ -0,0 +1,77 @@
+"""
+Recall@k vs latency: retrieval order vs cross-encoder re-ranking.
+
+Runs against the local CHROMA_PERSIST_DIR, so ingest docs/samples first
+(upload both files through the backend). Each labelled query counts as
+recalled when one of its top-k chunks contains the expected answer
+phrase:
+
+    python -m benchmarks.bench_rerank --top-k 3 --candidates 10 20 40
+"""
+import os
+
+os.environ.setdefault("RAG_CACHE_ENABLED", "false")
+
+import time
+import asyncio
+import argparse
+from typing import List, Optional
+
+from settings import RAG_RERANK_MODEL, RAG_RERANK_BATCH_SIZE, RAG_RERANK_MAX_LENGTH, RAG_RERANK_THREADS
+from rag.service import RAGService
+from rag.rerank import CrossEncoderReranker
+from benchmarks.common import LABELLED_QUERIES, contains_phrase, summarize
+
+
+async def evaluate(rag: RAGService, top_k: int, iterations: int):
+    """Return (recall@1, recall@k, latencies) over the labelled queries."""
+    hits_at_1 = hits_at_k = 0
+    latencies = []
+    for _ in range(iterations):
+        for query, phrase in LABELLED_QUERIES:
+            start = time.perf_counter()
+            results = await rag.retrieve(query, top_k=top_k)
+            latencies.append(time.perf_counter() - start)
+            found = [contains_phrase(r["content"], phrase) for r in results]
+            hits_at_1 += bool(found[:1] and found[0])
+            hits_at_k += any(found)
+    total = iterations * len(LABELLED_QUERIES)
+    return hits_at_1 / total, hits_at_k / total, latencies
+
+
+def report(name: str, top_k: int, recall_1: float, recall_k: float, latencies: List[float]) -> str:
+    return f"{summarize(name, latencies)}  recall@1={recall_1:.2f} recall@{top_k}={recall_k:.2f}"
+
+
+async def main(top_k: int, candidates: List[int], iterations: int, budget_ms: Optional[float]):
+    rag = RAGService(read_only=True)
+    rag.warmup()
+
+    rag.reranker = None
+    print(report("vector", top_k, *await evaluate(rag, top_k, iterations)))
+
+    # No budget by default, so the numbers show the full cost of scoring
+    reranker = CrossEncoderReranker(
+        RAG_RERANK_MODEL,
+        candidates=candidates[0],
+        budget_ms=budget_ms if budget_ms is not None else 60_000,
+        batch_size=RAG_RERANK_BATCH_SIZE,
+        max_length=RAG_RERANK_MAX_LENGTH,
+        max_in_flight=RAG_RERANK_THREADS,
+    )
+    reranker.warmup()
+    rag.reranker = reranker
+    for n in candidates:
+        reranker.candidates = n
+        print(report(f"rerank@{n}", top_k, *await evaluate(rag, top_k, iterations)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[10, 20, 40])
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Apply a latency budget (timeouts fall back to retrieval order)")
+    args = parser.parse_args()
+    asyncio.run(main(args.top_k, args.candidates, args.iterations, args.budget_ms))
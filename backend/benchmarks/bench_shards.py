@@ -0,0 +1,81 @@
+"""
+Sharded vector search: query latency and recall against corpus size and shard count.
+
+Fills throwaway Chroma stores with random unit vectors (no embedding
+model needed) and times top-k queries through ShardedCollection's
+parallel fan-out. Recall@k is the overlap with exact brute-force search:
+
+    python -m benchmarks.bench_shards --sizes 10000 50000 --shards 1 2 4 8
+"""
+import time
+import shutil
+import argparse
+import tempfile
+from typing import List
+
+import numpy as np
+
+from rag.shards import ShardedCollection, ShardRouter, shard_names
+from benchmarks.common import summarize
+
+ADD_BATCH = 5000
+
+
+def build(path: str, vectors: np.ndarray, shards: int) -> ShardedCollection:
+    import chromadb
+
+    client = chromadb.PersistentClient(path=path)
+    collections = [
+        client.get_or_create_collection(name, metadata={"hnsw:space": "cosine"}, embedding_function=None)
+        for name in shard_names("bench", shards)
+    ]
+    sharded = ShardedCollection(collections, ShardRouter("hash", shards))
+    for start in range(0, len(vectors), ADD_BATCH):
+        batch = vectors[start:start + ADD_BATCH]
+        ids = [str(start + i) for i in range(len(batch))]
+        sharded.add(ids=ids, embeddings=batch.tolist(), documents=ids, metadatas=[{"source": "bench"}] * len(ids))
+    return sharded
+
+
+def main(sizes: List[int], shard_counts: List[int], dim: int, queries: int, top_k: int):
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        vectors = rng.standard_normal((size, dim)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        probes = rng.standard_normal((queries, dim)).astype(np.float32)
+        probes /= np.linalg.norm(probes, axis=1, keepdims=True)
+        exact = np.argsort(-(probes @ vectors.T), axis=1)[:, :top_k]
+
+        for shards in shard_counts:
+            path = tempfile.mkdtemp(prefix="bench_shards_")
+            try:
+                start = time.perf_counter()
+                sharded = build(path, vectors, shards)
+                build_seconds = time.perf_counter() - start
+
+                sharded.query([probes[0].tolist()], top_k)  # load the HNSW indexes
+                latencies, recall = [], 0.0
+                for probe, truth in zip(probes, exact):
+                    start = time.perf_counter()
+                    result = sharded.query([probe.tolist()], top_k, include=["distances"])
+                    latencies.append(time.perf_counter() - start)
+                    recall += len({int(i) for i in result["ids"][0]} & set(truth.tolist())) / top_k
+                sharded.close()
+            finally:
+                shutil.rmtree(path, ignore_errors=True)
+
+            print(
+                f"{summarize(f'{size}x{shards}', latencies)}  "
+                f"recall@{top_k}={recall / queries:.3f}  build={build_seconds:.1f}s"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10000, 50000])
+    parser.add_argument("--shards", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=20)
+    args = parser.parse_args()
+    main(args.sizes, args.shards, args.dim, args.queries, args.top_k)
@@ -0,0 +1,83 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+import os
+import statistics
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "docs", "samples")
+
+# Questions from the README's sample-document walkthrough
+SAMPLE_QUERIES = [
+    "What are the pricing plans for NexusFlow?",
+    "What are the system requirements for self-hosted deployment?",
+    "How does the workflow execution engine handle errors?",
+    "What integrations does NexusFlow support for CRM?",
+    "What is the SLA uptime guarantee for enterprise customers?",
+    "How many days of PTO do I get in my first year?",
+    "What is the remote work policy?",
+    "What is the parental leave policy for non-birth parents?",
+    "How does the 401k match work?",
+    "What is the process for raising a grievance?",
+]
+
+
+# (query, phrase a relevant chunk contains) for the bundled docs/samples files
+LABELLED_QUERIES = [
+    ("What are the pricing plans for NexusFlow?", "$49/user/month"),
+    ("What are the system requirements for self-hosted deployment?", "32 GB minimum"),
+    ("How does the workflow execution engine handle errors?", "retry policies"),
+    ("What integrations does NexusFlow support for CRM?", "Salesforce, HubSpot"),
+    ("What is the SLA uptime guarantee for enterprise customers?", "99.99% uptime"),
+    ("How many days of PTO do I get in my first year?", "0-2 years tenure: 15 days"),
+    ("What is the remote work policy?", "up to 3 days per week"),
+    ("What is the parental leave policy for non-birth parents?", "Non-birth parent: 8 weeks"),
+    ("How does the 401k match work?", "4% company match"),
+    ("What is the process for raising a grievance?", "Employees may raise concerns through"),
+]
+
+
+def contains_phrase(content: str, phrase: str) -> bool:
+    """Whitespace-insensitive match, since PDF extraction breaks lines mid-sentence."""
+    return " ".join(phrase.split()) in " ".join(content.split())
+
+
+def sample_documents() -> Iterator[Tuple[str, List[Tuple[Optional[int], str]]]]:
+    """Yield (filename, [(page number, text), ...]) for docs/samples; text files have one page, None."""
+    from documents.extraction import pdf_page_count, extract_pdf_pages
+
+    for name in sorted(os.listdir(SAMPLES_DIR)):
+        path = os.path.join(SAMPLES_DIR, name)
+        if name.endswith(".pdf"):
+            pages = extract_pdf_pages(path, 0, pdf_page_count(path))
+            yield name, [(number, text) for number, (text, _) in enumerate(pages, 1)]
+        elif name.endswith(".txt"):
+            with open(path, encoding="utf-8") as f:
+                yield name, [(None, f.read())]
+
+
+def unit(matrix: np.ndarray) -> np.ndarray:
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def recall_at_3(chunks: List[str], vectors: np.ndarray, query_vectors: np.ndarray) -> float:
+    """Share of LABELLED_QUERIES whose phrase is in one of the 3 nearest chunks (exact search)."""
+    similarities = unit(query_vectors) @ unit(vectors).T
+    hits = 0
+    for (_, phrase), row in zip(LABELLED_QUERIES, similarities):
+        top = np.argsort(-row)[:3]
+        hits += any(contains_phrase(chunks[i], phrase) for i in top)
+    return hits / len(LABELLED_QUERIES)
+
+
+def summarize(name: str, latencies: List[float]) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return (
+        f"{name:<14} n={len(ordered):<4} "
+        f"mean={statistics.mean(ordered) * 1000:7.2f}ms "
+        f"p50={statistics.median(ordered) * 1000:7.2f}ms "
+        f"p95={p95 * 1000:7.2f}ms"
+    )
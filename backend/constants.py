@@ -3,18 +3,86 @@ Application-wide constants — static values that don't change per environment.
 """
 
 # ── File upload ───────────────────────────────────────────────
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
+DEFAULT_MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
 ALLOWED_FILE_EXTENSIONS = (".pdf", ".txt")
+UPLOAD_BLOCK_SIZE = 1024 * 1024  # bytes read per spooling step
+MULTIPART_OVERHEAD = 1024 * 1024  # headers and boundaries allowed on top of an upload's size limit
+ARCHIVE_FILE_EXTENSIONS = (".zip",)
+DEFAULT_MAX_BULK_SIZE = 500 * 1024 * 1024  # 500 MB, all files of one bulk upload after zip expansion
+BULK_JOB_MANIFEST = "manifest.json"  # filenames and sizes of a queued bulk upload
+
+# ── Streaming ingestion ──────────────────────────────────────
+PDF_PAGE_BATCH = 4  # pages parsed per executor call
+TEXT_BLOCK_CHARS = 64 * 1024  # characters read per executor call
 
 # ── RAG / Vector store ───────────────────────────────────────
 CHROMA_COLLECTION_NAME = "documents"
+CORPUS_VERSION_FILENAME = ".corpus_version"
 EMBEDDING_MODEL_NAME = "all-mpnet-base-v2"
+# Selectable by EMBEDDING_MODEL_TIER; "base" keeps the original collection name
+EMBEDDING_MODEL_TIERS = {
+    "base": EMBEDDING_MODEL_NAME,
+    "small": "all-MiniLM-L6-v2",
+}
+# Pre-quantized int8 ONNX exports published in the sentence-transformers model repos
+ONNX_QUANTIZED_FILES = {
+    "avx2": "onnx/model_quint8_avx2.onnx",
+    "avx512": "onnx/model_qint8_avx512.onnx",
+    "avx512_vnni": "onnx/model_qint8_avx512_vnni.onnx",
+    "arm64": "onnx/model_qint8_arm64.onnx",
+}
+DEFAULT_RERANK_MODEL_NAME = "cross-encoder/ms-marco-MiniLM-L-6-v2"
 DEFAULT_CHUNK_SIZE = 500
 DEFAULT_CHUNK_OVERLAP = 100
+DEFAULT_CHUNK_TOKENS = 256
+DEFAULT_CHUNK_OVERLAP_TOKENS = 32
 DEFAULT_TOP_K_RESULTS = 3
+BM25_K1 = 1.5
+BM25_B = 0.75
+LEXICAL_INDEX_LOAD_BATCH = 1000  # chunks read from Chroma per page when building the index
+SHARD_REBALANCE_BATCH = 500  # chunks moved between collections per page
+
+# ── Execution pools ──────────────────────────────────────────
+# Which pool each blocking operation runs on. "query" is kept free of
+# ingestion work so retrieval latency stays flat during uploads, and
+# re-ranking has its own pool so scoring that outlives its budget never
+# holds up retrieval.
+DEFAULT_OPERATION_POOLS = {
+    "retrieve": "query",
+    "embed_query": "query",
+    "rerank": "rerank",
+    "embed": "ingest",
+    "chunk": "ingest",
+    "vector_read": "ingest",
+    "vector_write": "ingest",
+    "vector_delete": "ingest",
+    "text_extract": "ingest",
+    "archive_extract": "ingest",
+    "upload_spool": "ingest",
+    "pdf_extract": "process",
+    "vector_reload": "ingest",
+    "rag_load": "ingest",
+}
+DEFAULT_EXECUTOR_POOL = "ingest"
 
 # ── Database ──────────────────────────────────────────────────
 DEFAULT_DB_PATH = "app.db"
+DEFAULT_EMBEDDING_CACHE_FILENAME = "embeddings.db"
+
+# ── Voice agent worker ───────────────────────────────────────
+OPENAI_HTTP_MAX_CONNECTIONS = 50  # shared by the STT, LLM and TTS plugins
+ADMISSION_GRACE_SECONDS = 10.0  # an accepted job counts as a session until the worker lists it
+
+# ── Voice turn tracing ───────────────────────────────────────
+# Stages recorded per user turn; "e2e" is user stopped speaking → agent audio started
+VOICE_TURN_STAGES = ("vad", "stt", "rag", "llm_ttft", "tts_ttfb", "e2e")
+
+# ── Voice chat context ───────────────────────────────────────
+# Message headers that mark the per-turn RAG block and the collapsed history
+RAG_CONTEXT_HEADER = "Use the following document context to answer the user's question:"
+CONTEXT_SUMMARY_HEADER = "Summary of the earlier conversation in this call:"
+CHARS_PER_TOKEN_ESTIMATE = 4  # used when tiktoken is not installed
+MESSAGE_OVERHEAD_TOKENS = 4  # role and delimiters per chat message
 
 # ── Default system prompt (single source of truth) ───────────
 DEFAULT_SYSTEM_PROMPT = (
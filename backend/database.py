@@ -1,17 +1,142 @@
 """
 SQLite database for persistent storage of document metadata and settings.
+
+All access goes through one SQLitePool opened in the app lifespan:
+long-lived connections in WAL mode, so each call skips the connect,
+thread start-up and pragma setup, and reuses sqlite3's per-connection
+prepared-statement cache.
 """
-import aiosqlite
+import time
+import asyncio
 import logging
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import aiosqlite
+
 from constants import DEFAULT_SYSTEM_PROMPT
-from settings import DB_PATH
+from settings import (
+    DB_PATH,
+    SQLITE_POOL_SIZE,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHED_STATEMENTS,
+)
+from observability.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
 
+class SQLitePool:
+    """One writer connection and a fixed set of reader connections.
+
+    SQLite serialises writers, so writes share a single connection behind
+    a lock instead of contending for the file lock; in WAL mode readers run
+    concurrently with it.
+    """
+
+    def __init__(self, path: str, readers: int = SQLITE_POOL_SIZE):
+        self.path = path
+        self.size = readers
+        self._readers: asyncio.Queue = asyncio.Queue()
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._connections = []
+
+    async def open(self):
+        self._writer = await self._connect()
+        for _ in range(self.size):
+            self._readers.put_nowait(await self._connect())
+        logger.info(f"SQLite pool opened: {self.size} readers + 1 writer on {self.path}")
+
+    async def _connect(self) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.path, cached_statements=SQLITE_CACHED_STATEMENTS)
+        conn.row_factory = aiosqlite.Row
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        await conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        await conn.execute("PRAGMA temp_store=MEMORY")
+        self._connections.append(conn)
+        return conn
+
+    async def close(self):
+        for conn in self._connections:
+            await conn.close()
+        self._connections = []
+        self._writer = None
+        self._readers = asyncio.Queue()
+        logger.info("SQLite pool closed")
+
+    @asynccontextmanager
+    async def read(self, operation: str):
+        """Check out a reader connection for ``operation``."""
+        waited = time.perf_counter()
+        conn = await self._readers.get()
+        start = time.perf_counter()
+        metrics.sqlite_pool_wait_seconds.labels(role="read").observe(start - waited)
+        metrics.sqlite_pool_in_use.labels(role="read").inc()
+        try:
+            yield conn
+        finally:
+            metrics.sqlite_query_seconds.labels(operation=operation).observe(time.perf_counter() - start)
+            metrics.sqlite_pool_in_use.labels(role="read").dec()
+            self._readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def write(self, operation: str):
+        """Run the statements issued in the block as one transaction.
+
+        Commits on exit and rolls back if the block raises, so several
+        statements (or an ``executemany``) cost a single commit.
+        """
+        waited = time.perf_counter()
+        async with self._write_lock:
+            start = time.perf_counter()
+            metrics.sqlite_pool_wait_seconds.labels(role="write").observe(start - waited)
+            metrics.sqlite_pool_in_use.labels(role="write").inc()
+            try:
+                yield self._writer
+                await self._writer.commit()
+            except BaseException:
+                await self._writer.rollback()
+                raise
+            finally:
+                metrics.sqlite_query_seconds.labels(operation=operation).observe(time.perf_counter() - start)
+                metrics.sqlite_pool_in_use.labels(role="write").dec()
+
+    def stats(self) -> dict:
+        return {
+            "readers": self.size,
+            "readers_idle": self._readers.qsize(),
+            "writer_busy": self._write_lock.locked(),
+        }
+
+
+_pool: Optional[SQLitePool] = None
+
+
+def get_pool() -> SQLitePool:
+    if _pool is None:
+        raise RuntimeError("Database pool is not open; call init_db() first")
+    return _pool
+
+
+async def close_db():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
 async def init_db():
-    """Create tables and seed defaults."""
-    async with aiosqlite.connect(DB_PATH) as db:
+    """Open the connection pool, create tables and seed defaults."""
+    global _pool
+    if _pool is None:
+        _pool = SQLitePool(DB_PATH)
+        await _pool.open()
+
+    async with _pool.write("init_db") as db:
         await db.execute("""
             CREATE TABLE IF NOT EXISTS documents (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -27,6 +152,74 @@ async def init_db():
                 value TEXT NOT NULL
             )
         """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS ingestion_jobs (
+                id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                file_size INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                pages_parsed INTEGER NOT NULL DEFAULT 0,
+                chunks_embedded INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                results TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        # Per-file results of bulk jobs; added after the table shipped
+        cursor = await db.execute("PRAGMA table_info(ingestion_jobs)")
+        if "results" not in {row["name"] for row in await cursor.fetchall()}:
+            await db.execute("ALTER TABLE ingestion_jobs ADD COLUMN results TEXT")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_documents_filename ON documents (filename)")
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_documents_upload_time ON documents (upload_time, id)"
+        )
+        # Catalogue totals kept current by triggers, so stats never scan documents
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS document_stats (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                document_count INTEGER NOT NULL,
+                total_chunks INTEGER NOT NULL,
+                total_bytes INTEGER NOT NULL
+            )
+        """)
+        # Backfills the counters the first time this runs against an existing catalogue
+        await db.execute("""
+            INSERT OR IGNORE INTO document_stats (id, document_count, total_chunks, total_bytes)
+            SELECT 1, COUNT(*), COALESCE(SUM(chunk_count), 0), COALESCE(SUM(file_size), 0)
+            FROM documents
+        """)
+        await db.execute("""
+            CREATE TRIGGER IF NOT EXISTS documents_stats_insert AFTER INSERT ON documents
+            BEGIN
+                UPDATE document_stats SET
+                    document_count = document_count + 1,
+                    total_chunks = total_chunks + NEW.chunk_count,
+                    total_bytes = total_bytes + NEW.file_size
+                WHERE id = 1;
+            END
+        """)
+        await db.execute("""
+            CREATE TRIGGER IF NOT EXISTS documents_stats_delete AFTER DELETE ON documents
+            BEGIN
+                UPDATE document_stats SET
+                    document_count = document_count - 1,
+                    total_chunks = total_chunks - OLD.chunk_count,
+                    total_bytes = total_bytes - OLD.file_size
+                WHERE id = 1;
+            END
+        """)
+        await db.execute("""
+            CREATE TRIGGER IF NOT EXISTS documents_stats_update
+            AFTER UPDATE OF chunk_count, file_size ON documents
+            BEGIN
+                UPDATE document_stats SET
+                    total_chunks = total_chunks - OLD.chunk_count + NEW.chunk_count,
+                    total_bytes = total_bytes - OLD.file_size + NEW.file_size
+                WHERE id = 1;
+            END
+        """)
         # Seed default system prompt if not present
         cursor = await db.execute(
             "SELECT value FROM settings WHERE key = ?", ("system_prompt",)
@@ -37,50 +230,142 @@ async def init_db():
                 "INSERT INTO settings (key, value) VALUES (?, ?)",
                 ("system_prompt", DEFAULT_SYSTEM_PROMPT),
             )
-        await db.commit()
     logger.info("Database initialized")
 
 
 # ── Document CRUD ──────────────────────────────────────────────
 
+INSERT_DOCUMENT_SQL = (
+    "INSERT INTO documents (filename, upload_time, chunk_count, file_size) VALUES (?, ?, ?, ?)"
+)
+
+
+async def replace_document(filename: str, upload_time: str, chunk_count: int, file_size: int):
+    """Insert the catalogue row for ``filename``, replacing any earlier upload of it."""
+    async with get_pool().write("replace_document") as db:
+        await db.execute("DELETE FROM documents WHERE filename = ?", (filename,))
+        await db.execute(INSERT_DOCUMENT_SQL, (filename, upload_time, chunk_count, file_size))
 
-async def insert_document(filename: str, upload_time: str, chunk_count: int, file_size: int):
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute(
-            "INSERT INTO documents (filename, upload_time, chunk_count, file_size) VALUES (?, ?, ?, ?)",
-            (filename, upload_time, chunk_count, file_size),
-        )
-        await db.commit()
 
+async def replace_documents(rows: Sequence[Sequence]):
+    """replace_document for many (filename, upload_time, chunk_count, file_size) rows in one transaction."""
+    async with get_pool().write("replace_documents") as db:
+        await db.executemany("DELETE FROM documents WHERE filename = ?", [(row[0],) for row in rows])
+        await db.executemany(INSERT_DOCUMENT_SQL, rows)
 
-async def list_documents():
-    async with aiosqlite.connect(DB_PATH) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute("SELECT filename, upload_time, chunk_count, file_size FROM documents")
+
+async def list_documents(
+    limit: int,
+    after: Optional[Tuple[str, int]] = None,
+    filename_contains: Optional[str] = None,
+    uploaded_since: Optional[str] = None,
+) -> List[Dict]:
+    """One catalogue page, newest first.
+
+    ``after`` is the (upload_time, id) of the last row of the previous
+    page; keyset paging keeps every page an index range scan.
+    """
+    clauses, params = [], []
+    if filename_contains:
+        escaped = filename_contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        clauses.append("filename LIKE ? ESCAPE '\\'")
+        params.append(f"%{escaped}%")
+    if uploaded_since:
+        clauses.append("upload_time >= ?")
+        params.append(uploaded_since)
+    if after:
+        clauses.append("(upload_time, id) < (?, ?)")
+        params.extend(after)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    async with get_pool().read("list_documents") as db:
+        cursor = await db.execute(
+            f"SELECT id, filename, upload_time, chunk_count, file_size FROM documents {where} "
+            "ORDER BY upload_time DESC, id DESC LIMIT ?",
+            (*params, limit),
+        )
         rows = await cursor.fetchall()
         return [dict(row) for row in rows]
 
 
+async def get_document_stats() -> Dict[str, int]:
+    async with get_pool().read("get_document_stats") as db:
+        cursor = await db.execute(
+            "SELECT document_count, total_chunks, total_bytes FROM document_stats WHERE id = 1"
+        )
+        row = await cursor.fetchone()
+        return dict(row) if row else {"document_count": 0, "total_chunks": 0, "total_bytes": 0}
+
+
 async def delete_document(filename: str):
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with get_pool().write("delete_document") as db:
         await db.execute("DELETE FROM documents WHERE filename = ?", (filename,))
-        await db.commit()
 
 
 # ── Settings CRUD ──────────────────────────────────────────────
 
 
-async def get_setting(key: str, default: str = "") -> str:
-    async with aiosqlite.connect(DB_PATH) as db:
-        cursor = await db.execute("SELECT value FROM settings WHERE key = ?", (key,))
-        row = await cursor.fetchone()
-        return row[0] if row else default
+async def list_settings() -> Dict[str, str]:
+    async with get_pool().read("list_settings") as db:
+        cursor = await db.execute("SELECT key, value FROM settings")
+        return {row["key"]: row["value"] for row in await cursor.fetchall()}
 
 
 async def upsert_setting(key: str, value: str):
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with get_pool().write("upsert_setting") as db:
         await db.execute(
             "INSERT INTO settings (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = ?",
             (key, value, value),
         )
-        await db.commit()
+
+
+# ── Ingestion job CRUD ─────────────────────────────────────────
+
+JOB_COLUMNS = (
+    "id, filename, file_path, file_size, status, pages_parsed, "
+    "chunks_embedded, error, results, created_at, updated_at"
+)
+
+
+async def insert_job(job_id: str, filename: str, file_path: str, file_size: int, created_at: str):
+    async with get_pool().write("insert_job") as db:
+        await db.execute(
+            "INSERT INTO ingestion_jobs (id, filename, file_path, file_size, status, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+            (job_id, filename, file_path, file_size, created_at, created_at),
+        )
+
+
+async def get_job(job_id: str):
+    async with get_pool().read("get_job") as db:
+        cursor = await db.execute(f"SELECT {JOB_COLUMNS} FROM ingestion_jobs WHERE id = ?", (job_id,))
+        row = await cursor.fetchone()
+        return dict(row) if row else None
+
+
+async def list_jobs_by_status(statuses):
+    placeholders = ",".join("?" * len(statuses))
+    async with get_pool().read("list_jobs_by_status") as db:
+        cursor = await db.execute(
+            f"SELECT {JOB_COLUMNS} FROM ingestion_jobs WHERE status IN ({placeholders}) ORDER BY created_at",
+            tuple(statuses),
+        )
+        rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+
+async def update_job(job_id: str, updated_at: str, **fields):
+    assignments = ", ".join(f"{column} = ?" for column in fields)
+    async with get_pool().write("update_job") as db:
+        await db.execute(
+            f"UPDATE ingestion_jobs SET {assignments}, updated_at = ? WHERE id = ?",
+            (*fields.values(), updated_at, job_id),
+        )
+
+
+# ── Health ─────────────────────────────────────────────────────
+
+
+async def ping():
+    async with get_pool().read("ping") as db:
+        await db.execute("SELECT 1")
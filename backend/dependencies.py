@@ -1,18 +1,39 @@
 from documents.service import DocumentService
+from jobs.service import IngestionJobQueue
 from rag.service import RAGService
-from database import get_setting, upsert_setting
+from prompt.cache import SettingsCache
 
 document_service = None
 rag_service = None
+job_queue = None
+settings_cache = None
+
+
+def init_services():
+    """Build the process-wide RAG service and warm up its embedding model.
+
+    Called once from the FastAPI lifespan so the model and the Chroma
+    client are loaded before the first request and shared by every route.
+    """
+    rag = get_rag_service()
+    rag.warmup()
+    get_document_service()
 
 
 def get_document_service():
     global document_service
     if document_service is None:
-        document_service = DocumentService()
+        document_service = DocumentService(get_rag_service())
     return document_service
 
 
+def get_job_queue():
+    global job_queue
+    if job_queue is None:
+        job_queue = IngestionJobQueue(get_document_service())
+    return job_queue
+
+
 def get_rag_service():
     global rag_service
     if rag_service is None:
@@ -20,9 +41,16 @@ def get_rag_service():
     return rag_service
 
 
+def get_settings_cache():
+    global settings_cache
+    if settings_cache is None:
+        settings_cache = SettingsCache()
+    return settings_cache
+
+
 async def get_current_prompt() -> str:
-    return await get_setting("system_prompt", "")
+    return get_settings_cache().get("system_prompt", "")
 
 
 async def update_current_prompt(prompt: str):
-    await upsert_setting("system_prompt", prompt)
+    await get_settings_cache().set("system_prompt", prompt)
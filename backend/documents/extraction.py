@@ -0,0 +1,28 @@
+"""
+Text extraction helpers.
+
+Kept free of heavy imports so the process pool can load them cheaply.
+"""
+import time
+from typing import List, TextIO, Tuple
+
+from PyPDF2 import PdfReader
+
+
+def pdf_page_count(file_path: str) -> int:
+    return len(PdfReader(file_path).pages)
+
+
+def extract_pdf_pages(file_path: str, start: int, stop: int) -> List[Tuple[str, float]]:
+    """Extract the text of pages ``start``..``stop - 1`` with the seconds each page took."""
+    reader = PdfReader(file_path)
+    pages = []
+    for i in range(start, stop):
+        page_start = time.perf_counter()
+        text = reader.pages[i].extract_text() or ""
+        pages.append((text, time.perf_counter() - page_start))
+    return pages
+
+
+def read_text_block(f: TextIO, size: int) -> str:
+    return f.read(size)
@@ -1,12 +1,15 @@
 import os
 import time
-import tempfile
 import logging
-from typing import List
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from documents.schemas import DocumentInfo
-from dependencies import get_document_service
-from constants import MAX_FILE_SIZE, ALLOWED_FILE_EXTENSIONS
+import zipfile
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Response
+import executor
+from documents.schemas import DocumentInfo, DocumentStats, BulkUploadResult
+from documents.upload import spool_upload, expand_archive, UploadTooLargeError
+from dependencies import get_document_service, get_job_queue
+from constants import ALLOWED_FILE_EXTENSIONS, ARCHIVE_FILE_EXTENSIONS
+from settings import MAX_FILE_SIZE, BULK_MAX_FILES, BULK_MAX_TOTAL_SIZE
 from observability.metrics import metrics
 
 logger = logging.getLogger(__name__)
@@ -15,7 +18,11 @@ router = APIRouter()
 
 
 @router.post("/upload-document")
-async def upload_document(file: UploadFile = File(...)):
+async def upload_document(
+    response: Response,
+    file: UploadFile = File(...),
+    background: bool = Query(False, description="Queue ingestion and return a job id immediately"),
+):
     """Upload and process a document for RAG"""
     try:
         logger.info(f"Uploading document: {file.filename}")
@@ -26,17 +33,24 @@ async def upload_document(file: UploadFile = File(...)):
                 detail="Only PDF and TXT files are supported"
             )
 
-        content = await file.read()
-
-        if len(content) > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size exceeds {MAX_FILE_SIZE // (1024 * 1024)}MB limit ({len(content) / (1024 * 1024):.1f}MB uploaded)"
-            )
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp_file:
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
+        try:
+            tmp_file_path, file_size = await spool_upload(file)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        if background:
+            try:
+                job_id = await get_job_queue().submit(tmp_file_path, file.filename, file_size)
+            except Exception:
+                if os.path.exists(tmp_file_path):
+                    os.remove(tmp_file_path)
+                raise
+            response.status_code = 202
+            return {
+                "message": "Document queued for processing",
+                "job_id": job_id,
+                "status": "queued"
+            }
 
         try:
             doc_service = get_document_service()
@@ -58,24 +72,166 @@ async def upload_document(file: UploadFile = File(...)):
             if os.path.exists(tmp_file_path):
                 os.remove(tmp_file_path)
 
+    except HTTPException:
+        metrics.document_uploads_total.labels(status="error").inc()
+        raise
     except Exception as e:
         metrics.document_uploads_total.labels(status="error").inc()
         logger.error(f"Error uploading document: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/upload-documents", response_model=BulkUploadResult)
+async def upload_documents(
+    response: Response,
+    files: List[UploadFile] = File(...),
+    background: bool = Query(False, description="Queue ingestion as one job and return its id immediately"),
+):
+    """Upload many PDF/TXT files, or zip archives of them, and ingest them together
+
+    Every document gets its own entry in ``results``; one that cannot be
+    read or ingested is reported there without failing the others. With
+    ``background=true`` the accepted documents become one job whose
+    results GET /jobs/{job_id} returns once it completes.
+    """
+    spooled: List[Tuple[str, str, int]] = []
+    rejected: List[Dict[str, Any]] = []
+    total_size = 0
+    try:
+        logger.info(f"Bulk upload of {len(files)} files")
+
+        for file in files:
+            if file.filename.endswith(ARCHIVE_FILE_EXTENSIONS):
+                try:
+                    archive_path, _ = await spool_upload(file, max_size=BULK_MAX_TOTAL_SIZE)
+                    try:
+                        extracted, skipped = await executor.run(
+                            "archive_extract",
+                            expand_archive,
+                            archive_path,
+                            MAX_FILE_SIZE,
+                            BULK_MAX_TOTAL_SIZE - total_size,
+                            BULK_MAX_FILES - len(spooled),
+                        )
+                    finally:
+                        os.remove(archive_path)
+                except UploadTooLargeError as e:
+                    raise HTTPException(status_code=400, detail=str(e))
+                except zipfile.BadZipFile:
+                    raise HTTPException(status_code=400, detail=f"{file.filename} is not a valid zip archive")
+
+                spooled.extend(extracted)
+                total_size += sum(size for _, _, size in extracted)
+                rejected.extend(
+                    {"filename": name, "status": "error", "error": reason} for name, reason in skipped
+                )
+                continue
+
+            if not file.filename.endswith(ALLOWED_FILE_EXTENSIONS):
+                rejected.append(
+                    {"filename": file.filename, "status": "error", "error": "Only PDF and TXT files are supported"}
+                )
+                continue
+            if len(spooled) >= BULK_MAX_FILES:
+                raise HTTPException(status_code=400, detail=f"Upload exceeds the {BULK_MAX_FILES} document limit")
+
+            try:
+                tmp_file_path, file_size = await spool_upload(file)
+            except UploadTooLargeError as e:
+                rejected.append({"filename": file.filename, "status": "error", "error": str(e)})
+                continue
+            spooled.append((tmp_file_path, file.filename, file_size))
+            total_size += file_size
+            if total_size > BULK_MAX_TOTAL_SIZE:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Upload exceeds {BULK_MAX_TOTAL_SIZE // (1024 * 1024)}MB in total"
+                )
+
+        if background:
+            job_id = await get_job_queue().submit_batch(spooled)
+            spooled = []  # moved into the job's directory
+            response.status_code = 202
+            return {
+                "message": "Documents queued for processing",
+                "job_id": job_id,
+                "status": "queued",
+                "files_processed": 0,
+                "files_failed": len(rejected),
+                "chunks_created": 0,
+                "results": rejected,
+            }
+
+        doc_service = get_document_service()
+        start = time.perf_counter()
+        results = await doc_service.process_batch(spooled) + rejected
+        metrics.bulk_upload_seconds.observe(time.perf_counter() - start)
+        metrics.bulk_upload_files.observe(len(spooled))
+
+        succeeded = [result for result in results if result["status"] == "success"]
+        for result in results:
+            metrics.document_uploads_total.labels(status=result["status"]).inc()
+        logger.info(f"Bulk upload processed: {len(succeeded)} of {len(results)} documents")
+
+        return {
+            "message": f"Processed {len(succeeded)} of {len(results)} documents",
+            "files_processed": len(succeeded),
+            "files_failed": len(results) - len(succeeded),
+            "chunks_created": sum(result["chunks_created"] for result in succeeded),
+            "results": results,
+        }
+
+    except HTTPException:
+        metrics.document_uploads_total.labels(status="error").inc()
+        raise
+    except Exception as e:
+        metrics.document_uploads_total.labels(status="error").inc()
+        logger.error(f"Error in bulk upload: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        for tmp_file_path, _, _ in spooled:
+            if os.path.exists(tmp_file_path):
+                os.remove(tmp_file_path)
+
+
 @router.get("/documents", response_model=List[DocumentInfo])
-async def list_documents():
-    """Get list of all uploaded documents"""
+async def list_documents(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    q: Optional[str] = Query(None, description="Only filenames containing this text"),
+    since: Optional[str] = Query(None, description="Only documents uploaded at or after this ISO timestamp"),
+):
+    """Get a page of uploaded documents, newest first.
+
+    When more documents match, the cursor for the next page is returned in
+    the X-Next-Cursor header.
+    """
     try:
         doc_service = get_document_service()
-        documents = await doc_service.list_documents()
+        documents, next_cursor = await doc_service.list_documents(
+            limit, cursor=cursor, filename_contains=q, uploaded_since=since
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return documents
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing documents: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/documents/stats", response_model=DocumentStats)
+async def document_stats():
+    """Catalogue totals, served from counters maintained on insert and delete"""
+    try:
+        return await get_document_service().get_stats()
+    except Exception as e:
+        logger.error(f"Error reading document stats: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/documents/{filename}")
 async def delete_document(filename: str):
     """Delete a document from the knowledge base"""
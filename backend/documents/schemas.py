@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel
 
 
@@ -6,3 +7,30 @@ class DocumentInfo(BaseModel):
     upload_time: str
     chunk_count: int
     file_size: int
+
+
+class DocumentStats(BaseModel):
+    document_count: int
+    total_chunks: int
+    total_bytes: int
+
+
+class BulkFileResult(BaseModel):
+    filename: str
+    status: str  # "success" or "error"
+    chunks_created: int = 0
+    chunks_added: int = 0
+    chunks_unchanged: int = 0
+    chunks_removed: int = 0
+    file_size: int = 0
+    error: Optional[str] = None
+
+
+class BulkUploadResult(BaseModel):
+    message: str
+    files_processed: int
+    files_failed: int
+    chunks_created: int
+    results: List[BulkFileResult]
+    job_id: Optional[str] = None  # background uploads; results then lists only rejected files
+    status: Optional[str] = None
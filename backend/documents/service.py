@@ -2,77 +2,588 @@
 Document Service — handles document upload and processing.
 """
 import os
+import time
+import base64
+import uuid
+import asyncio
 import logging
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from collections import defaultdict, deque
+from itertools import islice
 from datetime import datetime
-from typing import List, Dict, Any
-from PyPDF2 import PdfReader
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Any, Optional, Tuple
+import executor
+from constants import PDF_PAGE_BATCH, TEXT_BLOCK_CHARS, ALLOWED_FILE_EXTENSIONS
+from settings import (
+    INGEST_BATCH_SIZE,
+    PDF_EXTRACT_PARALLELISM,
+    PDF_SLOW_PAGE_SECONDS,
+    BULK_EXTRACT_PARALLELISM,
+    BULK_EMBED_BATCH_SIZE,
+)
 from rag.service import RAGService
-from database import insert_document, list_documents as db_list_documents, delete_document as db_delete_document
+from rag.chunking import Chunk
+from rag.embedding_cache import content_hash
+from documents.extraction import pdf_page_count, extract_pdf_pages, read_text_block
+from database import (
+    replace_document,
+    replace_documents,
+    get_document_stats,
+    list_documents as db_list_documents,
+    delete_document as db_delete_document,
+)
+from observability.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+BulkFile = Tuple[str, str, int]  # (file path, filename, size)
+
+
+def encode_cursor(upload_time: str, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{upload_time}|{row_id}".encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor."""
+    try:
+        upload_time, row_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").rsplit("|", 1)
+        return upload_time, int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class StageTimer:
+    """Accumulates per-stage time for one document's ingestion."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[stage] += time.perf_counter() - start
+
+    def observe(self):
+        for stage, seconds in self.seconds.items():
+            metrics.ingestion_stage_seconds.labels(stage=stage).observe(seconds)
+
+
+class DocumentLayout:
+    """Maps a document's chunks, in order, onto chunks already stored for it.
+
+    A chunk whose content hash matches a stored chunk reuses that chunk;
+    the rest are new. Stored chunks still unmatched once the whole
+    document has been placed were removed from the document.
+    """
+
+    def __init__(self, existing: List[Tuple[str, str]]):
+        self.updating = bool(existing)
+        self.ids: List[Optional[str]] = []
+        self.hashes: List[str] = []
+        self.extras: List[Dict[str, Any]] = []  # chunker metadata: offsets, pages, token count
+        self._reusable: Dict[str, List[str]] = defaultdict(list)
+        for chunk_id, digest in existing:
+            self._reusable[digest].append(chunk_id)
+
+    def place(self, chunks: List[Chunk]) -> List[Tuple[int, str]]:
+        """Append chunks to the layout and return (position, text) of the new ones."""
+        new = []
+        for chunk in chunks:
+            digest = content_hash(chunk.text)
+            reusable = self._reusable.get(digest)
+            self.ids.append(reusable.pop() if reusable else None)
+            self.hashes.append(digest)
+            self.extras.append(chunk.metadata)
+            if self.ids[-1] is None:
+                new.append((len(self.ids) - 1, chunk.text))
+        return new
+
+    def removed_ids(self) -> List[str]:
+        return [chunk_id for ids in self._reusable.values() for chunk_id in ids]
+
 
 class DocumentService:
     """Service for processing and managing documents"""
 
-    def __init__(self):
-        self.rag_service = RAGService()
+    def __init__(self, rag_service: RAGService):
+        self.rag_service = rag_service
+        # Only filenames with a holder or waiter have an entry
+        self._source_locks: Dict[str, asyncio.Lock] = {}
+        self._source_lock_users: Dict[str, int] = {}
 
-    async def process_document(self, file_path: str, filename: str) -> Dict[str, Any]:
+    @asynccontextmanager
+    async def _source_lock(self, filename: str):
+        """Serialize ingestion and deletion of one filename."""
+        lock = self._source_locks.get(filename)
+        if lock is None:
+            lock = self._source_locks[filename] = asyncio.Lock()
+        self._source_lock_users[filename] = self._source_lock_users.get(filename, 0) + 1
         try:
-            if filename.endswith('.pdf'):
-                text = self._extract_pdf_text(file_path)
-            elif filename.endswith('.txt'):
-                text = self._extract_txt_text(file_path)
-            else:
-                raise ValueError(f"Unsupported file type: {filename}")
-
-            chunks = self.rag_service.create_chunks(text)
-
-            metadatas = []
-            for i, chunk in enumerate(chunks):
-                metadatas.append({
-                    "source": filename,
-                    "chunk_id": i,
-                    "total_chunks": len(chunks)
-                })
-
-            await self.rag_service.add_documents(chunks, metadatas)
-
-            file_size = os.path.getsize(file_path)
-            await insert_document(
-                filename=filename,
-                upload_time=datetime.utcnow().isoformat(),
-                chunk_count=len(chunks),
-                file_size=file_size,
+            async with lock:
+                yield
+        finally:
+            self._source_lock_users[filename] -= 1
+            if not self._source_lock_users[filename]:
+                del self._source_lock_users[filename]
+                del self._source_locks[filename]
+
+    async def process_document(
+        self,
+        file_path: str,
+        filename: str,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """Stream a document through extraction, chunking, embedding and storage.
+
+        Text is extracted page by page and chunks are embedded in batches of
+        INGEST_BATCH_SIZE. A new document is inserted batch by batch, so
+        memory use does not grow with the size of the file. Re-uploading an
+        existing document only embeds chunks whose content changed and
+        applies the additions and removals as one atomic update.
+        ``progress`` is awaited with (pages_parsed, chunks_processed) after
+        every batch.
+        """
+        if not filename.endswith(('.pdf', '.txt')):
+            raise ValueError(f"Unsupported file type: {filename}")
+
+        async with self._source_lock(filename):
+            try:
+                return await self._ingest(file_path, filename, progress)
+            finally:
+                # One corpus-version bump per document, not per batch
+                self.rag_service.publish_corpus_change()
+
+    async def _ingest(
+        self,
+        file_path: str,
+        filename: str,
+        progress: Optional[ProgressCallback],
+    ) -> Dict[str, Any]:
+        layout = DocumentLayout(await self.rag_service.get_source_chunks(filename))
+        staged: List[Tuple[int, str, List[float]]] = []
+        inserted: List[str] = []
+        pages_parsed = 0
+        stages = StageTimer()
+        try:
+            # PDF pages are separate lines; text blocks are cut mid-stream
+            splitter = self.rag_service.streaming_splitter(
+                separator="\n" if filename.endswith('.pdf') else ""
             )
+            pending: List[Chunk] = []
+
+            pages = self._iter_pages(file_path, filename)
+            while True:
+                with stages.measure("extract"):
+                    page = await anext(pages, None)
+                if page is None:
+                    break
+                page_number, text = page
+                pages_parsed += 1
+
+                with stages.measure("chunk"):
+                    pending.extend(await executor.run("chunk", splitter.feed, text, page_number))
+                while len(pending) >= INGEST_BATCH_SIZE:
+                    batch, pending = pending[:INGEST_BATCH_SIZE], pending[INGEST_BATCH_SIZE:]
+                    with stages.measure("embed"):
+                        await self._store_batch(batch, filename, layout, staged, inserted)
+                    if progress:
+                        await progress(pages_parsed, len(layout.ids))
 
-            logger.info(f"Processed document: {filename}, {len(chunks)} chunks")
+            with stages.measure("chunk"):
+                pending.extend(await executor.run("chunk", splitter.finish))
+            for i in range(0, len(pending), INGEST_BATCH_SIZE):
+                with stages.measure("embed"):
+                    await self._store_batch(pending[i:i + INGEST_BATCH_SIZE], filename, layout, staged, inserted)
+            if progress:
+                await progress(pages_parsed, len(layout.ids))
+
+            total = len(layout.ids)
+            removed = layout.removed_ids()
+            with stages.measure("catalogue"):
+                if layout.updating:
+                    kept = [(position, chunk_id) for position, chunk_id in enumerate(layout.ids) if chunk_id]
+                    await self.rag_service.apply_update(
+                        add_ids=[str(uuid.uuid4()) for _ in staged],
+                        add_texts=[text for _, text, _ in staged],
+                        add_embeddings=[vector for _, _, vector in staged],
+                        add_metadatas=[
+                            self._chunk_metadata(filename, position, layout.hashes[position], total, layout.extras[position])
+                            for position, _, _ in staged
+                        ],
+                        update_ids=[chunk_id for _, chunk_id in kept],
+                        update_metadatas=[
+                            self._chunk_metadata(filename, position, layout.hashes[position], total, layout.extras[position])
+                            for position, _ in kept
+                        ],
+                        delete_ids=removed,
+                    )
+                else:
+                    # total_chunks is only known once the whole file has been read
+                    await self.rag_service.update_metadatas(
+                        layout.ids,
+                        [
+                            self._chunk_metadata(filename, i, layout.hashes[i], total, layout.extras[i])
+                            for i in range(total)
+                        ],
+                    )
+
+                file_size = os.path.getsize(file_path)
+                await replace_document(
+                    filename=filename,
+                    upload_time=datetime.utcnow().isoformat(),
+                    chunk_count=total,
+                    file_size=file_size,
+                )
+
+            stages.observe()
+            added = len(staged) if layout.updating else len(inserted)
+            logger.info(
+                f"Processed document: {filename}, {total} chunks "
+                f"({added} added, {len(removed)} removed)"
+            )
 
             return {
                 "filename": filename,
-                "chunks_created": len(chunks),
+                "chunks_created": total,
+                "chunks_added": added,
+                "chunks_unchanged": total - added,
+                "chunks_removed": len(removed),
                 "file_size": file_size
             }
 
         except Exception as e:
             logger.error(f"Error processing document {filename}: {e}")
+            if inserted:
+                await self.rag_service.delete_ids(inserted)
             raise
 
-    def _extract_pdf_text(self, file_path: str) -> str:
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-        return text
+    async def _store_batch(
+        self,
+        batch: List[Chunk],
+        filename: str,
+        layout: DocumentLayout,
+        staged: List[Tuple[int, str, List[float]]],
+        inserted: List[str],
+    ):
+        """Embed the new chunks of a batch.
+
+        For a new document they are inserted right away; for an update they
+        are staged until the final atomic swap.
+        """
+        new = layout.place(batch)
+        if not new:
+            return
+
+        positions = [position for position, _ in new]
+        texts = [text for _, text in new]
+        if layout.updating:
+            vectors = await self.rag_service.embed_documents(texts)
+            staged.extend(zip(positions, texts, vectors))
+            return
+
+        metadatas = [self._chunk_metadata(filename, p, layout.hashes[p], extra=layout.extras[p]) for p in positions]
+        ids = await self.rag_service.add_documents(texts, metadatas)
+        for position, chunk_id in zip(positions, ids):
+            layout.ids[position] = chunk_id
+        inserted.extend(ids)
+
+    async def process_batch(self, files: List[BulkFile]) -> List[Dict[str, Any]]:
+        """Ingest many documents in one pass; returns one result per file, in order.
+
+        New documents are extracted and chunked BULK_EXTRACT_PARALLELISM at
+        a time and their chunks are pooled across files into embed + insert
+        batches of BULK_EMBED_BATCH_SIZE, so the model sees a few large
+        batches instead of many small ones. Their catalogue rows are written
+        in one transaction at the end. Filenames already in the knowledge
+        base take the incremental re-upload path of process_document. A file
+        that fails is rolled back and reported; the others are kept.
+        """
+        results: Dict[int, Dict[str, Any]] = {}
+        accepted: Dict[str, int] = {}
+        for index, (_, filename, _) in enumerate(files):
+            if not filename.endswith(ALLOWED_FILE_EXTENSIONS):
+                results[index] = self._failed(filename, f"Unsupported file type: {filename}")
+            elif filename in accepted:
+                results[index] = self._failed(filename, "Duplicate filename in this upload")
+            else:
+                accepted[filename] = index
+
+        async with AsyncExitStack() as stack:
+            # Sorted, so two overlapping batches cannot deadlock
+            for filename in sorted(accepted):
+                await stack.enter_async_context(self._source_lock(filename))
+
+            try:
+                existing = await asyncio.gather(
+                    *(self.rag_service.get_source_chunks(filename) for filename in accepted)
+                )
+                updates = [index for index, chunks in zip(accepted.values(), existing) if chunks]
+                new = [index for index, chunks in zip(accepted.values(), existing) if not chunks]
+
+                results.update(await self._ingest_new(files, new))
+
+                semaphore = asyncio.Semaphore(BULK_EXTRACT_PARALLELISM)
+
+                async def update(index: int):
+                    file_path, filename, _ = files[index]
+                    async with semaphore:
+                        try:
+                            results[index] = {"status": "success", **await self._ingest(file_path, filename, None)}
+                        except Exception as e:
+                            results[index] = self._failed(filename, str(e))
+
+                await asyncio.gather(*(update(index) for index in updates))
+            finally:
+                # One corpus-version bump for the whole batch
+                self.rag_service.publish_corpus_change()
+
+        failed = sum(1 for result in results.values() if result["status"] != "success")
+        logger.info(f"Processed batch of {len(files)} documents ({len(files) - failed} succeeded, {failed} failed)")
+        return [results[index] for index in range(len(files))]
+
+    async def _ingest_new(self, files: List[BulkFile], indexes: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Bulk path of process_batch for documents with no stored chunks.
+
+        Up to BULK_EXTRACT_PARALLELISM files are extracted at once, page by
+        page, and their chunks stream through a queue holding at most two
+        embed batches. A full queue holds extraction back until embedding
+        catches up, so memory stays bounded however much is uploaded. As in
+        process_document, chunks are inserted before their file's total is
+        known; each file gets total_chunks once all of its chunks are stored.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * BULK_EMBED_BATCH_SIZE)
+        semaphore = asyncio.Semaphore(BULK_EXTRACT_PARALLELISM)
+        totals: Dict[int, int] = {}  # set once a file is fully extracted
+        inserted: Dict[int, List[str]] = defaultdict(list)
+        inserted_metadatas: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        finalized: set = set()
+        errors: Dict[int, str] = {}
+        pending: List[Tuple[int, int, Chunk]] = []  # (file index, position, chunk)
+
+        async def extract(index: int):
+            """Queue ("chunk", index, position, chunk) items, then ("end", index, total, None)."""
+            file_path, filename, _ = files[index]
+            async with semaphore:
+                try:
+                    splitter = self.rag_service.streaming_splitter(
+                        separator="\n" if filename.endswith('.pdf') else ""
+                    )
+                    position = 0
+                    async for page_number, text in self._iter_pages(file_path, filename):
+                        for chunk in await executor.run("chunk", splitter.feed, text, page_number):
+                            await queue.put(("chunk", index, position, chunk))
+                            position += 1
+                    for chunk in await executor.run("chunk", splitter.finish):
+                        await queue.put(("chunk", index, position, chunk))
+                        position += 1
+                    await queue.put(("end", index, position, None))
+                except Exception as e:
+                    logger.error(f"Error extracting document {filename}: {e}")
+                    await queue.put(("error", index, 0, str(e)))
+
+        async def store(batch: List[Tuple[int, int, Chunk]]):
+            # Chunks of a file that failed in an earlier batch are dropped
+            batch = [entry for entry in batch if entry[0] not in errors]
+            if not batch:
+                return
+            metadatas = [
+                self._chunk_metadata(files[index][1], position, content_hash(chunk.text), extra=chunk.metadata)
+                for index, position, chunk in batch
+            ]
+            try:
+                ids = await self.rag_service.add_documents([chunk.text for _, _, chunk in batch], metadatas)
+            except Exception as e:
+                logger.error(f"Error storing a bulk batch of {len(batch)} chunks: {e}")
+                in_batch = list(dict.fromkeys(index for index, _, _ in batch))
+                if len(in_batch) == 1:
+                    errors[in_batch[0]] = str(e)
+                    return
+                # Retry file by file so one bad document does not fail its batch-mates
+                for file_index in in_batch:
+                    await store([entry for entry in batch if entry[0] == file_index])
+                return
+            for (index, _, _), chunk_id, metadata in zip(batch, ids, metadatas):
+                inserted[index].append(chunk_id)
+                inserted_metadatas[index].append(metadata)
+            await finalize()
+
+        async def finalize():
+            """Record total_chunks on every file whose chunks are now all stored, in one update."""
+            done = [
+                index for index, total in totals.items()
+                if index not in finalized and index not in errors and len(inserted[index]) == total
+            ]
+            finalized.update(done)
+            ids = [chunk_id for index in done for chunk_id in inserted[index]]
+            if not ids:
+                return
+            try:
+                await self.rag_service.update_metadatas(
+                    ids,
+                    [
+                        {**metadata, "total_chunks": totals[index]}
+                        for index in done for metadata in inserted_metadatas[index]
+                    ],
+                )
+            except Exception as e:
+                logger.error(f"Error finalizing chunk metadata for a bulk upload: {e}")
+                for index in done:
+                    errors[index] = str(e)
+
+        tasks = [asyncio.ensure_future(extract(index)) for index in indexes]
+        try:
+            finished = 0
+            while finished < len(indexes):
+                kind, index, position, payload = await queue.get()
+                if kind == "chunk":
+                    if index not in errors:
+                        pending.append((index, position, payload))
+                    if len(pending) >= BULK_EMBED_BATCH_SIZE:
+                        batch, pending = pending[:BULK_EMBED_BATCH_SIZE], pending[BULK_EMBED_BATCH_SIZE:]
+                        await store(batch)
+                    continue
+                finished += 1
+                if kind == "end":
+                    totals[index] = position
+                else:
+                    errors[index] = payload
+            await store(pending)
+            await finalize()
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            stored = [chunk_id for ids in inserted.values() for chunk_id in ids]
+            if stored:
+                await self.rag_service.delete_ids(stored)
+            raise
+
+        succeeded = [index for index in indexes if index not in errors]
+        upload_time = datetime.utcnow().isoformat()
+        try:
+            if succeeded:
+                await replace_documents([
+                    (files[index][1], upload_time, totals[index], files[index][2]) for index in succeeded
+                ])
+        except Exception as e:
+            logger.error(f"Error writing catalogue rows for a bulk upload: {e}")
+            for index in succeeded:
+                errors[index] = str(e)
+
+        rolled_back = [chunk_id for index in errors for chunk_id in inserted.get(index, [])]
+        if rolled_back:
+            await self.rag_service.delete_ids(rolled_back)
+
+        results = {}
+        for index in indexes:
+            _, filename, file_size = files[index]
+            if index in errors:
+                results[index] = self._failed(filename, errors[index])
+                continue
+            results[index] = {
+                "filename": filename,
+                "status": "success",
+                "chunks_created": totals[index],
+                "chunks_added": totals[index],
+                "chunks_unchanged": 0,
+                "chunks_removed": 0,
+                "file_size": file_size,
+            }
+        return results
+
+    @staticmethod
+    def _failed(filename: str, error: str) -> Dict[str, Any]:
+        return {"filename": filename, "status": "error", "error": error}
+
+    @staticmethod
+    def _chunk_metadata(
+        filename: str,
+        chunk_id: int,
+        digest: str,
+        total_chunks: int = 0,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        return {
+            **(extra or {}),
+            "source": filename,
+            "chunk_id": chunk_id,
+            "total_chunks": total_chunks,
+            "content_hash": digest
+        }
+
+    async def _iter_pages(self, file_path: str, filename: str) -> AsyncIterator[Tuple[Optional[int], str]]:
+        """Yield (page number, text); text files have no pages and yield None."""
+        if filename.endswith('.pdf'):
+            async for page in self._iter_pdf_pages(file_path, filename):
+                yield page
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                while True:
+                    block = await executor.run("text_extract", read_text_block, f, TEXT_BLOCK_CHARS)
+                    if not block:
+                        break
+                    yield None, block
+
+    async def _iter_pdf_pages(self, file_path: str, filename: str) -> AsyncIterator[Tuple[int, str]]:
+        """Yield PDF pages in order while page ranges are parsed in parallel.
+
+        Up to PDF_EXTRACT_PARALLELISM ranges of PDF_PAGE_BATCH pages are in
+        flight on the process pool at once.
+        """
+        page_count = await executor.run("pdf_extract", pdf_page_count, file_path)
+        ranges = iter(range(0, page_count, PDF_PAGE_BATCH))
+
+        def submit(start: int):
+            stop = min(start + PDF_PAGE_BATCH, page_count)
+            return start, asyncio.ensure_future(
+                executor.run("pdf_extract", extract_pdf_pages, file_path, start, stop)
+            )
+
+        in_flight = deque(submit(start) for start in islice(ranges, PDF_EXTRACT_PARALLELISM))
+        try:
+            while in_flight:
+                start, future = in_flight.popleft()
+                pages = await future
+                next_start = next(ranges, None)
+                if next_start is not None:
+                    in_flight.append(submit(next_start))
+
+                for page_number, (text, seconds) in enumerate(pages, start + 1):
+                    metrics.pdf_page_extract_seconds.observe(seconds)
+                    if seconds >= PDF_SLOW_PAGE_SECONDS:
+                        logger.warning(f"Slow PDF page: {filename} page {page_number} took {seconds:.2f}s")
+                    yield page_number, text
+        finally:
+            for _, future in in_flight:
+                future.cancel()
 
-    def _extract_txt_text(self, file_path: str) -> str:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+    async def list_documents(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        filename_contains: Optional[str] = None,
+        uploaded_since: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return one page of the catalogue and the cursor for the next page (None on the last)."""
+        rows = await db_list_documents(
+            limit + 1,
+            after=decode_cursor(cursor) if cursor else None,
+            filename_contains=filename_contains,
+            uploaded_since=uploaded_since,
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["upload_time"], rows[-1]["id"])
+        return rows, next_cursor
 
-    async def list_documents(self) -> List[Dict[str, Any]]:
-        return await db_list_documents()
+    async def get_stats(self) -> Dict[str, int]:
+        return await get_document_stats()
 
     async def delete_document(self, filename: str):
-        await self.rag_service.delete_by_source(filename)
-        await db_delete_document(filename)
+        async with self._source_lock(filename):
+            await self.rag_service.delete_by_source(filename)
+            await db_delete_document(filename)
@@ -0,0 +1,140 @@
+"""
+Upload spooling — copies an UploadFile to disk in fixed-size blocks, rejects
+oversized request bodies before they are read, and expands zip archives of
+documents for bulk upload.
+"""
+import os
+import zipfile
+import tempfile
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+import executor
+from constants import UPLOAD_BLOCK_SIZE, ALLOWED_FILE_EXTENSIONS, MULTIPART_OVERHEAD
+from settings import MAX_FILE_SIZE
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+class UploadSizeLimitMiddleware:
+    """Refuse uploads whose Content-Length already exceeds the route's limit.
+
+    Starlette reads the whole multipart body into temp files before a route
+    runs, so the size checks in the routes only fire after the upload has
+    been received. This rejects with 413 before any of it is read. Chunked
+    bodies carry no Content-Length and are still caught by spool_upload.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is not None:
+            length = Headers(scope=scope).get("content-length", "")
+            if length.isdigit() and int(length) > limit + MULTIPART_OVERHEAD:
+                response = JSONResponse(
+                    {"detail": f"Upload exceeds {limit // (1024 * 1024)}MB limit"},
+                    status_code=413,
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+async def spool_upload(file: UploadFile, max_size: int = MAX_FILE_SIZE) -> Tuple[str, int]:
+    """Copy the upload to a temp file we own, enforcing ``max_size``.
+
+    Starlette has already spooled the request body by the time a route
+    runs; this copies it on the ingest pool so the disk writes stay off the
+    event loop. Returns the temp file path and the number of bytes written.
+    The caller owns the file and must remove it.
+    """
+    suffix = os.path.splitext(file.filename)[1]
+    return await executor.run("upload_spool", _copy_to_temp, file.file, suffix, max_size)
+
+
+def expand_archive(
+    archive_path: str,
+    max_file_size: int = MAX_FILE_SIZE,
+    max_total_size: Optional[int] = None,
+    max_files: Optional[int] = None,
+) -> Tuple[List[Tuple[str, str, int]], List[Tuple[str, str]]]:
+    """Extract the PDF and TXT members of a zip archive to temp files.
+
+    Members are stored under their base name, so paths inside the archive
+    can never point outside the temp directory. Sizes are counted as bytes
+    are decompressed rather than taken from the archive's headers.
+    Returns ((temp path, filename, size) for each extracted document,
+    (member name, reason) for each member that was skipped). Raises
+    UploadTooLargeError, after removing what it extracted, once the
+    documents together pass ``max_total_size`` or ``max_files``. The caller
+    owns the extracted files and must remove them.
+    """
+    extracted: List[Tuple[str, str, int]] = []
+    skipped: List[Tuple[str, str]] = []
+    total = 0
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            for member in archive.infolist():
+                filename = os.path.basename(member.filename)
+                # Directories and OS metadata (.DS_Store, __MACOSX/) are not documents
+                if member.is_dir() or filename.startswith(".") or member.filename.startswith("__MACOSX/"):
+                    continue
+                if not filename.endswith(ALLOWED_FILE_EXTENSIONS):
+                    skipped.append((member.filename, "Only PDF and TXT files are supported"))
+                    continue
+                if max_files is not None and len(extracted) >= max_files:
+                    raise UploadTooLargeError(f"Upload exceeds the {max_files} document limit")
+
+                try:
+                    tmp_path, size = _extract_member(archive, member, max_file_size)
+                except (UploadTooLargeError, RuntimeError, zipfile.BadZipFile) as e:
+                    # RuntimeError: an encrypted member
+                    skipped.append((member.filename, str(e)))
+                    continue
+                extracted.append((tmp_path, filename, size))
+
+                total += size
+                if max_total_size is not None and total > max_total_size:
+                    raise UploadTooLargeError(
+                        f"Upload exceeds {max_total_size // (1024 * 1024)}MB in total"
+                    )
+    except BaseException:
+        for tmp_path, _, _ in extracted:
+            os.remove(tmp_path)
+        raise
+    return extracted, skipped
+
+
+def _extract_member(archive: zipfile.ZipFile, member: zipfile.ZipInfo, max_size: int) -> Tuple[str, int]:
+    suffix = os.path.splitext(member.filename)[1]
+    with archive.open(member) as source:
+        return _copy_to_temp(source, suffix, max_size)
+
+
+def _copy_to_temp(source: BinaryIO, suffix: str, max_size: int) -> Tuple[str, int]:
+    size = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        try:
+            while True:
+                block = source.read(UPLOAD_BLOCK_SIZE)
+                if not block:
+                    break
+                size += len(block)
+                if size > max_size:
+                    raise UploadTooLargeError(
+                        f"File size exceeds {max_size // (1024 * 1024)}MB limit"
+                    )
+                tmp_file.write(block)
+        except BaseException:
+            tmp_file.close()
+            os.remove(tmp_file.name)
+            raise
+    return tmp_file.name, size
@@ -0,0 +1,116 @@
+"""
+Execution layer — runs blocking work (embedding, Chroma, PDF parsing) off the event loop.
+
+Every operation name maps to one of the named pools:
+  query    — thread pool reserved for latency-sensitive retrieval
+  rerank   — thread pool for cross-encoder scoring, sized by RAG_RERANK_THREADS
+  ingest   — thread pool for embedding, chunking and vector-store writes
+  process  — process pool for GIL-bound parsing work
+  inline   — run directly on the event loop (debugging only)
+"""
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from constants import DEFAULT_OPERATION_POOLS, DEFAULT_EXECUTOR_POOL
+from settings import (
+    EXECUTOR_QUERY_THREADS,
+    EXECUTOR_INGEST_THREADS,
+    EXECUTOR_PROCESS_WORKERS,
+    EXECUTOR_MAX_PENDING,
+    EXECUTOR_OPERATION_POOLS,
+    RAG_RERANK_THREADS,
+)
+from observability.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+INLINE_POOL = "inline"
+
+_pools: Dict[str, Executor] = {}
+_slots: Dict[str, asyncio.Semaphore] = {}
+
+
+def _parse_operation_pools(spec: str) -> Dict[str, str]:
+    pools = dict(DEFAULT_OPERATION_POOLS)
+    for item in spec.split(","):
+        if "=" in item:
+            operation, pool = item.split("=", 1)
+            pools[operation.strip()] = pool.strip()
+    return pools
+
+
+OPERATION_POOLS = _parse_operation_pools(EXECUTOR_OPERATION_POOLS)
+
+
+def _create_pool(name: str) -> Executor:
+    if name == "query":
+        return ThreadPoolExecutor(max_workers=EXECUTOR_QUERY_THREADS, thread_name_prefix="query")
+    if name == "rerank":
+        return ThreadPoolExecutor(max_workers=RAG_RERANK_THREADS, thread_name_prefix="rerank")
+    if name == "ingest":
+        return ThreadPoolExecutor(max_workers=EXECUTOR_INGEST_THREADS, thread_name_prefix="ingest")
+    if name == "process":
+        # spawn, not fork: the parent has torch/Chroma threads running
+        return ProcessPoolExecutor(
+            max_workers=EXECUTOR_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    raise ValueError(f"Unknown execution pool: {name}")
+
+
+def get_pool(name: str) -> Executor:
+    if name not in _pools:
+        _pools[name] = _create_pool(name)
+        logger.info(f"Started execution pool: {name}")
+    return _pools[name]
+
+
+def _get_slots(name: str) -> asyncio.Semaphore:
+    if name not in _slots:
+        _slots[name] = asyncio.Semaphore(EXECUTOR_MAX_PENDING)
+    return _slots[name]
+
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict):
+    # Module-level so it can be pickled into the process pool
+    started = time.time()
+    return started, fn(*args, **kwargs)
+
+
+async def run(operation: str, fn: Callable, *args, **kwargs) -> Any:
+    """Run ``fn`` on the pool configured for ``operation`` and await the result.
+
+    Functions routed to the process pool must be importable module-level
+    callables with picklable arguments.
+    """
+    pool_name = OPERATION_POOLS.get(operation, DEFAULT_EXECUTOR_POOL)
+    if pool_name == INLINE_POOL:
+        return fn(*args, **kwargs)
+
+    pending = metrics.executor_pending_tasks.labels(pool=pool_name)
+    pending.inc()
+    submitted = time.time()
+    try:
+        async with _get_slots(pool_name):
+            loop = asyncio.get_running_loop()
+            started, result = await loop.run_in_executor(
+                get_pool(pool_name), _timed_call, fn, args, kwargs
+            )
+    finally:
+        pending.dec()
+
+    metrics.executor_wait_seconds.labels(pool=pool_name).observe(max(0.0, started - submitted))
+    metrics.executor_task_seconds.labels(operation=operation).observe(time.time() - started)
+    return result
+
+
+def shutdown():
+    for name, pool in _pools.items():
+        pool.shutdown(wait=False, cancel_futures=True)
+        logger.info(f"Stopped execution pool: {name}")
+    _pools.clear()
+    _slots.clear()
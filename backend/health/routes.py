@@ -4,10 +4,9 @@ Health check endpoint — probes SQLite and ChromaDB.
 import time
 import logging
 
-import aiosqlite
 from fastapi import APIRouter
 
-from settings import DB_PATH
+import database
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +16,12 @@ router = APIRouter()
 async def check_sqlite() -> dict:
     try:
         start = time.perf_counter()
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute("SELECT 1")
-        return {"status": "ok", "latency_ms": round((time.perf_counter() - start) * 1000, 2)}
+        await database.ping()
+        return {
+            "status": "ok",
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            "pool": database.get_pool().stats(),
+        }
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
@@ -30,7 +32,7 @@ def check_chromadb() -> dict:
         rag = get_rag_service()
         if rag.vector_store is None:
             return {"status": "error", "error": "vector store not initialized"}
-        count = rag.vector_store._collection.count()
+        count = rag.collection.count()
         return {"status": "ok", "document_count": count}
     except Exception as e:
         return {"status": "error", "error": str(e)}
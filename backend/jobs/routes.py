@@ -0,0 +1,20 @@
+import json
+import logging
+from fastapi import APIRouter, HTTPException
+from jobs.schemas import JobInfo
+from database import get_job
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/jobs/{job_id}", response_model=JobInfo)
+async def get_job_status(job_id: str):
+    """Get status and progress of a background ingestion job"""
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job["results"]:
+        job["results"] = json.loads(job["results"])
+    return job
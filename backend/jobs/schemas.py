@@ -0,0 +1,16 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from documents.schemas import BulkFileResult
+
+
+class JobInfo(BaseModel):
+    id: str
+    filename: str
+    file_size: int
+    status: str
+    pages_parsed: int
+    chunks_embedded: int
+    error: Optional[str] = None
+    results: Optional[List[BulkFileResult]] = None  # bulk jobs, once completed
+    created_at: str
+    updated_at: str
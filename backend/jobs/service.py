@@ -0,0 +1,176 @@
+"""
+Ingestion Job Queue — processes uploads in the background.
+
+Jobs are persisted in SQLite before they are queued, so work that was
+queued or running when the process stopped is picked up again on start.
+A bulk job keeps its files in a directory with a manifest and runs them
+through DocumentService.process_batch; its per-file results are stored
+on the job.
+"""
+import os
+import json
+import time
+import uuid
+import shutil
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from documents.service import BulkFile, DocumentService
+from database import insert_job, get_job, list_jobs_by_status, update_job
+from constants import BULK_JOB_MANIFEST
+from settings import UPLOAD_DIR, INGESTION_WORKERS
+from observability.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+class IngestionJobQueue:
+    """Bounded pool of workers that run document ingestion jobs."""
+
+    def __init__(self, document_service: DocumentService, workers: int = INGESTION_WORKERS):
+        self.document_service = document_service
+        self.workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        self._queue = asyncio.Queue()
+
+        # Re-queue work interrupted by a restart
+        for job in await list_jobs_by_status(["queued", "running"]):
+            if not os.path.exists(job["file_path"]):
+                await update_job(job["id"], _now(), status="failed", error="Upload file missing after restart")
+                continue
+            if job["status"] == "running":
+                await update_job(job["id"], _now(), status="queued", pages_parsed=0, chunks_embedded=0)
+            self._enqueue(job["id"])
+            logger.info(f"Recovered ingestion job {job['id']} ({job['filename']})")
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"Ingestion job queue started with {self.workers} workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, tmp_file_path: str, filename: str, file_size: int) -> str:
+        """Persist the spooled upload and queue it for ingestion."""
+        job_id = uuid.uuid4().hex
+        file_path = os.path.join(UPLOAD_DIR, f"{job_id}{os.path.splitext(filename)[1]}")
+        shutil.move(tmp_file_path, file_path)
+
+        await insert_job(job_id, filename, file_path, file_size, _now())
+        self._enqueue(job_id)
+        logger.info(f"Queued ingestion job {job_id} for {filename}")
+        return job_id
+
+    async def submit_batch(self, files: List[BulkFile]) -> str:
+        """Persist spooled bulk-upload files and queue them as one job."""
+        job_id = uuid.uuid4().hex
+        batch_dir = os.path.join(UPLOAD_DIR, job_id)
+        os.makedirs(batch_dir)
+        try:
+            manifest = []
+            for position, (tmp_file_path, filename, file_size) in enumerate(files):
+                stored_name = f"{position}{os.path.splitext(filename)[1]}"
+                shutil.move(tmp_file_path, os.path.join(batch_dir, stored_name))
+                manifest.append({"path": stored_name, "filename": filename, "file_size": file_size})
+            with open(os.path.join(batch_dir, BULK_JOB_MANIFEST), "w") as f:
+                json.dump(manifest, f)
+
+            total_size = sum(file_size for _, _, file_size in files)
+            await insert_job(job_id, f"{len(files)} documents", batch_dir, total_size, _now())
+        except Exception:
+            shutil.rmtree(batch_dir, ignore_errors=True)
+            raise
+        self._enqueue(job_id)
+        logger.info(f"Queued bulk ingestion job {job_id} for {len(files)} documents")
+        return job_id
+
+    def _enqueue(self, job_id: str):
+        self._queue.put_nowait(job_id)
+        metrics.ingestion_jobs_queued.inc()
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            metrics.ingestion_jobs_queued.dec()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                logger.error(f"Ingestion job {job_id} crashed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = await get_job(job_id)
+        if job is None or job["status"] != "queued":
+            return
+
+        await update_job(job_id, _now(), status="running")
+        logger.info(f"Running ingestion job {job_id} ({job['filename']})")
+        if os.path.isdir(job["file_path"]):
+            await self._run_batch(job_id, job["file_path"])
+            return
+
+        async def report(pages_parsed: int, chunks_embedded: int):
+            await update_job(job_id, _now(), pages_parsed=pages_parsed, chunks_embedded=chunks_embedded)
+
+        start = time.perf_counter()
+        try:
+            result = await self.document_service.process_document(
+                file_path=job["file_path"],
+                filename=job["filename"],
+                progress=report,
+            )
+        except Exception as e:
+            await update_job(job_id, _now(), status="failed", error=str(e))
+            metrics.document_uploads_total.labels(status="error").inc()
+            metrics.ingestion_jobs_total.labels(status="failed").inc()
+            logger.error(f"Ingestion job {job_id} failed: {e}")
+        else:
+            await update_job(job_id, _now(), status="completed", chunks_embedded=result["chunks_created"])
+            metrics.document_processing_seconds.observe(time.perf_counter() - start)
+            metrics.document_uploads_total.labels(status="success").inc()
+            metrics.ingestion_jobs_total.labels(status="completed").inc()
+            logger.info(f"Ingestion job {job_id} completed: {result['chunks_created']} chunks")
+        finally:
+            if os.path.exists(job["file_path"]):
+                os.remove(job["file_path"])
+
+    async def _run_batch(self, job_id: str, batch_dir: str):
+        start = time.perf_counter()
+        try:
+            with open(os.path.join(batch_dir, BULK_JOB_MANIFEST)) as f:
+                manifest = json.load(f)
+            results = await self.document_service.process_batch([
+                (os.path.join(batch_dir, entry["path"]), entry["filename"], entry["file_size"])
+                for entry in manifest
+            ])
+        except Exception as e:
+            await update_job(job_id, _now(), status="failed", error=str(e))
+            metrics.document_uploads_total.labels(status="error").inc()
+            metrics.ingestion_jobs_total.labels(status="failed").inc()
+            logger.error(f"Bulk ingestion job {job_id} failed: {e}")
+        else:
+            chunks = sum(result.get("chunks_created", 0) for result in results)
+            await update_job(
+                job_id, _now(), status="completed", chunks_embedded=chunks, results=json.dumps(results)
+            )
+            metrics.bulk_upload_seconds.observe(time.perf_counter() - start)
+            metrics.bulk_upload_files.observe(len(results))
+            for result in results:
+                metrics.document_uploads_total.labels(status=result["status"]).inc()
+            metrics.ingestion_jobs_total.labels(status="completed").inc()
+            logger.info(f"Bulk ingestion job {job_id} completed: {len(results)} documents, {chunks} chunks")
+        finally:
+            shutil.rmtree(batch_dir, ignore_errors=True)
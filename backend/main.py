@@ -2,28 +2,48 @@
 Main FastAPI Application for Voice AI Agent with RAG
 """
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from database import init_db
-from settings import CORS_ORIGINS, BACKEND_PORT, LOG_LEVEL
+import executor
+from database import init_db, close_db
+from dependencies import init_services, get_job_queue, get_settings_cache
+from settings import CORS_ORIGINS, BACKEND_PORT, LOG_LEVEL, MAX_FILE_SIZE, BULK_MAX_TOTAL_SIZE
 from documents.routes import router as documents_router
+from documents.upload import UploadSizeLimitMiddleware
 from prompt.routes import router as prompt_router
 from livekit_auth.routes import router as livekit_router
 from rag.routes import router as rag_router
+from jobs.routes import router as jobs_router
 from health.routes import router as health_router
 from observability.metrics_route import router as metrics_router
+from observability.traces_route import router as traces_router
 from observability import setup_logging, ObservabilityMiddleware
 
 # Configure structured JSON logging
 setup_logging(level=LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    await get_settings_cache().load()
+    init_services()
+    await get_job_queue().start()
+    yield
+    await get_job_queue().stop()
+    executor.shutdown()
+    await close_db()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Voice AI Agent API",
     description="Real-time voice agent with RAG capabilities",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -33,23 +53,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Observability middleware (request ID, metrics, access logging)
 app.add_middleware(ObservabilityMiddleware)
 
-@app.on_event("startup")
-async def startup():
-    await init_db()
-
+# Refuse oversized uploads from Content-Length, before the body is read
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={"/upload-document": MAX_FILE_SIZE, "/upload-documents": BULK_MAX_TOTAL_SIZE},
+)
 
 # Register routers
 app.include_router(documents_router)
 app.include_router(prompt_router)
 app.include_router(livekit_router)
 app.include_router(rag_router)
+app.include_router(jobs_router)
 app.include_router(health_router)
 app.include_router(metrics_router)
+app.include_router(traces_router)
 
 
 if __name__ == "__main__":
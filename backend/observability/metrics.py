@@ -1,7 +1,16 @@
 """
 Central Prometheus metrics registry.
+
+The voice agent worker runs prometheus_client in multiprocess mode (see
+voice_agent.py): job processes write their samples to a shared directory
+and the worker's AGENT_METRICS_PORT endpoint aggregates them. Gauges sum
+over live processes there; outside multiprocess mode the setting is
+ignored.
 """
-from prometheus_client import Counter, Histogram
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, start_http_server
+from prometheus_client import multiprocess
 
 
 class Metrics:
@@ -29,6 +38,67 @@ class Metrics:
         "Document processing time in seconds",
         buckets=[0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
     )
+    bulk_upload_files = Histogram(
+        "bulk_upload_files",
+        "Documents per bulk upload, after zip expansion",
+        buckets=[1, 5, 10, 25, 50, 100, 250, 500],
+    )
+    bulk_upload_seconds = Histogram(
+        "bulk_upload_seconds",
+        "Bulk upload processing time in seconds",
+        buckets=[1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 1800.0],
+    )
+
+    ingestion_stage_seconds = Histogram(
+        "ingestion_stage_seconds",
+        "Time spent per document in each ingestion stage",
+        ["stage"],
+        buckets=[0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+    )
+
+    pdf_page_extract_seconds = Histogram(
+        "pdf_page_extract_seconds",
+        "Text extraction time per PDF page",
+        buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0],
+    )
+
+    # Background ingestion job metrics
+    ingestion_jobs_total = Counter(
+        "ingestion_jobs_total",
+        "Background ingestion jobs finished",
+        ["status"],
+    )
+    ingestion_jobs_queued = Gauge(
+        "ingestion_jobs_queued",
+        "Background ingestion jobs waiting for a worker",
+        multiprocess_mode="livesum",
+    )
+
+    prompt_watchers = Gauge(
+        "prompt_watchers",
+        "Open long-poll requests waiting for a prompt change",
+        multiprocess_mode="livesum",
+    )
+
+    # SQLite connection pool metrics
+    sqlite_pool_in_use = Gauge(
+        "sqlite_pool_in_use",
+        "SQLite connections currently checked out",
+        ["role"],
+        multiprocess_mode="livesum",
+    )
+    sqlite_pool_wait_seconds = Histogram(
+        "sqlite_pool_wait_seconds",
+        "Time waiting to check out an SQLite connection",
+        ["role"],
+        buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0],
+    )
+    sqlite_query_seconds = Histogram(
+        "sqlite_query_seconds",
+        "SQLite operation latency, connection checkout excluded",
+        ["operation"],
+        buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5],
+    )
 
     # RAG query metrics
     rag_queries_total = Counter(
@@ -46,6 +116,103 @@ class Metrics:
         "Number of results returned per RAG query",
         buckets=[0, 1, 2, 3, 5, 10],
     )
+    rag_embed_batch_size = Histogram(
+        "rag_embed_batch_size",
+        "Distinct queries encoded per batched embedding pass",
+        buckets=[1, 2, 4, 8, 16, 32, 64],
+    )
+    rag_embed_queue_delay_seconds = Histogram(
+        "rag_embed_queue_delay_seconds",
+        "Time a query waits in the micro-batch window before encoding",
+        buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1],
+    )
+
+    rag_lexical_search_seconds = Histogram(
+        "rag_lexical_search_seconds",
+        "BM25 index lookup time",
+        buckets=[0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01],
+    )
+    rag_lexical_index_chunks = Gauge(
+        "rag_lexical_index_chunks",
+        "Chunks held in the BM25 index",
+        multiprocess_mode="livesum",
+    )
+
+    rag_rerank_total = Counter(
+        "rag_rerank_total",
+        "Re-ranking passes by outcome (timeouts, errors and skips fall back to retrieval order)",
+        ["outcome"],
+    )
+    rag_shard_query_seconds = Histogram(
+        "rag_shard_query_seconds",
+        "Vector search latency per shard during a fan-out query",
+        ["shard"],
+        buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5],
+    )
+    rag_shard_chunks = Gauge(
+        "rag_shard_chunks",
+        "Chunks stored per vector shard (refreshed by GET /shards)",
+        ["shard"],
+        multiprocess_mode="livesum",
+    )
+    rag_rerank_seconds = Histogram(
+        "rag_rerank_seconds",
+        "Cross-encoder scoring time for one query's candidates",
+        buckets=[0.01, 0.025, 0.05, 0.1, 0.15, 0.25, 0.5, 1.0],
+    )
+
+    # RAG query-result cache metrics
+    rag_cache_requests_total = Counter(
+        "rag_cache_requests_total",
+        "RAG result cache lookups",
+        ["tier", "result"],
+    )
+    rag_cache_evictions_total = Counter(
+        "rag_cache_evictions_total",
+        "RAG result cache evictions",
+        ["tier", "reason"],
+    )
+    rag_cache_entries = Gauge(
+        "rag_cache_entries",
+        "Entries currently held in the RAG result cache",
+        ["tier"],
+        multiprocess_mode="livesum",
+    )
+
+    # Persistent embedding cache metrics
+    embedding_cache_lookups_total = Counter(
+        "embedding_cache_lookups_total",
+        "Chunk embedding cache lookups during ingestion",
+        ["result"],
+    )
+    embedding_cache_bytes_saved_total = Counter(
+        "embedding_cache_bytes_saved_total",
+        "Bytes of chunk text served from the embedding cache instead of encoded",
+    )
+    embedding_cache_encode_seconds_saved_total = Counter(
+        "embedding_cache_encode_seconds_saved_total",
+        "Estimated encode time avoided by embedding cache hits",
+    )
+
+    # Execution pool metrics
+    executor_pending_tasks = Gauge(
+        "executor_pending_tasks",
+        "Tasks submitted to an execution pool and not yet finished",
+        ["pool"],
+        multiprocess_mode="livesum",
+    )
+    executor_wait_seconds = Histogram(
+        "executor_wait_seconds",
+        "Time a task waits before an execution pool starts it",
+        ["pool"],
+        buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+    )
+    executor_task_seconds = Histogram(
+        "executor_task_seconds",
+        "Run time of offloaded blocking operations",
+        ["operation"],
+        buckets=[0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0],
+    )
 
     # Voice pipeline metrics
     voice_rag_injections_total = Counter(
@@ -53,6 +220,103 @@ class Metrics:
         "Total RAG context injections in voice pipeline",
         ["status"],
     )
+    voice_turn_stage_seconds = Histogram(
+        "voice_turn_stage_seconds",
+        "Per-turn voice pipeline stage latency",
+        ["stage"],
+        buckets=[0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0],
+    )
+    voice_turn_e2e_seconds = Histogram(
+        "voice_turn_e2e_seconds",
+        "User stopped speaking to agent audio started",
+        buckets=[0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 2.0, 2.5, 3.0, 5.0, 10.0],
+    )
+    voice_turns_total = Counter(
+        "voice_turns_total",
+        "Voice turns traced",
+        ["interrupted"],
+    )
+    voice_rag_prefetch_total = Counter(
+        "voice_rag_prefetch_total",
+        "Speculative RAG prefetches by outcome",
+        ["outcome"],
+    )
+    voice_rag_prefetch_saved_seconds = Histogram(
+        "voice_rag_prefetch_saved_seconds",
+        "Retrieval time hidden behind user speech by a prefetch hit",
+        buckets=[0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+    )
+    voice_llm_prompt_tokens = Histogram(
+        "voice_llm_prompt_tokens",
+        "Prompt tokens per voice LLM request, by part of the chat context",
+        ["part"],
+        buckets=[50, 100, 250, 500, 1000, 1500, 2000, 3000, 4000, 6000, 8000],
+    )
+    voice_context_collapsed_messages_total = Counter(
+        "voice_context_collapsed_messages_total",
+        "Chat messages collapsed into the history summary or dropped to fit the token budget",
+        ["action"],
+    )
+    voice_rag_duplicate_sentences_total = Counter(
+        "voice_rag_duplicate_sentences_total",
+        "Retrieved sentences dropped because another chunk in the same context repeats them",
+    )
+    voice_backend_requests_total = Counter(
+        "voice_backend_requests_total",
+        "Voice agent requests to the backend API",
+        ["endpoint", "status"],
+    )
+    voice_backend_request_seconds = Histogram(
+        "voice_backend_request_seconds",
+        "Voice agent request latency to the backend API in seconds",
+        ["endpoint"],
+        buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+    )
+    voice_backend_connections_total = Counter(
+        "voice_backend_connections_total",
+        "Voice agent backend requests by whether a pooled connection was reused",
+        ["reused"],
+    )
+
+
+    # Voice agent worker capacity (set by the worker process itself)
+    voice_worker_active_sessions = Gauge(
+        "voice_worker_active_sessions",
+        "Voice sessions running or just admitted on this worker",
+        multiprocess_mode="livesum",
+    )
+    voice_worker_max_sessions = Gauge(
+        "voice_worker_max_sessions",
+        "Configured session capacity of this worker",
+        multiprocess_mode="livesum",
+    )
+    voice_worker_load = Gauge(
+        "voice_worker_load",
+        "Load reported to the LiveKit dispatcher (0-1), by input",
+        ["source"],
+        multiprocess_mode="livesum",
+    )
+    voice_worker_jobs_total = Counter(
+        "voice_worker_jobs_total",
+        "Job requests offered to this worker, by admission decision",
+        ["decision"],
+    )
 
 
 metrics = Metrics()
+
+
+def serve_worker_metrics(port: int):
+    """Serve metrics from a background thread, aggregating every process in multiprocess mode."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(port, registry=registry)
+    else:
+        start_http_server(port)
+
+
+def mark_process_exited():
+    """Drop this process's live gauge samples from the shared multiprocess directory."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
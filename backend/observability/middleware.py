@@ -16,7 +16,9 @@ logger = logging.getLogger("observability.middleware")
 EXCLUDED_PATHS = {"/metrics", "/health"}
 
 PATH_PATTERNS = [
+    ("/documents/stats", "/documents/stats"),
     ("/documents/", "/documents/{filename}"),
+    ("/jobs/", "/jobs/{job_id}"),
 ]
 
 
@@ -0,0 +1,63 @@
+"""
+Recent voice turn traces.
+
+The voice agent reports one trace per user turn; the backend keeps the
+latest ones in memory and feeds the stage histograms from them.
+"""
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from constants import VOICE_TURN_STAGES
+from settings import VOICE_TRACE_BUFFER_SIZE
+from observability.metrics import metrics
+
+
+class TurnTrace(BaseModel):
+    turn_id: str
+    room: Optional[str] = None
+    started_at: float = Field(default_factory=time.time)
+    interrupted: bool = False
+    stages: Dict[str, float] = Field(default_factory=dict)
+
+
+class TurnTraceBuffer:
+    """Fixed-size ring buffer of the most recent turn traces."""
+
+    def __init__(self, max_size: int = VOICE_TRACE_BUFFER_SIZE):
+        self._traces: deque = deque(maxlen=max_size)
+
+    def record(self, trace: TurnTrace):
+        trace.stages = {k: v for k, v in trace.stages.items() if v >= 0}
+        self._traces.append(trace)
+
+        metrics.voice_turns_total.labels(interrupted=str(trace.interrupted).lower()).inc()
+        # Unknown stage names stay in the trace but are not exported as labels
+        for stage, seconds in trace.stages.items():
+            if stage == "e2e":
+                metrics.voice_turn_e2e_seconds.observe(seconds)
+            elif stage in VOICE_TURN_STAGES:
+                metrics.voice_turn_stage_seconds.labels(stage=stage).observe(seconds)
+
+    def recent(self, limit: int) -> List[TurnTrace]:
+        return list(self._traces)[-limit:][::-1]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95/max per stage over the buffered turns."""
+        summary = {}
+        for stage in VOICE_TURN_STAGES:
+            values = sorted(t.stages[stage] for t in self._traces if stage in t.stages)
+            if not values:
+                continue
+            summary[stage] = {
+                "count": len(values),
+                "p50": values[int(0.50 * (len(values) - 1))],
+                "p95": values[int(0.95 * (len(values) - 1))],
+                "max": values[-1],
+            }
+        return summary
+
+
+turn_traces = TurnTraceBuffer()
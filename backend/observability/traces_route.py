@@ -0,0 +1,24 @@
+"""
+Voice turn trace endpoints.
+"""
+from fastapi import APIRouter, Query
+
+from observability.traces import TurnTrace, turn_traces
+
+router = APIRouter()
+
+
+@router.post("/voice/turns")
+async def record_turn(trace: TurnTrace):
+    """Record a finished turn trace reported by the voice agent"""
+    turn_traces.record(trace)
+    return {"status": "recorded"}
+
+
+@router.get("/voice/turns")
+async def list_turns(limit: int = Query(50, ge=1, le=1000)):
+    """Most recent turn traces, newest first, with per-stage latency percentiles"""
+    return {
+        "turns": turn_traces.recent(limit),
+        "summary": turn_traces.summary(),
+    }
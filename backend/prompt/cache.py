@@ -0,0 +1,69 @@
+"""
+In-memory settings cache.
+
+Loaded once at startup and written through to SQLite, so reading the
+prompt never opens a database connection. Each key has a content-hash
+ETag; long-poll watchers wait on a condition until it changes.
+
+The cache is per process: an update made through one uvicorn worker is not
+seen, and does not wake watchers, in another. Run the backend with a single
+worker (the default); scale it out with separate instances only once
+settings are shared some other way.
+"""
+import asyncio
+import hashlib
+import logging
+from typing import Dict
+
+from database import list_settings, upsert_setting
+from observability.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class SettingsCache:
+    def __init__(self):
+        self._values: Dict[str, str] = {}
+        self._version = 0
+        self._write_lock = asyncio.Lock()
+        self._changed = asyncio.Condition()
+
+    async def load(self):
+        self._values = await list_settings()
+        self._version += 1
+        logger.info(f"Settings cache loaded ({len(self._values)} keys)")
+
+    @property
+    def version(self) -> int:
+        """Bumped on every write; resets on restart, unlike the ETag."""
+        return self._version
+
+    def get(self, key: str, default: str = "") -> str:
+        return self._values.get(key, default)
+
+    def etag(self, key: str) -> str:
+        digest = hashlib.sha256(self.get(key).encode("utf-8")).hexdigest()[:16]
+        return f'"{digest}"'
+
+    async def set(self, key: str, value: str):
+        async with self._write_lock:
+            await upsert_setting(key, value)
+            # Swap the whole dict so readers never see a partial update
+            self._values = {**self._values, key: value}
+            self._version += 1
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def wait_for_change(self, key: str, etag: str, timeout: float) -> bool:
+        """Wait until ``key`` no longer matches ``etag``; False on timeout."""
+        metrics.prompt_watchers.inc()
+        try:
+            async with self._changed:
+                await asyncio.wait_for(
+                    self._changed.wait_for(lambda: self.etag(key) != etag), timeout
+                )
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            metrics.prompt_watchers.dec()
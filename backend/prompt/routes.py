@@ -1,18 +1,48 @@
 import logging
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
 from prompt.schemas import PromptUpdate
-from dependencies import get_current_prompt, update_current_prompt
+from dependencies import update_current_prompt, get_settings_cache
+from settings import PROMPT_WATCH_TIMEOUT, PROMPT_WATCH_MAX_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+PROMPT_KEY = "system_prompt"
+
+
+def _prompt_response(request: Request) -> Response:
+    cache = get_settings_cache()
+    etag = cache.etag(PROMPT_KEY)
+    headers = {"ETag": etag, "X-Settings-Version": str(cache.version)}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse({"system_prompt": cache.get(PROMPT_KEY)}, headers=headers)
+
 
 @router.get("/prompt")
-async def get_prompt():
-    """Get current system prompt"""
-    prompt = await get_current_prompt()
-    return {"system_prompt": prompt}
+async def get_prompt(request: Request):
+    """Get current system prompt (supports If-None-Match)"""
+    return _prompt_response(request)
+
+
+@router.get("/prompt/watch")
+async def watch_prompt(
+    request: Request,
+    timeout: float = Query(PROMPT_WATCH_TIMEOUT, gt=0, le=PROMPT_WATCH_MAX_TIMEOUT),
+):
+    """Long-poll for a prompt change.
+
+    Returns the prompt as soon as its ETag differs from If-None-Match, or
+    304 if it is still unchanged after ``timeout`` seconds. Watchers are
+    woken by the SettingsCache of the process that applied the update, so
+    the backend must run as a single uvicorn worker (see prompt/cache.py).
+    """
+    etag = request.headers.get("if-none-match")
+    if etag:
+        await get_settings_cache().wait_for_change(PROMPT_KEY, etag, timeout)
+    return _prompt_response(request)
 
 
 @router.post("/prompt")
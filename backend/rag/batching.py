@@ -0,0 +1,79 @@
+"""
+Micro-batching for query embeddings.
+
+Concurrent /query calls each need a single-sentence embedding. Encoding
+them one at a time wastes most of a CPU forward pass, so queries arriving
+within a short window are collected and encoded together.
+"""
+import time
+import asyncio
+import logging
+from typing import Callable, List, Set, Tuple
+
+import executor
+from observability.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbeddingBatcher:
+    """Coalesces concurrent query embeddings into one batched encode."""
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], List[List[float]]],
+        window_ms: float,
+        max_batch_size: int,
+    ):
+        self._embed_batch = embed_batch
+        self._window = window_ms / 1000
+        self._max_batch_size = max(1, max_batch_size)
+        self._pending: List[Tuple[str, asyncio.Future, float]] = []
+        self._timer = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future, time.perf_counter()))
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future, float]]):
+        now = time.perf_counter()
+        for _, _, queued_at in batch:
+            metrics.rag_embed_queue_delay_seconds.observe(now - queued_at)
+
+        # Identical queries in the same window share one encode
+        unique_texts = list(dict.fromkeys(text for text, _, _ in batch))
+        metrics.rag_embed_batch_size.observe(len(unique_texts))
+
+        try:
+            vectors = await executor.run("embed_query", self._embed_batch, unique_texts)
+        except Exception as e:
+            logger.error(f"Batched query embedding failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_text = dict(zip(unique_texts, vectors))
+        for text, future, _ in batch:
+            if not future.done():
+                future.set_result(by_text[text])
@@ -0,0 +1,143 @@
+"""
+Query-result cache for RAG retrieval.
+
+Tier one is an exact-match LRU keyed by the normalized query text. Tier
+two reuses results for a query whose embedding lies within a cosine
+threshold of a cached one. Both tiers are bounded, expire entries after a
+TTL, and are cleared whenever the corpus changes.
+"""
+import re
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from observability.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+Results = List[Dict[str, Any]]
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(_PUNCTUATION.sub(" ", query.lower()).split())
+
+
+class QueryResultCache:
+    """Two-tier (exact + semantic) cache of retrieval results."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        semantic_max_entries: int,
+        ttl_seconds: float,
+        similarity_threshold: float,
+    ):
+        self.max_entries = max_entries
+        self.semantic_max_entries = semantic_max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.generation = 0
+        self._exact: "OrderedDict[Tuple[str, int], Tuple[float, Results]]" = OrderedDict()
+        self._semantic: "OrderedDict[Tuple[str, int], Tuple[float, np.ndarray, Results]]" = OrderedDict()
+
+    def get_exact(self, query: str, top_k: int) -> Optional[Results]:
+        key = (normalize_query(query), top_k)
+        entry = self._exact.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            self._evict(self._exact, key, tier="exact", reason="ttl")
+            entry = None
+
+        if entry is None:
+            metrics.rag_cache_requests_total.labels(tier="exact", result="miss").inc()
+            return None
+
+        self._exact.move_to_end(key)
+        metrics.rag_cache_requests_total.labels(tier="exact", result="hit").inc()
+        return _copy(entry[1])
+
+    def get_semantic(self, embedding: List[float], top_k: int) -> Optional[Results]:
+        self._expire(self._semantic, tier="semantic")
+        candidates = [(key, entry) for key, entry in self._semantic.items() if key[1] == top_k]
+        if not candidates:
+            metrics.rag_cache_requests_total.labels(tier="semantic", result="miss").inc()
+            return None
+
+        vectors = np.stack([entry[1] for _, entry in candidates])
+        similarities = vectors @ _unit(embedding)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            metrics.rag_cache_requests_total.labels(tier="semantic", result="miss").inc()
+            return None
+
+        key, entry = candidates[best]
+        self._semantic.move_to_end(key)
+        metrics.rag_cache_requests_total.labels(tier="semantic", result="hit").inc()
+        return _copy(entry[2])
+
+    def put(
+        self,
+        query: str,
+        embedding: Optional[List[float]],
+        top_k: int,
+        results: Results,
+        generation: int,
+    ):
+        # Results computed against a corpus that has since changed are dropped
+        if generation != self.generation:
+            return
+
+        key = (normalize_query(query), top_k)
+        expires_at = time.monotonic() + self.ttl_seconds
+        self._exact[key] = (expires_at, _copy(results))
+        self._exact.move_to_end(key)
+        self._trim(self._exact, self.max_entries, tier="exact")
+
+        if embedding is not None:
+            self._semantic[key] = (expires_at, _unit(embedding), _copy(results))
+            self._semantic.move_to_end(key)
+            self._trim(self._semantic, self.semantic_max_entries, tier="semantic")
+
+        self._report_size()
+
+    def invalidate(self):
+        """Drop every entry; called after the corpus changes."""
+        self.generation += 1
+        for tier, entries in (("exact", self._exact), ("semantic", self._semantic)):
+            if entries:
+                metrics.rag_cache_evictions_total.labels(tier=tier, reason="invalidate").inc(len(entries))
+                entries.clear()
+        self._report_size()
+
+    def _trim(self, entries: OrderedDict, limit: int, tier: str):
+        while len(entries) > limit:
+            entries.popitem(last=False)
+            metrics.rag_cache_evictions_total.labels(tier=tier, reason="capacity").inc()
+
+    def _expire(self, entries: OrderedDict, tier: str):
+        now = time.monotonic()
+        for key in [key for key, entry in entries.items() if entry[0] < now]:
+            self._evict(entries, key, tier=tier, reason="ttl")
+
+    def _evict(self, entries: OrderedDict, key, tier: str, reason: str):
+        del entries[key]
+        metrics.rag_cache_evictions_total.labels(tier=tier, reason=reason).inc()
+        self._report_size()
+
+    def _report_size(self):
+        metrics.rag_cache_entries.labels(tier="exact").set(len(self._exact))
+        metrics.rag_cache_entries.labels(tier="semantic").set(len(self._semantic))
+
+
+def _unit(embedding: List[float]) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _copy(results: Results) -> Results:
+    return [dict(result) for result in results]
@@ -0,0 +1,305 @@
+"""
+Incremental chunking for text that arrives in pieces (PDF pages, file blocks).
+
+Two engines share the feed/finish interface and emit Chunk objects:
+
+- StreamingSplitter wraps a LangChain character splitter.
+- TokenChunker packs whole sentences into chunks measured in the
+  embedding model's own tokens, starts a new chunk at headings, and
+  records character offsets and page numbers for every chunk.
+"""
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain.text_splitter import TextSplitter
+
+
+@dataclass
+class Chunk:
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class StreamingSplitter:
+    """Feeds pieces of a document through a text splitter without holding the whole text.
+
+    Only a window of a few chunks is buffered: every split emits all but the
+    last chunk, which is carried over because it may continue in the next
+    piece.
+    """
+
+    def __init__(self, splitter: TextSplitter, chunk_size: int, separator: str = "\n"):
+        self._splitter = splitter
+        self._min_buffer = 4 * chunk_size
+        self._separator = separator
+        self._buffer = ""
+
+    def feed(self, text: str, page: Optional[int] = None) -> List[Chunk]:
+        self._buffer = f"{self._buffer}{self._separator}{text}" if self._buffer else text
+        if len(self._buffer) < self._min_buffer:
+            return []
+
+        chunks = self._splitter.split_text(self._buffer)
+        if len(chunks) < 2:
+            return []
+
+        tail = chunks[-1]
+        self._buffer = self._buffer[self._buffer.rfind(tail):]
+        return [Chunk(text) for text in chunks[:-1]]
+
+    def finish(self) -> List[Chunk]:
+        chunks = self._splitter.split_text(self._buffer) if self._buffer else []
+        self._buffer = ""
+        return [Chunk(text) for text in chunks]
+
+
+class TokenCounter:
+    """Batch token counting with a fast (Rust) HuggingFace tokenizer.
+
+    Fast tokenizers must not be called from two threads at once, so calls
+    are serialised; give the counter its own tokenizer instance rather than
+    the one the embedding model encodes with.
+    """
+
+    def __init__(self, tokenizer):
+        self._tokenizer = tokenizer
+        self._lock = threading.Lock()
+
+    def lengths(self, texts: List[str]) -> List[int]:
+        if not texts:
+            return []
+        with self._lock:
+            encoded = self._tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+
+    def split(self, text: str, max_tokens: int) -> List[Tuple[int, int, int]]:
+        """Cut ``text`` at token boundaries into (start, end, tokens) spans of at most ``max_tokens``."""
+        with self._lock:
+            offsets = self._tokenizer(
+                text, add_special_tokens=False, return_offsets_mapping=True
+            )["offset_mapping"]
+        spans = []
+        for i in range(0, len(offsets), max_tokens):
+            window = offsets[i:i + max_tokens]
+            end = offsets[i + max_tokens][0] if i + max_tokens < len(offsets) else len(text)
+            spans.append((window[0][0], end, len(window)))
+        return spans
+
+
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*(?=\s)")
+_BULLET = re.compile(r"\s*(?:[-*•]|\d+[.)])\s+")
+_NUMBERED_SECTION = re.compile(r"\d+(?:\.\d+)+\.?\s+\S")
+_NUMBERED_TITLE = re.compile(r"\d+\.\s+(.*)")
+
+
+def is_heading(line: str) -> bool:
+    """Markdown headings, "4.1 Title" sections, "4. Title Case" titles and short ALL-CAPS lines."""
+    s = line.strip()
+    if not s or len(s) > 80 or s[-1] in ".,;":
+        return False
+    if s.startswith("#") or _NUMBERED_SECTION.match(s):
+        return True
+    if s.isupper() and any(ch.isalpha() for ch in s):
+        return True
+    titled = _NUMBERED_TITLE.match(s)
+    if titled:
+        # Title Case, where short words like "of" may stay lower case; a
+        # numbered list item ("1. Open the box") has one capital at most
+        words = titled.group(1).split()
+        capitalised = sum(w[0].isupper() for w in words)
+        return capitalised >= min(2, len(words)) and all(
+            not w[0].isalpha() or w[0].isupper() or len(w) <= 3 for w in words
+        )
+    return False
+
+
+def segment(text: str) -> List[Tuple[int, int, bool]]:
+    """Split text into (start, end, is_heading) units: headings, list items and sentences.
+
+    Paragraph breaks, headings and list items always end a unit; inside a
+    paragraph, units end after sentence punctuation.
+    """
+    units: List[Tuple[int, int, bool]] = []
+    block_start: Optional[int] = None
+
+    def close_block(end: int):
+        nonlocal block_start
+        if block_start is None:
+            return
+        start = block_start
+        block_start = None
+        for match in _SENTENCE_END.finditer(text, start, end):
+            _append(start, match.end(), False)
+            start = match.end()
+        _append(start, end, False)
+
+    def _append(start: int, end: int, heading: bool):
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            units.append((start, end, heading))
+
+    position = 0
+    for line in text.splitlines(keepends=True):
+        line_end = position + len(line)
+        if not line.strip():
+            close_block(position)
+        elif is_heading(line):
+            close_block(position)
+            _append(position, line_end, True)
+        else:
+            if _BULLET.match(line):
+                close_block(position)
+            if block_start is None:
+                block_start = position
+        position = line_end
+    close_block(len(text))
+    return units
+
+
+@dataclass
+class _Unit:
+    text: str
+    gap: str  # whitespace separating this unit from the previous one
+    start: int
+    end: int
+    page: Optional[int]
+    tokens: int
+    heading: bool
+
+
+class TokenChunker:
+    """Packs sentences into chunks of at most ``max_tokens`` model tokens.
+
+    A heading starts a new chunk (unless the current one is still tiny, so
+    stacked headings stay together), consecutive chunks within a section
+    overlap by up to ``overlap_tokens`` of whole sentences, and a sentence
+    longer than a chunk is cut at token boundaries. The last unit of each
+    piece is held back because it may continue in the next piece. Offsets
+    index the document as the pieces joined by ``separator``.
+    """
+
+    def __init__(self, counter: TokenCounter, max_tokens: int, overlap_tokens: int, separator: str = "\n"):
+        self._counter = counter
+        self.max_tokens = max_tokens
+        self.overlap_tokens = min(overlap_tokens, max_tokens // 2)
+        self._min_tokens = max_tokens // 4
+        self._separator = separator
+
+        self._buffer = ""
+        self._buffer_start = 0  # document offset of _buffer[0]
+        self._buffer_pages: List[Tuple[int, Optional[int]]] = []  # (buffer position, page)
+        self._doc_length = 0
+
+        self._current: List[_Unit] = []
+        self._current_tokens = 0
+
+    def feed(self, text: str, page: Optional[int] = None) -> List[Chunk]:
+        if self._doc_length:
+            self._buffer += self._separator
+            self._doc_length += len(self._separator)
+        self._buffer_pages.append((len(self._buffer), page))
+        self._buffer += text
+        self._doc_length += len(text)
+        return self._drain(final=False)
+
+    def finish(self) -> List[Chunk]:
+        chunks = self._drain(final=True)
+        if self._current:
+            chunks.append(self._flush(overlap=False))
+        return chunks
+
+    def _drain(self, final: bool) -> List[Chunk]:
+        spans = segment(self._buffer)
+        if not final:
+            spans = spans[:-1]
+        if not spans:
+            return []
+
+        lengths = self._counter.lengths([self._buffer[start:end] for start, end, _ in spans])
+        chunks = []
+        previous_end = 0
+        for (start, end, heading), tokens in zip(spans, lengths):
+            gap = self._buffer[previous_end:start]
+            for unit in self._units(start, end, heading, tokens, gap):
+                chunks.extend(self._add(unit))
+            previous_end = end
+
+        # Keep only what follows the last consumed unit
+        self._buffer = self._buffer[previous_end:]
+        self._buffer_start += previous_end
+        page = self._page_at(previous_end)
+        self._buffer_pages = [(0, page)] + [
+            (position - previous_end, p) for position, p in self._buffer_pages if position > previous_end
+        ]
+        return chunks
+
+    def _units(self, start: int, end: int, heading: bool, tokens: int, gap: str) -> List[_Unit]:
+        text = self._buffer[start:end]
+        if tokens <= self.max_tokens:
+            return [self._unit(text, gap, start, end, tokens, heading)]
+        units = []
+        for i, (piece_start, piece_end, piece_tokens) in enumerate(self._counter.split(text, self.max_tokens)):
+            piece = text[piece_start:piece_end]
+            stripped = piece.rstrip()
+            units.append(self._unit(
+                stripped, gap if i == 0 else "", start + piece_start,
+                start + piece_start + len(stripped), piece_tokens, heading and i == 0,
+            ))
+        return units
+
+    def _unit(self, text: str, gap: str, start: int, end: int, tokens: int, heading: bool) -> _Unit:
+        return _Unit(
+            text=text, gap=gap,
+            start=self._buffer_start + start, end=self._buffer_start + end,
+            page=self._page_at(start), tokens=tokens, heading=heading,
+        )
+
+    def _page_at(self, position: int) -> Optional[int]:
+        page = None
+        for start, p in self._buffer_pages:
+            if start > position:
+                break
+            page = p
+        return page
+
+    def _add(self, unit: _Unit) -> List[Chunk]:
+        chunks = []
+        if unit.heading and self._current_tokens >= self._min_tokens:
+            chunks.append(self._flush(overlap=False))
+        if self._current and self._current_tokens + unit.tokens > self.max_tokens:
+            chunks.append(self._flush(overlap=True))
+            if self._current and self._current_tokens + unit.tokens > self.max_tokens:
+                self._current, self._current_tokens = [], 0
+        self._current.append(unit)
+        self._current_tokens += unit.tokens
+        return chunks
+
+    def _flush(self, overlap: bool) -> Chunk:
+        units = self._current
+        text = units[0].text + "".join(unit.gap + unit.text for unit in units[1:])
+        metadata: Dict[str, Any] = {
+            "start_offset": units[0].start,
+            "end_offset": units[-1].end,
+            "token_count": self._current_tokens,
+        }
+        pages = [unit.page for unit in units if unit.page is not None]
+        if pages:
+            metadata["page_start"] = min(pages)
+            metadata["page_end"] = max(pages)
+
+        carried: List[_Unit] = []
+        if overlap and self.overlap_tokens:
+            tokens = 0
+            for unit in reversed(units[1:]):
+                if tokens + unit.tokens > self.overlap_tokens:
+                    break
+                carried.insert(0, unit)
+                tokens += unit.tokens
+        self._current = carried
+        self._current_tokens = sum(unit.tokens for unit in carried)
+        return Chunk(text, metadata)
@@ -0,0 +1,39 @@
+"""
+Corpus change feed shared through the Chroma persistence directory.
+
+The backend rewrites a small marker file whenever it changes the corpus;
+read-only RAG services in other processes (the voice agent's in-process
+mode) poll it and reopen their Chroma client when it changes.
+"""
+import os
+import time
+import logging
+from typing import Optional
+
+from constants import CORPUS_VERSION_FILENAME
+from settings import CHROMA_PERSIST_DIR
+
+logger = logging.getLogger(__name__)
+
+
+def _marker_path() -> str:
+    return os.path.join(CHROMA_PERSIST_DIR, CORPUS_VERSION_FILENAME)
+
+
+def bump_corpus_version():
+    path = _marker_path()
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(str(time.time_ns()))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not update corpus version marker: {e}")
+
+
+def read_corpus_version() -> Optional[str]:
+    try:
+        with open(_marker_path()) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,82 @@
+"""
+Persistent embedding cache keyed by (model name, sha256 of chunk text).
+
+Vectors are stored as float32, or as float16 to halve the file; the
+storage type is part of the key so the two never mix.
+
+Lets re-ingestion skip encoding chunks that have been seen before. Lives
+in its own SQLite file next to app.db and is only touched from the ingest
+thread pool, so it uses the synchronous sqlite3 module.
+"""
+import hashlib
+import sqlite3
+import logging
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Stay well below SQLite's host-parameter limit
+_LOOKUP_BATCH = 500
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Content-addressed store of embedding vectors."""
+
+    def __init__(self, path: str, model_name: str, dtype: str = "float32"):
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.model_name = model_name if dtype == "float32" else f"{model_name}#{dtype}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, content_hash)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+        logger.info(f"Embedding cache opened at {path}")
+
+    def get_many(self, hashes: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            for i in range(0, len(unique), _LOOKUP_BATCH):
+                batch = unique[i:i + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT content_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND content_hash IN ({placeholders})",
+                    (self.model_name, *batch),
+                ).fetchall()
+                for digest, blob in rows:
+                    found[digest] = np.frombuffer(blob, dtype=self.dtype).astype(np.float32).tolist()
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, List[float]]]):
+        rows = [
+            (self.model_name, digest, np.asarray(vector, dtype=self.dtype).tobytes())
+            for digest, vector in items
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, content_hash, vector) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
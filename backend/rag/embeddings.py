@@ -0,0 +1,99 @@
+"""
+Embedding model backends.
+
+The model is loaded through sentence-transformers either as the original
+PyTorch weights or as an ONNX Runtime session: the fp32 export or the
+pre-quantized int8 export for the host's instruction set. Every backend
+of the same model tier embeds into the same vector space, so they share a
+Chroma collection; the tiers do not.
+"""
+import copy
+import logging
+from typing import Optional
+
+from langchain_community.embeddings import HuggingFaceEmbeddings
+
+from rag.chunking import TokenCounter
+from constants import CHROMA_COLLECTION_NAME, EMBEDDING_MODEL_TIERS, ONNX_QUANTIZED_FILES
+from settings import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL_TIER,
+    EMBEDDING_QUANTIZATION_TARGET,
+    EMBEDDING_THREADS,
+)
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def embedding_model_name(tier: str = EMBEDDING_MODEL_TIER) -> str:
+    if tier not in EMBEDDING_MODEL_TIERS:
+        raise ValueError(f"Unknown embedding model tier: {tier}")
+    return EMBEDDING_MODEL_TIERS[tier]
+
+
+def embedding_model_key(tier: str = EMBEDDING_MODEL_TIER, backend: str = EMBEDDING_BACKEND) -> str:
+    """Embedding cache key: vectors from different backends are close but not identical."""
+    name = embedding_model_name(tier)
+    # The PyTorch baseline keeps the bare model name so existing cache rows stay valid
+    return name if backend == "torch" else f"{name}@{backend}"
+
+
+def collection_name(tier: str = EMBEDDING_MODEL_TIER) -> str:
+    return CHROMA_COLLECTION_NAME if tier == "base" else f"{CHROMA_COLLECTION_NAME}_{tier}"
+
+
+def create_embeddings(
+    tier: str = EMBEDDING_MODEL_TIER,
+    backend: str = EMBEDDING_BACKEND,
+    threads: int = EMBEDDING_THREADS,
+    quantization_target: str = EMBEDDING_QUANTIZATION_TARGET,
+) -> HuggingFaceEmbeddings:
+    """Build the LangChain embeddings object for a tier and backend."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend} (expected one of {', '.join(BACKENDS)})")
+
+    model_name = embedding_model_name(tier)
+    model_kwargs = {"device": "cpu"}
+
+    if backend == "torch":
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+    else:
+        model_kwargs["backend"] = "onnx"
+        model_kwargs["model_kwargs"] = _onnx_model_kwargs(backend, threads, quantization_target)
+
+    logger.info(f"Loading embedding model {model_name} (backend={backend}, threads={threads or 'default'})")
+    return HuggingFaceEmbeddings(model_name=model_name, model_kwargs=model_kwargs)
+
+
+def _onnx_model_kwargs(backend: str, threads: int, quantization_target: str) -> dict:
+    import onnxruntime
+
+    file_name: Optional[str] = "onnx/model.onnx"
+    if backend == "onnx-int8":
+        if quantization_target not in ONNX_QUANTIZED_FILES:
+            raise ValueError(f"Unknown quantization target: {quantization_target}")
+        file_name = ONNX_QUANTIZED_FILES[quantization_target]
+
+    session_options = onnxruntime.SessionOptions()
+    if threads:
+        session_options.intra_op_num_threads = threads
+        session_options.inter_op_num_threads = 1
+    return {
+        "file_name": file_name,
+        "provider": "CPUExecutionProvider",
+        "session_options": session_options,
+    }
+
+
+def create_token_counter(embeddings: HuggingFaceEmbeddings) -> TokenCounter:
+    """Counts tokens with a private copy of the model's own tokenizer."""
+    return TokenCounter(copy.deepcopy(embeddings.client.tokenizer))
+
+
+def token_limit(embeddings: HuggingFaceEmbeddings) -> int:
+    """Longest input the model embeds without truncating, less [CLS] and [SEP]."""
+    return embeddings.client.max_seq_length - 2
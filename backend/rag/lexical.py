@@ -0,0 +1,163 @@
+"""
+Lexical (BM25) retrieval and rank fusion.
+
+An in-memory inverted index over the same chunks as the Chroma
+collection. Postings are per-term dicts, so adding or removing a chunk
+only touches that chunk's own terms, and a lookup only visits the
+postings of the query terms.
+"""
+import re
+import math
+import heapq
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Results = List[Dict[str, Any]]
+
+# Words plus joined codes such as "sku-4821" or "v2.1"
+_TOKEN = re.compile(r"[a-z0-9]+(?:[-_./][a-z0-9]+)*")
+_PART = re.compile(r"[a-z0-9]+")
+
+# Function words carry almost no BM25 weight but have the longest postings
+STOPWORDS = frozenset(
+    "a an and are as at be but by can could do does did for from had has have how i if in "
+    "into is it its me my of on or our so than that the their them then there these they "
+    "this to was we were what when where which who why will with would you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms; a joined code also yields its parts, so "SKU-4821" matches "4821"."""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        tokens.append(token)
+        parts = _PART.findall(token)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def has_exact_terms(text: str) -> bool:
+    """True if the text contains a term with a digit: a code, SKU, version or number."""
+    return any(any(ch.isdigit() for ch in token) for token in _TOKEN.findall(text.lower()))
+
+
+class BM25Index:
+    """Okapi BM25 over chunk ids. Safe to mutate from executor threads while searching."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._docs: Dict[str, Tuple[int, List[str], str, Dict[str, Any]]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, ids: Sequence[str], texts: Sequence[str], metadatas: Sequence[Optional[Dict[str, Any]]]):
+        with self._lock:
+            for chunk_id, text, metadata in zip(ids, texts, metadatas):
+                self._remove_one(chunk_id)
+                terms = tokenize(text)
+                for term, tf in Counter(terms).items():
+                    self._postings[term][chunk_id] = tf
+                unique_terms = list(set(terms))
+                self._docs[chunk_id] = (len(terms), unique_terms, text, metadata or {})
+                self._total_length += len(terms)
+
+    def remove(self, ids: Iterable[str]):
+        with self._lock:
+            for chunk_id in ids:
+                self._remove_one(chunk_id)
+
+    def _remove_one(self, chunk_id: str):
+        doc = self._docs.pop(chunk_id, None)
+        if doc is None:
+            return
+        length, unique_terms, _, _ = doc
+        self._total_length -= length
+        for term in unique_terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(chunk_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def update_metadatas(self, ids: Sequence[str], metadatas: Sequence[Dict[str, Any]]):
+        with self._lock:
+            for chunk_id, metadata in zip(ids, metadatas):
+                doc = self._docs.get(chunk_id)
+                if doc is not None:
+                    self._docs[chunk_id] = (doc[0], doc[1], doc[2], metadata or {})
+
+    def clear(self):
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._docs = {}
+            self._total_length = 0
+
+    def search(self, query: str, top_k: int) -> Results:
+        """Top ``top_k`` chunks by BM25 over every query term found in the index."""
+        with self._lock:
+            n_docs = len(self._docs)
+            if n_docs == 0:
+                return []
+            postings_by_term = [
+                self._postings[term] for term in set(tokenize(query)) if term in self._postings
+            ]
+
+            k1, b = self.k1, self.b
+            avg_length = self._total_length / n_docs
+            docs = self._docs
+            scores: Dict[str, float] = defaultdict(float)
+            for postings in postings_by_term:
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for chunk_id, tf in postings.items():
+                    norm = k1 * (1 - b + b * docs[chunk_id][0] / avg_length)
+                    scores[chunk_id] += idf * tf * (k1 + 1) / (tf + norm)
+
+            best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+            return [
+                {
+                    "id": chunk_id,
+                    "content": self._docs[chunk_id][2],
+                    "metadata": dict(self._docs[chunk_id][3]),
+                    "lexical_score": score,
+                }
+                for chunk_id, score in best
+            ]
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Sequence[Tuple[Results, float]],
+    top_k: int,
+    k: int = 60,
+) -> Results:
+    """Fuse ranked result lists by weighted RRF: sum of weight / (k + rank).
+
+    Each list is paired with its weight; results are matched by ``id`` and
+    the first occurrence supplies the fields of the fused result.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    scores: Dict[str, float] = defaultdict(float)
+    for results, weight in ranked_lists:
+        if weight <= 0:
+            continue
+        for rank, result in enumerate(results, 1):
+            scores[result["id"]] += weight / (k + rank)
+            merged = fused.setdefault(result["id"], dict(result))
+            for key, value in result.items():
+                merged.setdefault(key, value)
+
+    ordered = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+    return [{**fused[chunk_id], "fusion_score": score} for chunk_id, score in ordered]
@@ -0,0 +1,97 @@
+"""
+Cross-encoder re-ranking.
+
+Scores (query, chunk) pairs jointly with a small local cross-encoder,
+which orders candidates far better than embedding distance alone. Runs
+under a per-query latency budget: when scoring does not finish in time
+the caller gets the retrieval order back instead.
+
+Scoring runs on its own "rerank" pool. A pass that times out keeps its
+thread until it finishes, so while every thread is busy new queries skip
+re-ranking rather than queue behind abandoned work.
+"""
+import time
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+import executor
+from observability.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+Results = List[Dict[str, Any]]
+
+
+class CrossEncoderReranker:
+    """Batched CPU cross-encoder scoring with a timeout fallback."""
+
+    def __init__(
+        self,
+        model_name: str,
+        candidates: int,
+        budget_ms: float,
+        batch_size: int,
+        max_length: int,
+        max_in_flight: int,
+    ):
+        # Same package that backs the HuggingFace embeddings
+        from sentence_transformers import CrossEncoder
+
+        logger.info(f"Loading re-ranking model: {model_name}")
+        self.model = CrossEncoder(model_name, max_length=max_length, device="cpu")
+        self.candidates = candidates
+        self.budget = budget_ms / 1000
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        # Scoring passes submitted and not yet finished, including abandoned ones
+        self._in_flight = 0
+
+    def warmup(self):
+        start = time.perf_counter()
+        self.score("warmup", ["warmup"])
+        logger.info(f"Re-ranking model warmed up in {time.perf_counter() - start:.2f}s")
+
+    def score(self, query: str, passages: List[str]) -> List[float]:
+        scores = self.model.predict(
+            [(query, passage) for passage in passages],
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+        )
+        return [float(score) for score in scores]
+
+    async def rerank(self, query: str, results: Results, top_k: int) -> Results:
+        """Best ``top_k`` of ``results`` by cross-encoder score, or the first ``top_k`` on timeout."""
+        if len(results) <= 1:
+            return results[:top_k]
+
+        if self._in_flight >= self.max_in_flight:
+            metrics.rag_rerank_total.labels(outcome="skipped").inc()
+            logger.warning("Re-ranking pool is busy, using retrieval order")
+            return results[:top_k]
+
+        start = time.perf_counter()
+        task = asyncio.ensure_future(executor.run("rerank", self.score, query, [r["content"] for r in results]))
+        self._in_flight += 1
+        task.add_done_callback(self._finished)
+        try:
+            # Shielded: on timeout the pass still runs to the end and is counted until then
+            scores = await asyncio.wait_for(asyncio.shield(task), timeout=self.budget)
+        except asyncio.TimeoutError:
+            metrics.rag_rerank_total.labels(outcome="timeout").inc()
+            logger.warning(f"Re-ranking exceeded {self.budget * 1000:.0f}ms budget, using retrieval order")
+            return results[:top_k]
+        except Exception as e:
+            metrics.rag_rerank_total.labels(outcome="error").inc()
+            logger.error(f"Re-ranking failed, using retrieval order: {e}")
+            return results[:top_k]
+
+        metrics.rag_rerank_seconds.observe(time.perf_counter() - start)
+        metrics.rag_rerank_total.labels(outcome="reranked").inc()
+        ranked = sorted(zip(scores, results), key=lambda pair: pair[0], reverse=True)[:top_k]
+        return [{**result, "rerank_score": score} for score, result in ranked]
+
+    def _finished(self, task: asyncio.Future):
+        self._in_flight -= 1
+        if not task.cancelled():
+            task.exception()  # retrieved here so an abandoned pass's error is not logged as unhandled
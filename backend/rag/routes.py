@@ -1,7 +1,8 @@
 import time
 import logging
 from fastapi import APIRouter, HTTPException
-from rag.schemas import QueryRequest
+import executor
+from rag.schemas import QueryRequest, ShardStats, ShardRebalanceResult
 from dependencies import get_rag_service
 from settings import TOP_K_RESULTS
 from observability.metrics import metrics
@@ -29,3 +30,26 @@ async def query_rag(request: QueryRequest):
         metrics.rag_queries_total.labels(status="error").inc()
         logger.error(f"Error querying RAG: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/shards", response_model=ShardStats)
+async def get_shards():
+    """Vector store shards and how many chunks each holds"""
+    try:
+        rag = get_rag_service()
+        return await executor.run("vector_read", rag.shard_stats)
+    except Exception as e:
+        logger.error(f"Error reading shard stats: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/shards/rebalance", response_model=ShardRebalanceResult)
+async def rebalance_shards():
+    """Move chunks into the shards the current RAG_SHARD_COUNT and RAG_SHARD_STRATEGY assign"""
+    try:
+        return await get_rag_service().rebalance_shards()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error rebalancing shards: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,5 +1,24 @@
+from typing import List
+
 from pydantic import BaseModel
 
 
 class QueryRequest(BaseModel):
     query: str
+
+
+class ShardInfo(BaseModel):
+    name: str
+    chunks: int
+
+
+class ShardStats(BaseModel):
+    strategy: str
+    shards: List[ShardInfo]
+    unsharded_chunks: int
+
+
+class ShardRebalanceResult(BaseModel):
+    absorbed: int
+    moved: int
+    shards_removed: int
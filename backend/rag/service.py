@@ -1,56 +1,443 @@
 """
 RAG Service using Local Embeddings (no OpenAI client issues)
 """
+import time
+import uuid
+import asyncio
 import logging
-from typing import List, Dict, Any
-from langchain_community.embeddings import HuggingFaceEmbeddings
+from typing import List, Dict, Any, Optional, Tuple, Union
+import numpy as np
 from langchain_community.vectorstores import Chroma
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from constants import CHROMA_COLLECTION_NAME, EMBEDDING_MODEL_NAME, DEFAULT_TOP_K_RESULTS
-from settings import CHROMA_PERSIST_DIR, CHUNK_SIZE, CHUNK_OVERLAP, TOP_K_RESULTS
+import executor
+from rag.batching import QueryEmbeddingBatcher
+from rag.cache import QueryResultCache
+from rag.chunking import StreamingSplitter, TokenChunker
+from rag.locks import ReadWriteLock
+from rag.embedding_cache import EmbeddingCache, content_hash
+from rag.corpus_version import bump_corpus_version, read_corpus_version
+from rag.lexical import BM25Index, has_exact_terms, reciprocal_rank_fusion
+from rag.rerank import CrossEncoderReranker
+from rag.shards import ShardedCollection, ShardRouter, shard_names
+from rag.embeddings import (
+    create_embeddings,
+    create_token_counter,
+    embedding_model_key,
+    collection_name,
+    token_limit,
+)
+from observability.metrics import metrics
+from constants import (
+    DEFAULT_TOP_K_RESULTS,
+    BM25_K1,
+    BM25_B,
+    LEXICAL_INDEX_LOAD_BATCH,
+    SHARD_REBALANCE_BATCH,
+)
+from settings import (
+    CHROMA_PERSIST_DIR,
+    CHUNK_SIZE,
+    CHUNK_OVERLAP,
+    CHUNKER,
+    CHUNK_TOKENS,
+    CHUNK_OVERLAP_TOKENS,
+    TOP_K_RESULTS,
+    QUERY_BATCH_WINDOW_MS,
+    QUERY_BATCH_MAX_SIZE,
+    RAG_CACHE_ENABLED,
+    RAG_CACHE_MAX_ENTRIES,
+    RAG_CACHE_SEMANTIC_MAX_ENTRIES,
+    RAG_CACHE_TTL_SECONDS,
+    RAG_CACHE_SIMILARITY_THRESHOLD,
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_DTYPE,
+    RAG_RELOAD_CHECK_SECONDS,
+    RAG_HYBRID_ENABLED,
+    RAG_HYBRID_DENSE_WEIGHT,
+    RAG_HYBRID_LEXICAL_WEIGHT,
+    RAG_HYBRID_CANDIDATES,
+    RAG_HYBRID_RRF_K,
+    RAG_RERANK_ENABLED,
+    RAG_RERANK_MODEL,
+    RAG_RERANK_CANDIDATES,
+    RAG_RERANK_BUDGET_MS,
+    RAG_RERANK_BATCH_SIZE,
+    RAG_RERANK_MAX_LENGTH,
+    RAG_RERANK_THREADS,
+    RAG_SHARD_COUNT,
+    RAG_SHARD_STRATEGY,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class RAGService:
-    """RAG Service using Local HuggingFace Embeddings"""
+    """RAG Service using Local HuggingFace Embeddings
+
+    With ``read_only=True`` the service only retrieves, and reopens the
+    vector store whenever another process signals a corpus change. The
+    reopen and the BM25 rebuild run in the background into new objects
+    that are swapped in once ready, so retrieval never waits on a reload.
+    Writers signal a change once per finished document through
+    publish_corpus_change, not per batch.
+
+    With hybrid retrieval enabled, a BM25 index mirrors the collection and
+    every write path keeps it in step.
+
+    With RAG_SHARD_COUNT > 1 ``collection`` is a ShardedCollection: writes
+    are routed to the owning shard and queries fan out to all of them.
+    """
+
+    def __init__(self, read_only: bool = False):
+        self.read_only = read_only
 
-    def __init__(self):
         logger.info("Loading local embeddings model...")
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name=EMBEDDING_MODEL_NAME
+        self.embeddings = create_embeddings()
+
+        self.vector_store = None
+        self.collection = None  # the Chroma collection, or a ShardedCollection over several
+        self.lexical = None
+        self._corpus_version = read_corpus_version()
+        self._last_version_check = time.monotonic()
+        self._reload_task: Optional[asyncio.Task] = None
+        self._corpus_dirty = False
+        self._swap_in(*self._load_vector_store())
+
+        self.text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=CHUNK_SIZE,
+            chunk_overlap=CHUNK_OVERLAP,
+            length_function=len,
         )
+        self.token_counter = None
+        if CHUNKER == "token":
+            self.token_counter = create_token_counter(self.embeddings)
+            self.chunk_tokens = min(CHUNK_TOKENS, token_limit(self.embeddings))
+            logger.info(f"Chunking by model tokens: {self.chunk_tokens} per chunk, {CHUNK_OVERLAP_TOKENS} overlap")
+
+        self.query_batcher = QueryEmbeddingBatcher(
+            self.embeddings.embed_documents,
+            window_ms=QUERY_BATCH_WINDOW_MS,
+            max_batch_size=QUERY_BATCH_MAX_SIZE,
+        )
+
+        self.cache = None
+        if RAG_CACHE_ENABLED:
+            self.cache = QueryResultCache(
+                max_entries=RAG_CACHE_MAX_ENTRIES,
+                semantic_max_entries=RAG_CACHE_SEMANTIC_MAX_ENTRIES,
+                ttl_seconds=RAG_CACHE_TTL_SECONDS,
+                similarity_threshold=RAG_CACHE_SIMILARITY_THRESHOLD,
+            )
+
+        self.embedding_cache = None
+        if EMBEDDING_CACHE_ENABLED and not read_only:
+            try:
+                self.embedding_cache = EmbeddingCache(
+                    EMBEDDING_CACHE_PATH, embedding_model_key(), dtype=EMBEDDING_CACHE_DTYPE
+                )
+            except Exception as e:
+                logger.error(f"Error opening embedding cache, encoding every chunk: {e}")
+        self._encode_seconds_per_chunk = 0.0
+        self.corpus_lock = ReadWriteLock()
+
+        self.reranker = None
+        if RAG_RERANK_ENABLED:
+            try:
+                self.reranker = CrossEncoderReranker(
+                    RAG_RERANK_MODEL,
+                    candidates=RAG_RERANK_CANDIDATES,
+                    budget_ms=RAG_RERANK_BUDGET_MS,
+                    batch_size=RAG_RERANK_BATCH_SIZE,
+                    max_length=RAG_RERANK_MAX_LENGTH,
+                    max_in_flight=RAG_RERANK_THREADS,
+                )
+            except Exception as e:
+                logger.error(f"Error loading re-ranking model, using retrieval order: {e}")
+
+    def _load_vector_store(self) -> Tuple[Any, Any, Optional[BM25Index]]:
+        """Open the vector store, its collection handle and BM25 index as new objects.
+
+        Nothing on the service is touched, so this can run while retrieval
+        keeps using the current ones; (None, None, None) on failure.
+        """
+        if self.vector_store is not None:
+            # Chroma caches one client per path; drop it so the reopened
+            # client reads what other processes have written
+            self.vector_store._client.clear_system_cache()
 
         try:
-            self.vector_store = Chroma(
-                collection_name=CHROMA_COLLECTION_NAME,
+            vector_store = Chroma(
+                collection_name=collection_name(),
                 embedding_function=self.embeddings,
                 persist_directory=CHROMA_PERSIST_DIR,
                 collection_metadata={"hnsw:space": "cosine"},
             )
+            collection = self._open_collection(vector_store)
             logger.info("Vector store initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing vector store: {e}")
-            self.vector_store = None
+            return None, None, None
 
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=CHUNK_SIZE,
-            chunk_overlap=CHUNK_OVERLAP,
-            length_function=len,
-        )
+        lexical = self._build_lexical_index(collection) if RAG_HYBRID_ENABLED else None
+        return vector_store, collection, lexical
+
+    def _swap_in(self, vector_store, collection, lexical: Optional[BM25Index]):
+        previous = self.collection
+        self.vector_store, self.collection, self.lexical = vector_store, collection, lexical
+        if isinstance(previous, ShardedCollection) and previous is not collection:
+            previous.close()
+        if lexical is not None:
+            metrics.rag_lexical_index_chunks.set(len(lexical))
+
+    def _open_collection(self, vector_store):
+        if RAG_SHARD_COUNT <= 1:
+            return vector_store._collection
+
+        client = vector_store._client
+        shards = [
+            # Vectors are always supplied, so the shards need no embedding function
+            client.get_or_create_collection(name, metadata={"hnsw:space": "cosine"}, embedding_function=None)
+            for name in shard_names(collection_name(), RAG_SHARD_COUNT)
+        ]
+        unsharded = vector_store._collection.count()
+        if unsharded:
+            logger.warning(
+                f"{unsharded} chunks are still in the unsharded collection; "
+                f"POST /shards/rebalance moves them into the {RAG_SHARD_COUNT} shards"
+            )
+        logger.info(f"Vector store sharded over {RAG_SHARD_COUNT} collections by {RAG_SHARD_STRATEGY}")
+        return ShardedCollection(shards, ShardRouter(RAG_SHARD_STRATEGY, RAG_SHARD_COUNT))
 
-    async def add_documents(self, texts: List[str], metadatas: List[Dict[str, Any]]):
+    def _build_lexical_index(self, collection) -> BM25Index:
+        """Index every stored chunk of ``collection`` into a new BM25 index."""
+        start = time.perf_counter()
+        index = BM25Index(k1=BM25_K1, b=BM25_B)
+        offset = 0
+        while True:
+            page = collection.get(
+                include=["documents", "metadatas"], limit=LEXICAL_INDEX_LOAD_BATCH, offset=offset
+            )
+            if not page["ids"]:
+                break
+            index.add(page["ids"], page["documents"], page["metadatas"])
+            offset += len(page["ids"])
+        logger.info(f"BM25 index built over {len(index)} chunks in {time.perf_counter() - start:.2f}s")
+        return index
+
+    def _lexical_changed(self, add=None, update=None, remove=None):
+        """Mirror a collection write into the BM25 index; each argument is a tuple of column lists."""
+        if self.lexical is None:
+            return
+        if add:
+            self.lexical.add(*add)
+        if update:
+            self.lexical.update_metadatas(*update)
+        if remove:
+            self.lexical.remove(remove)
+        metrics.rag_lexical_index_chunks.set(len(self.lexical))
+
+    def _check_corpus_version(self):
+        """Start a background reload if another process changed the corpus (read-only mode)."""
+        now = time.monotonic()
+        if now - self._last_version_check < RAG_RELOAD_CHECK_SECONDS:
+            return
+        if self._reload_task is not None and not self._reload_task.done():
+            return
+        self._last_version_check = now
+
+        version = read_corpus_version()
+        if version != self._corpus_version:
+            self._reload_task = asyncio.ensure_future(self._reload(version))
+
+    async def _reload(self, version: Optional[str]):
+        """Build a new store and index off the request path, then swap them in."""
+        start = time.perf_counter()
+        try:
+            loaded = await executor.run("vector_reload", self._load_vector_store)
+        except Exception as e:
+            logger.error(f"Error reloading vector store: {e}")
+            return
+        if loaded[0] is None:
+            return  # keep serving the current store; the next check retries
+
+        # Only waits for searches already running; the swap itself is instant
+        async with self.corpus_lock.write():
+            self._swap_in(*loaded)
+            self._corpus_version = version
+            if self.cache:
+                self.cache.invalidate()
+        logger.info(f"Reloaded vector store after corpus change in {time.perf_counter() - start:.2f}s")
+
+    def _require_writable(self):
+        if self.read_only:
+            raise Exception("RAG service is read-only")
+
+    def warmup(self):
+        """Run a dummy encode so the first real request doesn't pay model load."""
+        start = time.perf_counter()
+        self.embeddings.embed_query("warmup")
+        logger.info(f"Embedding model warmed up in {time.perf_counter() - start:.2f}s")
+        if self.reranker:
+            self.reranker.warmup()
+
+    async def add_documents(self, texts: List[str], metadatas: List[Dict[str, Any]]) -> List[str]:
         if self.vector_store is None:
             raise Exception("Vector store not initialized")
+        self._require_writable()
 
         try:
-            self.vector_store.add_texts(texts=texts, metadatas=metadatas)
+            ids = await executor.run("embed", self._add_texts_sync, texts, metadatas)
+            self._corpus_changed()
             logger.info(f"Added {len(texts)} documents to vector store")
+            return ids
         except Exception as e:
             logger.error(f"Error adding documents: {e}")
             raise
 
+    def _add_texts_sync(self, texts: List[str], metadatas: List[Dict[str, Any]]) -> List[str]:
+        embeddings = self._embed_texts(texts)
+        ids = [str(uuid.uuid4()) for _ in texts]
+        self.collection.add(
+            ids=ids, embeddings=embeddings, documents=texts, metadatas=metadatas
+        )
+        self._lexical_changed(add=(ids, texts, metadatas))
+        return ids
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed chunks without storing them (cache-aware)."""
+        return await executor.run("embed", self._embed_texts, texts)
+
+    async def get_source_chunks(self, filename: str) -> List[Tuple[str, str]]:
+        """Return (id, content hash) for every stored chunk of ``filename``."""
+        if self.vector_store is None:
+            raise Exception("Vector store not initialized")
+
+        return await executor.run("vector_read", self._get_source_chunks_sync, filename)
+
+    def _get_source_chunks_sync(self, filename: str) -> List[Tuple[str, str]]:
+        results = self.collection.get(
+            where={"source": filename}, include=["metadatas", "documents"]
+        )
+        chunks = []
+        for chunk_id, metadata, content in zip(results["ids"], results["metadatas"], results["documents"]):
+            # Chunks ingested before hashes were recorded are hashed on the fly
+            digest = (metadata or {}).get("content_hash") or content_hash(content)
+            chunks.append((chunk_id, digest))
+        return chunks
+
+    async def apply_update(
+        self,
+        add_ids: List[str],
+        add_texts: List[str],
+        add_embeddings: List[List[float]],
+        add_metadatas: List[Dict[str, Any]],
+        update_ids: List[str],
+        update_metadatas: List[Dict[str, Any]],
+        delete_ids: List[str],
+    ):
+        """Apply a document diff while holding the corpus write lock.
+
+        Retrieval waits for the whole diff, so it never sees a mix of old
+        and new chunks for the same document.
+        """
+        if self.vector_store is None:
+            raise Exception("Vector store not initialized")
+        self._require_writable()
+
+        async with self.corpus_lock.write():
+            await executor.run(
+                "vector_write", self._apply_update_sync,
+                add_ids, add_texts, add_embeddings, add_metadatas,
+                update_ids, update_metadatas, delete_ids,
+            )
+            self._corpus_changed()
+        logger.info(
+            f"Applied document update: {len(add_ids)} added, "
+            f"{len(update_ids)} kept, {len(delete_ids)} removed"
+        )
+
+    def _apply_update_sync(
+        self, add_ids, add_texts, add_embeddings, add_metadatas,
+        update_ids, update_metadatas, delete_ids,
+    ):
+        collection = self.collection
+        if add_ids:
+            collection.add(
+                ids=add_ids, embeddings=add_embeddings, documents=add_texts, metadatas=add_metadatas
+            )
+        try:
+            if update_ids:
+                collection.update(ids=update_ids, metadatas=update_metadatas)
+            if delete_ids:
+                collection.delete(ids=delete_ids)
+        except Exception:
+            if add_ids:
+                collection.delete(ids=add_ids)
+            raise
+        self._lexical_changed(
+            add=(add_ids, add_texts, add_metadatas),
+            update=(update_ids, update_metadatas),
+            remove=delete_ids,
+        )
+
+    async def update_metadatas(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        if self.vector_store is None:
+            raise Exception("Vector store not initialized")
+        self._require_writable()
+        if not ids:
+            return
+
+        await executor.run("vector_write", self._update_metadatas_sync, ids, metadatas)
+        self._corpus_changed()
+
+    def _update_metadatas_sync(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        self.collection.update(ids=ids, metadatas=metadatas)
+        self._lexical_changed(update=(ids, metadatas))
+
+    async def delete_ids(self, ids: List[str]):
+        if self.vector_store is None:
+            raise Exception("Vector store not initialized")
+        self._require_writable()
+
+        await executor.run("vector_delete", self._delete_ids_sync, ids)
+        self._corpus_changed()
+        logger.info(f"Deleted {len(ids)} chunks by id")
+
+    def _delete_ids_sync(self, ids: List[str]):
+        self.collection.delete(ids=ids)
+        self._lexical_changed(remove=ids)
+
+    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed chunks, encoding only those missing from the embedding cache."""
+        if self.embedding_cache is None:
+            return self.embeddings.embed_documents(texts)
+
+        hashes = [content_hash(text) for text in texts]
+        vectors = self.embedding_cache.get_many(hashes)
+        missing = {digest: text for digest, text in zip(hashes, texts) if digest not in vectors}
+
+        if missing:
+            start = time.perf_counter()
+            encoded = self.embeddings.embed_documents(list(missing.values()))
+            self._encode_seconds_per_chunk = (time.perf_counter() - start) / len(missing)
+            vectors.update(zip(missing.keys(), encoded))
+            self.embedding_cache.put_many(zip(missing.keys(), encoded))
+
+        hits = [text for digest, text in zip(hashes, texts) if digest not in missing]
+        metrics.embedding_cache_lookups_total.labels(result="hit").inc(len(hits))
+        metrics.embedding_cache_lookups_total.labels(result="miss").inc(len(texts) - len(hits))
+        if hits:
+            metrics.embedding_cache_bytes_saved_total.inc(sum(len(text.encode("utf-8")) for text in hits))
+            metrics.embedding_cache_encode_seconds_saved_total.inc(len(hits) * self._encode_seconds_per_chunk)
+            logger.info(f"Embedding cache served {len(hits)}/{len(texts)} chunks")
+
+        return [vectors[digest] for digest in hashes]
+
     async def retrieve(self, query: str, top_k: int = None) -> List[Dict[str, Any]]:
+        if self.read_only:
+            self._check_corpus_version()
+
         if self.vector_store is None:
             raise Exception("Vector store not initialized")
 
@@ -58,17 +445,35 @@ class RAGService:
             top_k = TOP_K_RESULTS
 
         try:
-            results = self.vector_store.similarity_search_with_score(
-                query=query, k=top_k
-            )
+            generation = self.cache.generation if self.cache else 0
+            if self.cache:
+                cached = self.cache.get_exact(query, top_k)
+                if cached is not None:
+                    return cached
+
+            embedding = await self.query_batcher.embed(query)
+
+            # Queries naming codes or numbers can embed almost identically
+            # ("SKU-4821" vs "SKU-4822"), so only the exact tier may answer them
+            if self.cache and not (self.lexical is not None and has_exact_terms(query)):
+                cached = self.cache.get_semantic(embedding, top_k)
+                if cached is not None:
+                    return cached
+
+            # Over-fetch when re-ranking so the cross-encoder can promote deeper hits
+            fetch_k = max(top_k, self.reranker.candidates) if self.reranker else top_k
+            async with self.corpus_lock.read():
+                if self.lexical is not None:
+                    formatted_results = await self._hybrid_search(query, embedding, fetch_k)
+                else:
+                    formatted_results = await executor.run(
+                        "retrieve", self._query_by_vector, embedding, fetch_k
+                    )
+            if self.reranker:
+                formatted_results = await self.reranker.rerank(query, formatted_results, top_k)
 
-            formatted_results = []
-            for doc, score in results:
-                formatted_results.append({
-                    "content": doc.page_content,
-                    "metadata": doc.metadata,
-                    "similarity_score": float(score)
-                })
+            if self.cache:
+                self.cache.put(query, embedding, top_k, formatted_results, generation)
 
             logger.info(f"Retrieved {len(formatted_results)} documents")
             return formatted_results
@@ -77,27 +482,167 @@ class RAGService:
             logger.error(f"Error retrieving documents: {e}")
             return []
 
+    async def _hybrid_search(self, query: str, embedding: List[float], top_k: int) -> List[Dict[str, Any]]:
+        """Dense and BM25 search side by side, fused by weighted reciprocal rank."""
+        candidates = max(top_k, RAG_HYBRID_CANDIDATES)
+        dense = asyncio.ensure_future(
+            executor.run("retrieve", self._query_by_vector, embedding, candidates)
+        )
+        try:
+            start = time.perf_counter()
+            lexical = self.lexical.search(query, candidates)
+            metrics.rag_lexical_search_seconds.observe(time.perf_counter() - start)
+        except Exception:
+            dense.cancel()
+            raise
+
+        fused = reciprocal_rank_fusion(
+            [(await dense, RAG_HYBRID_DENSE_WEIGHT), (lexical, RAG_HYBRID_LEXICAL_WEIGHT)],
+            top_k=top_k,
+            k=RAG_HYBRID_RRF_K,
+        )
+        lexical_only = [result for result in fused if "similarity_score" not in result]
+        if lexical_only:
+            await executor.run("retrieve", self._fill_similarity, embedding, lexical_only)
+        return fused
+
+    def _fill_similarity(self, embedding: List[float], results: List[Dict[str, Any]]):
+        """Give lexical-only hits the same cosine distance the dense results carry."""
+        stored = self.collection.get(
+            ids=[result["id"] for result in results], include=["embeddings"]
+        )
+        vectors = dict(zip(stored["ids"], stored["embeddings"]))
+        query = np.asarray(embedding, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        for result in results:
+            vector = np.asarray(vectors[result["id"]], dtype=np.float32)
+            cosine = float(vector @ query) / (float(np.linalg.norm(vector)) or 1.0)
+            result["similarity_score"] = 1.0 - cosine
+
+    def _query_by_vector(self, embedding: List[float], top_k: int) -> List[Dict[str, Any]]:
+        results = self.collection.query(
+            query_embeddings=[embedding],
+            n_results=top_k,
+            include=["documents", "metadatas", "distances"],
+        )
+        return [
+            {
+                "id": chunk_id,
+                "content": content,
+                "metadata": metadata or {},
+                "similarity_score": float(distance)
+            }
+            for chunk_id, content, metadata, distance in zip(
+                results["ids"][0], results["documents"][0], results["metadatas"][0], results["distances"][0]
+            )
+        ]
+
     async def delete_by_source(self, filename: str):
         if self.vector_store is None:
             raise Exception("Vector store not initialized")
+        self._require_writable()
 
         try:
-            collection = self.vector_store._collection
-            results = collection.get(where={"source": filename})
-            ids = results.get("ids", [])
-            if ids:
-                collection.delete(ids=ids)
-                logger.info(f"Deleted {len(ids)} chunks for source: {filename}")
+            async with self.corpus_lock.write():
+                deleted = await executor.run("vector_delete", self._delete_by_source_sync, filename)
+            if deleted:
+                self._corpus_changed()
+                self.publish_corpus_change()
+                logger.info(f"Deleted {deleted} chunks for source: {filename}")
             else:
                 logger.info(f"No chunks found for source: {filename}")
         except Exception as e:
             logger.error(f"Error deleting chunks for {filename}: {e}")
             raise
 
-    def create_chunks(self, text: str) -> List[str]:
-        chunks = self.text_splitter.split_text(text)
-        logger.info(f"Created {len(chunks)} chunks from text")
-        return chunks
+    def _delete_by_source_sync(self, filename: str) -> int:
+        collection = self.collection
+        results = collection.get(where={"source": filename}, include=[])
+        ids = results.get("ids", [])
+        if ids:
+            collection.delete(ids=ids)
+            self._lexical_changed(remove=ids)
+        return len(ids)
+
+    def shard_stats(self) -> Dict[str, Any]:
+        """Shard layout and sizes; ``unsharded_chunks`` are still waiting for a rebalance."""
+        if self.vector_store is None:
+            raise Exception("Vector store not initialized")
+        if not isinstance(self.collection, ShardedCollection):
+            return {
+                "strategy": "none",
+                "shards": [{"name": self.collection.name, "chunks": self.collection.count()}],
+                "unsharded_chunks": 0,
+            }
+        return {
+            "strategy": self.collection.router.strategy,
+            "shards": self.collection.stats(),
+            "unsharded_chunks": self.vector_store._collection.count(),
+        }
+
+    async def rebalance_shards(self) -> Dict[str, int]:
+        """Move chunks into the shard the current count and strategy assign them.
+
+        Picks up the unsharded collection and shards left over from a higher
+        RAG_SHARD_COUNT, then moves chunks placed by an earlier strategy.
+        Retrieval waits until the move is done.
+        """
+        if self.vector_store is None:
+            raise Exception("Vector store not initialized")
+        self._require_writable()
+        if not isinstance(self.collection, ShardedCollection):
+            raise ValueError("Sharding is disabled (RAG_SHARD_COUNT <= 1)")
+
+        async with self.corpus_lock.write():
+            result = await executor.run("vector_write", self._rebalance_shards_sync)
+            self._corpus_changed()
+        self.publish_corpus_change()
+        logger.info(f"Rebalanced shards: {result}")
+        return result
+
+    def _leftover_shards(self) -> List[Any]:
+        client = self.vector_store._client
+        current = set(shard_names(collection_name(), RAG_SHARD_COUNT))
+        prefix = f"{collection_name()}_shard"
+        leftovers = []
+        for collection in client.list_collections():
+            # Newer Chroma versions list names, older ones collection objects
+            name = getattr(collection, "name", collection)
+            if name.startswith(prefix) and name[len(prefix):].isdigit() and name not in current:
+                leftovers.append(name)
+        return leftovers
+
+    def _rebalance_shards_sync(self) -> Dict[str, int]:
+        client = self.vector_store._client
+        absorbed = self.collection.absorb(self.vector_store._collection, SHARD_REBALANCE_BATCH)
+        leftovers = self._leftover_shards()
+        for name in leftovers:
+            absorbed += self.collection.absorb(client.get_collection(name), SHARD_REBALANCE_BATCH)
+            client.delete_collection(name)
+        moved = self.collection.rebalance(SHARD_REBALANCE_BATCH)
+        return {"absorbed": absorbed, "moved": moved, "shards_removed": len(leftovers)}
+
+    def _corpus_changed(self):
+        if self.cache:
+            self.cache.invalidate()
+        self._corpus_dirty = True
+
+    def publish_corpus_change(self):
+        """Signal read-only services in other processes, once a whole document or job is written."""
+        if self._corpus_dirty:
+            self._corpus_dirty = False
+            bump_corpus_version()
+
+    def streaming_splitter(self, separator: str = "\n") -> Union[TokenChunker, StreamingSplitter]:
+        """A fresh chunker for one document, using the engine selected by CHUNKER."""
+        if self.token_counter:
+            return TokenChunker(
+                self.token_counter,
+                max_tokens=self.chunk_tokens,
+                overlap_tokens=CHUNK_OVERLAP_TOKENS,
+                separator=separator,
+            )
+        return StreamingSplitter(self.text_splitter, chunk_size=CHUNK_SIZE, separator=separator)
 
     async def get_context_for_query(self, query: str, top_k: int = DEFAULT_TOP_K_RESULTS) -> str:
         results = await self.retrieve(query, top_k)
@@ -0,0 +1,249 @@
+"""
+Sharded vector collections.
+
+ShardedCollection spreads the corpus over several Chroma collections and
+presents them through the subset of the Chroma collection API the RAG
+service uses, so the service, the BM25 index build and the health check
+work the same on one collection or many. Each HNSW index stays small:
+queries fan out to every shard in parallel (hnswlib releases the GIL) and
+the per-shard hits are merged into a global top-k by distance, and
+deleting or rebuilding a document touches one shard.
+
+Chunks are placed by a ShardRouter:
+
+- ``document`` hashes the chunk's source file, keeping a document in one shard
+- ``tenant`` hashes the chunk's ``tenant`` metadata (chunks without one share a shard)
+- ``hash`` hashes the chunk id, for the most even spread
+"""
+import time
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+from observability.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("document", "tenant", "hash")
+DEFAULT_TENANT = "default"
+
+
+def shard_names(base: str, count: int) -> List[str]:
+    return [f"{base}_shard{i}" for i in range(count)]
+
+
+class ShardRouter:
+    """Maps a chunk to the index of the shard that owns it."""
+
+    def __init__(self, strategy: str, count: int):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown shard strategy: {strategy} (expected one of {', '.join(STRATEGIES)})")
+        self.strategy = strategy
+        self.count = count
+
+    def key(self, chunk_id: str, metadata: Optional[Dict[str, Any]]) -> str:
+        metadata = metadata or {}
+        if self.strategy == "document":
+            return str(metadata.get("source", chunk_id))
+        if self.strategy == "tenant":
+            return str(metadata.get("tenant", DEFAULT_TENANT))
+        return chunk_id
+
+    def shard_for(self, chunk_id: str, metadata: Optional[Dict[str, Any]]) -> int:
+        # A stable hash, unlike hash(), so placement survives restarts
+        digest = hashlib.blake2b(self.key(chunk_id, metadata).encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % self.count
+
+    @property
+    def routes_by_id(self) -> bool:
+        return self.strategy == "hash"
+
+    @property
+    def metadata_key(self) -> Optional[str]:
+        """The metadata field that decides placement, if any."""
+        return {"document": "source", "tenant": "tenant"}.get(self.strategy)
+
+
+def _columns(include: Sequence[str]) -> List[str]:
+    return ["ids", *include]
+
+
+class ShardedCollection:
+    """A group of Chroma collections that behaves like one collection."""
+
+    def __init__(self, shards: List[Any], router: ShardRouter):
+        self.shards = shards
+        self.router = router
+        self._pool = ThreadPoolExecutor(max_workers=len(shards), thread_name_prefix="shard")
+        # Shard sizes for query planning, refreshed after writes through this object
+        self._sizes: Optional[List[int]] = None
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+    def _fan_out(self, fn, shards: Optional[List[int]] = None) -> List[Any]:
+        """Call ``fn(shard)`` on the given shards (default all) concurrently, in shard order."""
+        targets = [self.shards[i] for i in shards] if shards is not None else self.shards
+        if len(targets) == 1:
+            return [fn(targets[0])]
+        return [future.result() for future in [self._pool.submit(fn, shard) for shard in targets]]
+
+    def _group(self, ids: List[str], metadatas: Optional[List[Dict[str, Any]]]) -> Dict[int, List[int]]:
+        """Positions of each chunk, grouped by owning shard."""
+        groups: Dict[int, List[int]] = {}
+        for position, chunk_id in enumerate(ids):
+            metadata = metadatas[position] if metadatas else None
+            groups.setdefault(self.router.shard_for(chunk_id, metadata), []).append(position)
+        return groups
+
+    def _targets(self, ids, where) -> Optional[List[int]]:
+        """Shards that can hold the chunks a read or delete selects; None means all of them."""
+        if ids is not None and self.router.routes_by_id:
+            return sorted(self._group(ids, None))
+        key = self.router.metadata_key
+        if where and list(where) == [key] and not isinstance(where[key], dict):
+            return [self.router.shard_for("", where)]
+        return None
+
+    def count(self) -> int:
+        return sum(self.counts())
+
+    def counts(self) -> List[int]:
+        self._sizes = self._fan_out(lambda shard: shard.count())
+        return self._sizes
+
+    def add(self, ids, embeddings, documents, metadatas):
+        self._sizes = None
+        for shard, positions in self._group(ids, metadatas).items():
+            self.shards[shard].add(
+                ids=[ids[p] for p in positions],
+                embeddings=[embeddings[p] for p in positions],
+                documents=[documents[p] for p in positions],
+                metadatas=[metadatas[p] for p in positions],
+            )
+
+    def update(self, ids, metadatas):
+        # Metadata updates keep the routing key, so they stay on the owning shard
+        for shard, positions in self._group(ids, metadatas).items():
+            self.shards[shard].update(
+                ids=[ids[p] for p in positions],
+                metadatas=[metadatas[p] for p in positions],
+            )
+
+    def delete(self, ids=None, where=None):
+        self._sizes = None
+        # Chroma ignores ids a shard does not hold
+        self._fan_out(lambda shard: shard.delete(ids=ids, where=where), self._targets(ids, where))
+
+    def get(self, ids=None, where=None, include=("metadatas", "documents"), limit=None, offset=None) -> Dict[str, List]:
+        include = list(include)
+        if limit is not None or offset is not None:
+            if where is not None or ids is not None:
+                raise ValueError("Paged reads cover the whole sharded collection; filter the pages instead")
+            return self._get_page(include, limit, offset or 0)
+
+        parts = self._fan_out(
+            lambda shard: shard.get(ids=ids, where=where, include=include), self._targets(ids, where)
+        )
+        merged: Dict[str, List] = {column: [] for column in _columns(include)}
+        for part in parts:
+            for column in merged:
+                merged[column].extend(part.get(column) if part.get(column) is not None else [])
+        return merged
+
+    def _get_page(self, include: List[str], limit: Optional[int], offset: int) -> Dict[str, List]:
+        """A page of the shards read one after another, as if they were one collection."""
+        merged: Dict[str, List] = {column: [] for column in _columns(include)}
+        for shard, size in zip(self.shards, self.counts()):
+            if offset >= size:
+                offset -= size
+                continue
+            wanted = None if limit is None else limit - len(merged["ids"])
+            part = shard.get(include=include, limit=wanted, offset=offset)
+            for column in merged:
+                merged[column].extend(part.get(column) if part.get(column) is not None else [])
+            offset = 0
+            if limit is not None and len(merged["ids"]) >= limit:
+                break
+        return merged
+
+    def query(self, query_embeddings, n_results: int, include=("documents", "metadatas", "distances")) -> Dict[str, List]:
+        """Fan one query out to every shard and keep the global ``n_results`` nearest."""
+        include = list(include)
+        if "distances" not in include:
+            include.append("distances")
+
+        sizes = self._sizes if self._sizes is not None else self.counts()
+        # Empty shards are skipped; Chroma rejects a query for more hits than a shard holds
+        searched = [i for i, size in enumerate(sizes) if size]
+
+        def search(shard):
+            start = time.perf_counter()
+            result = shard.query(
+                query_embeddings=query_embeddings,
+                n_results=min(n_results, sizes[self.shards.index(shard)]),
+                include=include,
+            )
+            metrics.rag_shard_query_seconds.labels(shard=shard.name).observe(time.perf_counter() - start)
+            return result
+
+        hits = []
+        for result in self._fan_out(search, searched) if searched else []:
+            columns = _columns(include)
+            hits.extend(zip(*(result[column][0] for column in columns)))
+        distance = _columns(include).index("distances")
+        hits.sort(key=lambda hit: hit[distance])
+        top = hits[:n_results]
+        return {column: [[hit[i] for hit in top]] for i, column in enumerate(_columns(include))}
+
+    def stats(self) -> List[Dict[str, Any]]:
+        counts = self.counts()
+        for shard, size in zip(self.shards, counts):
+            metrics.rag_shard_chunks.labels(shard=shard.name).set(size)
+        return [{"name": shard.name, "chunks": size} for shard, size in zip(self.shards, counts)]
+
+    def absorb(self, source: Any, batch_size: int) -> int:
+        """Move every chunk of another collection (the unsharded one, a dropped shard) into the shards."""
+        moved = 0
+        while True:
+            page = source.get(include=["embeddings", "documents", "metadatas"], limit=batch_size)
+            if not len(page["ids"]):
+                return moved
+            self.add(
+                ids=list(page["ids"]),
+                embeddings=list(page["embeddings"]),
+                documents=list(page["documents"]),
+                metadatas=list(page["metadatas"]),
+            )
+            source.delete(ids=list(page["ids"]))
+            moved += len(page["ids"])
+
+    def rebalance(self, batch_size: int) -> int:
+        """Move chunks that live on the wrong shard for the current router; returns how many moved."""
+        self._sizes = None
+        moved = 0
+        for index, shard in enumerate(self.shards):
+            offset = 0
+            while True:
+                page = shard.get(
+                    include=["embeddings", "documents", "metadatas"], limit=batch_size, offset=offset
+                )
+                if not len(page["ids"]):
+                    break
+                stray = [
+                    p for p, (chunk_id, metadata) in enumerate(zip(page["ids"], page["metadatas"]))
+                    if self.router.shard_for(chunk_id, metadata) != index
+                ]
+                if stray:
+                    self.add(
+                        ids=[page["ids"][p] for p in stray],
+                        embeddings=[page["embeddings"][p] for p in stray],
+                        documents=[page["documents"][p] for p in stray],
+                        metadatas=[page["metadatas"][p] for p in stray],
+                    )
+                    shard.delete(ids=[page["ids"][p] for p in stray])
+                    moved += len(stray)
+                # Moved chunks left this shard, so the next page starts earlier
+                offset += len(page["ids"]) - len(stray)
+        return moved
@@ -2,12 +2,19 @@
 Environment-dependent settings — reads from env vars with sensible defaults.
 """
 import os
+import tempfile
 from dotenv import load_dotenv
 from constants import (
+    DEFAULT_MAX_FILE_SIZE,
+    DEFAULT_MAX_BULK_SIZE,
     DEFAULT_CHUNK_SIZE,
     DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_TOKENS,
+    DEFAULT_CHUNK_OVERLAP_TOKENS,
     DEFAULT_TOP_K_RESULTS,
     DEFAULT_DB_PATH,
+    DEFAULT_EMBEDDING_CACHE_FILENAME,
+    DEFAULT_RERANK_MODEL_NAME,
 )
 
 load_dotenv()
@@ -23,20 +30,143 @@ BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 BACKEND_PORT = int(os.getenv("BACKEND_PORT", 8000))
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:3001")
 
+# ── Voice agent retrieval ────────────────────────────────────
+# "http" calls the backend /query endpoint; "inprocess" loads a read-only
+# RAGService in the agent worker against CHROMA_PERSIST_DIR
+RAG_MODE = os.getenv("RAG_MODE", "http")
+RAG_RELOAD_CHECK_SECONDS = float(os.getenv("RAG_RELOAD_CHECK_SECONDS", 1.0))
+
+# ── Speculative RAG prefetch on interim transcripts ──────────
+RAG_PREFETCH_ENABLED = os.getenv("RAG_PREFETCH_ENABLED", "true").lower() == "true"
+RAG_PREFETCH_MIN_WORDS = int(os.getenv("RAG_PREFETCH_MIN_WORDS", 3))
+RAG_PREFETCH_DEBOUNCE_MS = float(os.getenv("RAG_PREFETCH_DEBOUNCE_MS", 150))
+RAG_PREFETCH_MATCH_THRESHOLD = float(os.getenv("RAG_PREFETCH_MATCH_THRESHOLD", 0.8))
+
+# ── Voice chat context budget ────────────────────────────────
+# Prompt tokens per LLM request; the latest turns are kept verbatim and
+# older ones collapse into clipped one-line summaries
+VOICE_CONTEXT_MAX_TOKENS = int(os.getenv("VOICE_CONTEXT_MAX_TOKENS", 3000))
+VOICE_CONTEXT_RECENT_TURNS = int(os.getenv("VOICE_CONTEXT_RECENT_TURNS", 4))
+VOICE_CONTEXT_SUMMARY_CHARS = int(os.getenv("VOICE_CONTEXT_SUMMARY_CHARS", 160))  # per collapsed message
+
+# ── Prompt updates ───────────────────────────────────────────
+# Long-poll duration the agent asks for, and the most the backend allows
+PROMPT_WATCH_TIMEOUT = float(os.getenv("PROMPT_WATCH_TIMEOUT", 25.0))
+PROMPT_WATCH_MAX_TIMEOUT = float(os.getenv("PROMPT_WATCH_MAX_TIMEOUT", 60.0))
+
+# ── Voice agent → backend HTTP client ────────────────────────
+BACKEND_HTTP2 = os.getenv("BACKEND_HTTP2", "false").lower() == "true"
+BACKEND_MAX_CONNECTIONS = int(os.getenv("BACKEND_MAX_CONNECTIONS", 20))
+BACKEND_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("BACKEND_MAX_KEEPALIVE_CONNECTIONS", 10))
+BACKEND_KEEPALIVE_EXPIRY = float(os.getenv("BACKEND_KEEPALIVE_EXPIRY", 30.0))
+BACKEND_RETRY_ATTEMPTS = max(1, int(os.getenv("BACKEND_RETRY_ATTEMPTS", 3)))  # total attempts per request; 1 = no retries
+BACKEND_RETRY_BACKOFF = float(os.getenv("BACKEND_RETRY_BACKOFF", 0.1))  # seconds, doubled per attempt
+
+# ── Voice agent worker load and admission ────────────────────
+# Load is the higher of sessions/AGENT_MAX_SESSIONS and host CPU; at
+# AGENT_LOAD_THRESHOLD the worker reports itself full and refuses new jobs
+AGENT_MAX_SESSIONS = int(os.getenv("AGENT_MAX_SESSIONS", 8))
+AGENT_LOAD_THRESHOLD = float(os.getenv("AGENT_LOAD_THRESHOLD", 0.8))
+AGENT_METRICS_PORT = int(os.getenv("AGENT_METRICS_PORT", 0))  # 0 = don't serve worker metrics
+# Shared by the worker and its job processes so the worker can serve session metrics too
+AGENT_METRICS_DIR = os.getenv("AGENT_METRICS_DIR", os.path.join(tempfile.gettempdir(), "voice_agent_metrics"))
+# Seconds a job process may spend in prewarm (model loads, in-process BM25 build) before it is replaced
+AGENT_PREWARM_TIMEOUT = float(os.getenv("AGENT_PREWARM_TIMEOUT", 120))
+
 # ── ChromaDB ─────────────────────────────────────────────────
 CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "./chroma_db")
 
+# ── Execution pools ──────────────────────────────────────────
+EXECUTOR_QUERY_THREADS = int(os.getenv("EXECUTOR_QUERY_THREADS", 4))
+EXECUTOR_INGEST_THREADS = int(os.getenv("EXECUTOR_INGEST_THREADS", 2))
+EXECUTOR_PROCESS_WORKERS = int(os.getenv("EXECUTOR_PROCESS_WORKERS", 2))
+EXECUTOR_MAX_PENDING = int(os.getenv("EXECUTOR_MAX_PENDING", 64))
+# Per-operation overrides, e.g. "pdf_extract=ingest,embed=query"
+EXECUTOR_OPERATION_POOLS = os.getenv("EXECUTOR_OPERATION_POOLS", "")
+
+# ── Document ingestion ───────────────────────────────────────
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", DEFAULT_MAX_FILE_SIZE))
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", 64))  # chunks per embed + insert
+PDF_EXTRACT_PARALLELISM = int(os.getenv("PDF_EXTRACT_PARALLELISM", EXECUTOR_PROCESS_WORKERS))  # page ranges in flight
+PDF_SLOW_PAGE_SECONDS = float(os.getenv("PDF_SLOW_PAGE_SECONDS", 1.0))
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")  # uploads awaiting background ingestion
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", 2))
+
+# ── Bulk ingestion ───────────────────────────────────────────
+BULK_MAX_FILES = int(os.getenv("BULK_MAX_FILES", 500))  # documents per request, after zip expansion
+BULK_MAX_TOTAL_SIZE = int(os.getenv("BULK_MAX_TOTAL_SIZE", DEFAULT_MAX_BULK_SIZE))  # bytes per request
+BULK_EXTRACT_PARALLELISM = int(os.getenv("BULK_EXTRACT_PARALLELISM", 4))  # documents extracted at once
+BULK_EMBED_BATCH_SIZE = int(os.getenv("BULK_EMBED_BATCH_SIZE", 256))  # chunks per embed + insert, across files
+
 # ── RAG tuning ───────────────────────────────────────────────
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", DEFAULT_CHUNK_SIZE))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", DEFAULT_CHUNK_OVERLAP))
+CHUNKER = os.getenv("CHUNKER", "token")  # token (sentence-aware, model tokens) | character (CHUNK_SIZE chars)
+CHUNK_TOKENS = int(os.getenv("CHUNK_TOKENS", DEFAULT_CHUNK_TOKENS))  # capped at the embedding model's limit
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", DEFAULT_CHUNK_OVERLAP_TOKENS))
 TOP_K_RESULTS = int(os.getenv("TOP_K_RESULTS", DEFAULT_TOP_K_RESULTS))
 
+# ── Hybrid retrieval (BM25 + vector, reciprocal-rank fusion) ─
+RAG_HYBRID_ENABLED = os.getenv("RAG_HYBRID_ENABLED", "true").lower() == "true"
+RAG_HYBRID_DENSE_WEIGHT = float(os.getenv("RAG_HYBRID_DENSE_WEIGHT", 1.0))
+RAG_HYBRID_LEXICAL_WEIGHT = float(os.getenv("RAG_HYBRID_LEXICAL_WEIGHT", 1.0))
+RAG_HYBRID_CANDIDATES = int(os.getenv("RAG_HYBRID_CANDIDATES", 20))  # per retriever, before fusion
+RAG_HYBRID_RRF_K = int(os.getenv("RAG_HYBRID_RRF_K", 60))
+
+# ── Vector store sharding ────────────────────────────────────
+# RAG_SHARD_COUNT > 1 spreads chunks over that many Chroma collections,
+# placed by document | tenant | hash; run POST /shards/rebalance after changing either
+RAG_SHARD_COUNT = int(os.getenv("RAG_SHARD_COUNT", 1))
+RAG_SHARD_STRATEGY = os.getenv("RAG_SHARD_STRATEGY", "document")
+
+# ── Embedding model backend ──────────────────────────────────
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # torch | onnx | onnx-int8
+EMBEDDING_MODEL_TIER = os.getenv("EMBEDDING_MODEL_TIER", "base")  # base | small
+EMBEDDING_QUANTIZATION_TARGET = os.getenv("EMBEDDING_QUANTIZATION_TARGET", "avx2")
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", 0))  # 0 = library default
+
+# ── Cross-encoder re-ranking ─────────────────────────────────
+RAG_RERANK_ENABLED = os.getenv("RAG_RERANK_ENABLED", "false").lower() == "true"
+RAG_RERANK_MODEL = os.getenv("RAG_RERANK_MODEL", DEFAULT_RERANK_MODEL_NAME)
+RAG_RERANK_CANDIDATES = int(os.getenv("RAG_RERANK_CANDIDATES", 20))  # over-fetched before re-ranking
+RAG_RERANK_BUDGET_MS = float(os.getenv("RAG_RERANK_BUDGET_MS", 150))
+RAG_RERANK_BATCH_SIZE = int(os.getenv("RAG_RERANK_BATCH_SIZE", 32))
+RAG_RERANK_MAX_LENGTH = int(os.getenv("RAG_RERANK_MAX_LENGTH", 256))
+RAG_RERANK_THREADS = int(os.getenv("RAG_RERANK_THREADS", 2))  # dedicated pool; busy pool = rerank skipped
+
+# ── Query embedding micro-batching ───────────────────────────
+QUERY_BATCH_WINDOW_MS = float(os.getenv("QUERY_BATCH_WINDOW_MS", 5))
+QUERY_BATCH_MAX_SIZE = int(os.getenv("QUERY_BATCH_MAX_SIZE", 32))
+
+# ── Query-result cache ───────────────────────────────────────
+RAG_CACHE_ENABLED = os.getenv("RAG_CACHE_ENABLED", "true").lower() == "true"
+RAG_CACHE_MAX_ENTRIES = int(os.getenv("RAG_CACHE_MAX_ENTRIES", 1024))
+RAG_CACHE_SEMANTIC_MAX_ENTRIES = int(os.getenv("RAG_CACHE_SEMANTIC_MAX_ENTRIES", 256))
+RAG_CACHE_TTL_SECONDS = float(os.getenv("RAG_CACHE_TTL_SECONDS", 300))
+RAG_CACHE_SIMILARITY_THRESHOLD = float(os.getenv("RAG_CACHE_SIMILARITY_THRESHOLD", 0.95))
+
 # ── Database ─────────────────────────────────────────────────
 DB_PATH = os.getenv("DB_PATH", DEFAULT_DB_PATH)
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", 4))  # reader connections; writes use one more
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", 8192))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+SQLITE_CACHED_STATEMENTS = int(os.getenv("SQLITE_CACHED_STATEMENTS", 256))
+
+# ── Embedding cache ──────────────────────────────────────────
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH",
+    os.path.join(os.path.dirname(DB_PATH), DEFAULT_EMBEDDING_CACHE_FILENAME),
+)
+EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")  # float32 | float16
 
 # ── Observability ────────────────────────────────────────────
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+VOICE_TRACE_BUFFER_SIZE = int(os.getenv("VOICE_TRACE_BUFFER_SIZE", 500))
+VOICE_TRACE_REPORT_ENABLED = os.getenv("VOICE_TRACE_REPORT_ENABLED", "true").lower() == "true"
 
 # ── HTTP timeouts (seconds) ──────────────────────────────────
 HTTP_TIMEOUT_PROMPT = float(os.getenv("HTTP_TIMEOUT_PROMPT", 5.0))
 HTTP_TIMEOUT_RAG = float(os.getenv("HTTP_TIMEOUT_RAG", 10.0))
+HTTP_TIMEOUT_TRACE = float(os.getenv("HTTP_TIMEOUT_TRACE", 2.0))
+HTTP_TIMEOUT_OPENAI_CONNECT = float(os.getenv("HTTP_TIMEOUT_OPENAI_CONNECT", 15.0))
@@ -3,4 +3,16 @@ Voice pipeline components — STT, LLM, TTS for the LiveKit agent.
 """
 from voice.stt import create_stt
 from voice.tts import create_tts
-from voice.llm import create_llm, fetch_system_prompt, before_llm_cb, fetch_rag_context
+from voice.llm import (
+    create_llm,
+    fetch_system_prompt,
+    before_llm_cb,
+    fetch_rag_context,
+    get_local_rag_service,
+)
+from voice.backend_client import close_client as close_backend_client
+from voice.prefetch import SpeculativePrefetcher, attach_prefetcher
+from voice.tracing import TurnTracer
+from voice.prompt_watch import PromptWatcher
+from voice.prewarm import prewarm, get_components, warm_connections, StartupTimer
+from voice.load import WorkerLoad
@@ -0,0 +1,110 @@
+"""
+Backend HTTP Client
+
+One pooled, keep-alive client per agent worker process for calls to the
+backend API, with retry and jittered exponential backoff.
+"""
+import time
+import random
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+
+from settings import (
+    BACKEND_URL,
+    BACKEND_HTTP2,
+    BACKEND_MAX_CONNECTIONS,
+    BACKEND_MAX_KEEPALIVE_CONNECTIONS,
+    BACKEND_KEEPALIVE_EXPIRY,
+    BACKEND_RETRY_ATTEMPTS,
+    BACKEND_RETRY_BACKOFF,
+)
+from observability.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        http2 = BACKEND_HTTP2 and _http2_available()
+        if BACKEND_HTTP2 and not http2:
+            logger.warning("BACKEND_HTTP2 is set but the h2 package is not installed, using HTTP/1.1")
+        _client = httpx.AsyncClient(
+            base_url=BACKEND_URL,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=BACKEND_MAX_CONNECTIONS,
+                max_keepalive_connections=BACKEND_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=BACKEND_KEEPALIVE_EXPIRY,
+            ),
+        )
+        logger.info(f"Opened backend HTTP client (http2={http2})")
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("Closed backend HTTP client")
+    _client = None
+
+
+async def request(method: str, path: str, *, endpoint: str, timeout: float, **kwargs) -> httpx.Response:
+    """Send a request to the backend, retrying connection failures and 502/503/504.
+
+    Makes at most BACKEND_RETRY_ATTEMPTS attempts in total (at least one).
+
+    ``endpoint`` is a low-cardinality label for metrics. Timeouts are not
+    retried: they already used up the caller's latency budget.
+    """
+    for attempt in range(1, BACKEND_RETRY_ATTEMPTS + 1):
+        opened_connection = False
+
+        async def trace(event_name: str, info: dict):
+            nonlocal opened_connection
+            if event_name == "connection.connect_tcp.complete":
+                opened_connection = True
+
+        start = time.perf_counter()
+        try:
+            resp = await get_client().request(
+                method, path, timeout=timeout, extensions={"trace": trace}, **kwargs
+            )
+        except (httpx.ConnectError, httpx.RemoteProtocolError) as e:
+            metrics.voice_backend_requests_total.labels(endpoint=endpoint, status="error").inc()
+            if attempt == BACKEND_RETRY_ATTEMPTS:
+                raise
+            logger.warning(f"Backend {endpoint} request failed (attempt {attempt}): {e}")
+            await _backoff(attempt)
+            continue
+
+        metrics.voice_backend_request_seconds.labels(endpoint=endpoint).observe(time.perf_counter() - start)
+        metrics.voice_backend_requests_total.labels(endpoint=endpoint, status=str(resp.status_code)).inc()
+        metrics.voice_backend_connections_total.labels(reused=str(not opened_connection).lower()).inc()
+
+        if resp.status_code in RETRYABLE_STATUS_CODES and attempt < BACKEND_RETRY_ATTEMPTS:
+            logger.warning(f"Backend {endpoint} returned {resp.status_code} (attempt {attempt})")
+            await _backoff(attempt)
+            continue
+        return resp
+
+
+async def _backoff(attempt: int):
+    # Full jitter: sleep uniformly in [0, base * 2^(attempt - 1)]
+    await asyncio.sleep(random.uniform(0, BACKEND_RETRY_BACKOFF * 2 ** (attempt - 1)))
@@ -1,69 +1,324 @@
 """
 LLM (Large Language Model) Service Component
 
-Handles system prompt fetching and RAG context injection.
+Handles system prompt fetching, RAG context injection, and keeping the
+chat context within a prompt token budget over long calls.
 """
+import re
+import time
 import logging
-import httpx
+from typing import Any, Dict, List, Optional
 
+from openai import AsyncClient
 from livekit.agents import llm
 from livekit.agents.pipeline import VoicePipelineAgent
 from livekit.plugins import openai
 
-from constants import DEFAULT_SYSTEM_PROMPT
-from settings import LLM_MODEL, BACKEND_URL, HTTP_TIMEOUT_PROMPT, HTTP_TIMEOUT_RAG
+from constants import (
+    DEFAULT_SYSTEM_PROMPT,
+    RAG_CONTEXT_HEADER,
+    CONTEXT_SUMMARY_HEADER,
+    CHARS_PER_TOKEN_ESTIMATE,
+    MESSAGE_OVERHEAD_TOKENS,
+)
+from settings import (
+    LLM_MODEL,
+    HTTP_TIMEOUT_PROMPT,
+    HTTP_TIMEOUT_RAG,
+    RAG_MODE,
+    TOP_K_RESULTS,
+    VOICE_CONTEXT_MAX_TOKENS,
+    VOICE_CONTEXT_RECENT_TURNS,
+    VOICE_CONTEXT_SUMMARY_CHARS,
+)
 from observability.metrics import metrics
+from voice import backend_client, prompt_watch
+from voice.prefetch import get_prefetcher
+from voice.tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
+_local_rag_service = None
 
-def create_llm() -> openai.LLM:
+# Sentence or line boundaries, captured so deduplicated text keeps its layout
+_SENTENCE_BOUNDARY = re.compile(r"((?<=[.!?])\s+|\n+)")
+_MIN_DEDUPE_CHARS = 20  # shorter sentences ("Yes.", "See below.") may legitimately repeat
+
+
+def create_llm(client: Optional[AsyncClient] = None) -> openai.LLM:
     logger.info(f"Initializing LLM service with model: {LLM_MODEL}")
-    return openai.LLM(model=LLM_MODEL)
+    return openai.LLM(model=LLM_MODEL, client=client)
 
 
 async def fetch_system_prompt() -> str:
-    """Fetch the system prompt from the backend API."""
+    """Fetch the system prompt from the backend API.
+
+    Sends the ETag of the prompt this worker last saw, so an unchanged
+    prompt comes back as an empty 304.
+    """
+    cached, etag = prompt_watch.cached_prompt()
     try:
-        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT_PROMPT) as client:
-            resp = await client.get(f"{BACKEND_URL}/prompt")
-            if resp.status_code == 200:
-                return resp.json().get("system_prompt", DEFAULT_SYSTEM_PROMPT)
+        resp = await backend_client.request(
+            "GET", "/prompt", endpoint="prompt", timeout=HTTP_TIMEOUT_PROMPT,
+            headers={"If-None-Match": etag} if etag else None,
+        )
+        if resp.status_code == 304 and cached is not None:
+            return cached
+        if resp.status_code == 200:
+            prompt = resp.json().get("system_prompt", DEFAULT_SYSTEM_PROMPT)
+            prompt_watch.remember(prompt, resp.headers.get("etag"))
+            return prompt
     except Exception as e:
         logger.warning(f"Could not fetch prompt from backend, using default: {e}")
-    return DEFAULT_SYSTEM_PROMPT
+    return cached if cached is not None else DEFAULT_SYSTEM_PROMPT
+
+
+def get_local_rag_service():
+    """Read-only RAG service used when RAG_MODE=inprocess, loaded once per worker process."""
+    global _local_rag_service
+    if _local_rag_service is None:
+        # Imported lazily: the HTTP mode never needs the embedding model
+        from rag.service import RAGService
+        _local_rag_service = RAGService(read_only=True)
+        _local_rag_service.warmup()
+    return _local_rag_service
 
 
 async def fetch_rag_context(user_msg: str) -> str:
-    """Call backend /query endpoint to retrieve RAG context."""
-    try:
-        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT_RAG) as client:
-            resp = await client.post(
-                f"{BACKEND_URL}/query",
-                json={"query": user_msg},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            results = data.get("results", [])
-            if not results:
-                return ""
-            parts = []
-            for i, r in enumerate(results, 1):
-                source = r.get("metadata", {}).get("source", "Unknown")
-                content = r.get("content", "")
-                parts.append(f"[Document {i}: {source}]\n{content}")
-            return "\n\n".join(parts)
-    except Exception as e:
-        metrics.voice_rag_injections_total.labels(status="error").inc()
-        logger.error(f"RAG retrieval failed: {e}")
+    """Retrieve RAG context, in-process or through the backend /query endpoint.
+
+    Raises on failure; before_llm_cb and the prefetcher each record the
+    outcome under their own metric.
+    """
+    if RAG_MODE == "inprocess":
+        results = await get_local_rag_service().retrieve(user_msg, top_k=TOP_K_RESULTS)
+    else:
+        resp = await backend_client.request(
+            "POST", "/query", endpoint="query", timeout=HTTP_TIMEOUT_RAG,
+            json={"query": user_msg},
+        )
+        resp.raise_for_status()
+        results = resp.json().get("results", [])
+    if not results:
         return ""
+    parts = []
+    for r, content in zip(results, dedupe_sentences([r.get("content", "") for r in results])):
+        if not content:
+            continue
+        source = r.get("metadata", {}).get("source", "Unknown")
+        parts.append(f"[Document {len(parts) + 1}: {source}]\n{content}")
+    return "\n\n".join(parts)
+
+
+def dedupe_sentences(contents: List[str]) -> List[str]:
+    """Drop sentences an earlier chunk already contains.
+
+    Overlapping neighbour chunks and near-duplicate documents otherwise
+    send the same sentences to the LLM several times. A chunk with nothing
+    new left comes back empty.
+    """
+    seen = set()
+    deduped = []
+    for content in contents:
+        pieces = _SENTENCE_BOUNDARY.split(content)
+        kept = []
+        for i in range(0, len(pieces), 2):
+            sentence = pieces[i]
+            key = " ".join(sentence.lower().split())
+            if len(key) >= _MIN_DEDUPE_CHARS:
+                if key in seen:
+                    metrics.voice_rag_duplicate_sentences_total.inc()
+                    continue
+                seen.add(key)
+            if key:
+                separator = pieces[i - 1] if i and kept else ""
+                kept.append(separator + sentence)
+        deduped.append("".join(kept).strip())
+    return deduped
+
+
+def message_text(msg: llm.ChatMessage) -> str:
+    if isinstance(msg.content, str):
+        return msg.content
+    if isinstance(msg.content, list):
+        return " ".join(part for part in msg.content if isinstance(part, str))
+    return ""
+
+
+class PromptTokenCounter:
+    """Counts prompt tokens with tiktoken when it is installed, otherwise estimates from length."""
+
+    def __init__(self, model: str):
+        self._model = model
+        self._encoding = None
+        self._loaded = False
+
+    def _load(self):
+        self._loaded = True
+        try:
+            import tiktoken
+            try:
+                self._encoding = tiktoken.encoding_for_model(self._model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("o200k_base")
+        except ImportError:
+            logger.info("tiktoken not installed; estimating prompt tokens from text length")
+        except Exception as e:
+            logger.warning(f"Could not load tiktoken encoding for {self._model}, estimating: {e}")
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if not self._loaded:
+            self._load()
+        if self._encoding:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return -(-len(text) // CHARS_PER_TOKEN_ESTIMATE)
+
+    def message(self, msg: llm.ChatMessage) -> int:
+        return self.count(message_text(msg)) + MESSAGE_OVERHEAD_TOKENS
+
+
+class ChatContextManager:
+    """Keeps each LLM request's chat context within ``max_tokens``.
+
+    Every turn the context is rebuilt as: system prompt, a summary of the
+    older conversation, the latest ``recent_turns`` turns verbatim, this
+    turn's retrieved documents, and the user's message. RAG blocks from
+    earlier turns are dropped. Older turns collapse into one clipped line
+    per message, and summary lines are dropped oldest first when the
+    budget runs out. Turns are only kept or collapsed whole, so tool calls
+    stay next to their results.
+
+    The summary lives in the context itself, so this works whether the
+    pipeline hands over its own chat context or a copy.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = VOICE_CONTEXT_MAX_TOKENS,
+        recent_turns: int = VOICE_CONTEXT_RECENT_TURNS,
+        summary_chars: int = VOICE_CONTEXT_SUMMARY_CHARS,
+        counter: Optional[PromptTokenCounter] = None,
+    ):
+        self.max_tokens = max_tokens
+        self.recent_turns = recent_turns
+        self.summary_chars = summary_chars
+        self.counter = counter or PromptTokenCounter(LLM_MODEL)
+
+    def prepare(self, chat_ctx: llm.ChatContext, context: str) -> Dict[str, int]:
+        """Rewrite ``chat_ctx`` in place for this turn; returns prompt tokens by part."""
+        messages = chat_ctx.messages
+        head = messages[0] if messages and messages[0].role == "system" else None
+        current = messages[-1] if len(messages) > 1 and messages[-1].role == "user" else None
+        body = messages[1 if head else 0:-1 if current else None]
+
+        summary: List[str] = []
+        history = []
+        for msg in body:
+            text = message_text(msg)
+            if msg.role == "system" and text.startswith(CONTEXT_SUMMARY_HEADER):
+                summary.extend(text[len(CONTEXT_SUMMARY_HEADER):].strip().splitlines())
+            elif msg.role == "system" and text.startswith(RAG_CONTEXT_HEADER):
+                metrics.voice_context_collapsed_messages_total.labels(action="stale_rag").inc()
+            else:
+                history.append(msg)
+
+        rag_msg = None
+        if context:
+            rag_msg = llm.ChatMessage.create(role="system", text=f"{RAG_CONTEXT_HEADER}\n\n{context}")
+
+        tokens = {
+            "system": self.counter.message(head) if head else 0,
+            "rag": self.counter.message(rag_msg) if rag_msg else 0,
+            "user": self.counter.message(current) if current else 0,
+        }
+        remaining = self.max_tokens - sum(tokens.values())
+
+        # Newest turns first, verbatim, while they fit
+        turns = self._split_turns(history)
+        kept: List[List[Any]] = []
+        recent = turns[-self.recent_turns:] if self.recent_turns > 0 else []
+        for turn in reversed(recent):
+            cost = sum(self.counter.message(msg) for msg in turn)
+            if cost > remaining:
+                break
+            kept.insert(0, turn)
+            remaining -= cost
+        tokens["history"] = self.max_tokens - sum(tokens.values()) - remaining
+
+        collapsed = [msg for turn in turns[:len(turns) - len(kept)] for msg in turn]
+        for msg in collapsed:
+            line = self._collapse(msg)
+            if line:
+                summary.append(line)
+        metrics.voice_context_collapsed_messages_total.labels(action="collapsed").inc(len(collapsed))
+
+        # Then as many summary lines as fit, newest first
+        summary_msg = None
+        remaining -= self.counter.count(CONTEXT_SUMMARY_HEADER) + MESSAGE_OVERHEAD_TOKENS
+        fitted: List[str] = []
+        for line in reversed(summary):
+            cost = self.counter.count(line) + 1
+            if cost > remaining:
+                break
+            fitted.insert(0, line)
+            remaining -= cost
+        dropped = len(summary) - len(fitted)
+        if dropped:
+            metrics.voice_context_collapsed_messages_total.labels(action="dropped").inc(dropped)
+        if fitted:
+            summary_msg = llm.ChatMessage.create(
+                role="system", text=CONTEXT_SUMMARY_HEADER + "\n" + "\n".join(fitted)
+            )
+        tokens["summary"] = self.counter.message(summary_msg) if summary_msg else 0
+
+        rebuilt = [head] if head else []
+        if summary_msg:
+            rebuilt.append(summary_msg)
+        rebuilt.extend(msg for turn in kept for msg in turn)
+        if rag_msg:
+            rebuilt.append(rag_msg)
+        if current:
+            rebuilt.append(current)
+        chat_ctx.messages[:] = rebuilt
+
+        tokens["total"] = sum(tokens.values())
+        for part, count in tokens.items():
+            metrics.voice_llm_prompt_tokens.labels(part=part).observe(count)
+        return tokens
+
+    @staticmethod
+    def _split_turns(history: List[llm.ChatMessage]) -> List[List[llm.ChatMessage]]:
+        """Group messages into turns, each starting at a user message."""
+        turns: List[List[llm.ChatMessage]] = []
+        for msg in history:
+            if msg.role == "user" or not turns:
+                turns.append([])
+            turns[-1].append(msg)
+        return turns
+
+    def _collapse(self, msg: llm.ChatMessage) -> str:
+        if msg.role not in ("user", "assistant"):
+            return ""
+        text = " ".join(message_text(msg).split())
+        if not text:
+            return ""
+        if len(text) > self.summary_chars:
+            text = text[:self.summary_chars].rsplit(" ", 1)[0] + "…"
+        return f"{msg.role.capitalize()}: {text}"
+
+
+context_manager = ChatContextManager()
 
 
 async def before_llm_cb(agent: VoicePipelineAgent, chat_ctx: llm.ChatContext):
     """
     Called before every LLM invocation.
-    Injects RAG context from the latest user message into the chat context.
+    Injects RAG context from the latest user message into the chat context
+    and fits the context to the prompt token budget.
     """
+    context = ""
     user_msg = ""
     for msg in reversed(chat_ctx.messages):
         if msg.role == "user" and msg.content:
@@ -71,15 +326,24 @@ async def before_llm_cb(agent: VoicePipelineAgent, chat_ctx: llm.ChatContext):
             break
 
     if user_msg:
-        context = await fetch_rag_context(user_msg)
-        if context:
-            metrics.voice_rag_injections_total.labels(status="success").inc()
-            rag_msg = llm.ChatMessage.create(
-                role="system",
-                text=f"Use the following document context to answer the user's question:\n\n{context}",
-            )
-            chat_ctx.messages.insert(-1, rag_msg)
-        else:
-            metrics.voice_rag_injections_total.labels(status="empty").inc()
+        rag_start = time.perf_counter()
+        prefetcher = get_prefetcher(agent)
+        context = await prefetcher.take(user_msg) if prefetcher else None
+        status = "success"
+        if not context:
+            try:
+                context = await fetch_rag_context(user_msg)
+            except Exception as e:
+                logger.error(f"RAG retrieval failed: {e}")
+                context = ""
+                status = "error"
+        tracer = get_tracer(agent)
+        if tracer:
+            tracer.record("rag", time.perf_counter() - rag_start)
+        if status == "success" and not context:
+            status = "empty"
+        metrics.voice_rag_injections_total.labels(status=status).inc()
 
+    tokens = context_manager.prepare(chat_ctx, context)
+    logger.debug(f"LLM prompt tokens: {tokens}")
     return agent.llm.chat(chat_ctx=chat_ctx, fnc_ctx=agent.fnc_ctx)
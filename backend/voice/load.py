@@ -0,0 +1,119 @@
+"""
+Voice Agent Worker Load
+
+Reports how busy this worker is to the LiveKit dispatcher and refuses jobs
+it has no room for. Load is the higher of active sessions against
+AGENT_MAX_SESSIONS and host CPU, each scaled to 0-1. Once it reaches
+AGENT_LOAD_THRESHOLD the dispatcher stops routing rooms here, and any job
+offered before the next status update is rejected so another worker
+picks it up.
+
+Sessions run in child job processes, so the worker's own event loop says
+nothing about how they are doing; CPU is what a stalled session shows up
+as. Both inputs are read synchronously inside ``load_fnc``, which the
+worker may call off its event loop.
+"""
+import time
+import logging
+import threading
+from typing import Dict, Optional
+
+import psutil
+from livekit.agents import JobRequest, Worker
+
+from constants import ADMISSION_GRACE_SECONDS
+from settings import AGENT_MAX_SESSIONS, AGENT_LOAD_THRESHOLD, AGENT_METRICS_PORT
+from observability.metrics import metrics, serve_worker_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerLoad:
+    """Load calculation (``load_fnc``) and admission (``request_fnc``) for one worker."""
+
+    def __init__(
+        self,
+        max_sessions: int = AGENT_MAX_SESSIONS,
+        threshold: float = AGENT_LOAD_THRESHOLD,
+        metrics_port: int = AGENT_METRICS_PORT,
+    ):
+        self.max_sessions = max(1, max_sessions)
+        self.threshold = threshold
+        self.metrics_port = metrics_port
+
+        self.cpu = 0.0
+        self._started = False
+        self._worker: Optional[Worker] = None
+        # Accepted jobs the worker does not list as running yet; load_fnc
+        # may run on another thread than request_fnc
+        self._admitted: Dict[str, float] = {}
+        self._admitted_lock = threading.Lock()
+
+    def _start(self):
+        # Deferred to the first call: in dev mode the file-watcher parent
+        # process never reaches this point
+        self._started = True
+        metrics.voice_worker_max_sessions.set(self.max_sessions)
+        psutil.cpu_percent(interval=None)  # the first reading only sets the baseline
+        if self.metrics_port:
+            try:
+                # Serves from its own thread, whichever thread calls this;
+                # includes the job processes' session metrics
+                serve_worker_metrics(self.metrics_port)
+                logger.info(f"Serving worker metrics on port {self.metrics_port}")
+            except OSError as e:
+                logger.warning(f"Could not serve worker metrics on port {self.metrics_port}: {e}")
+
+    def _sample_cpu(self):
+        """Host CPU since the previous status update (the worker calls ``load_fnc`` periodically)."""
+        self.cpu = psutil.cpu_percent(interval=None) / 100
+
+    def sessions(self) -> int:
+        running = {info.job.id for info in self._worker.active_jobs} if self._worker else set()
+        now = time.monotonic()
+        with self._admitted_lock:
+            self._admitted = {
+                job_id: admitted_at for job_id, admitted_at in self._admitted.items()
+                if job_id not in running and now - admitted_at < ADMISSION_GRACE_SECONDS
+            }
+            return len(running) + len(self._admitted)
+
+    def current(self) -> float:
+        sessions = self.sessions()
+        parts = {
+            "sessions": sessions / self.max_sessions,
+            "cpu": self.cpu,
+        }
+        load = min(1.0, max(parts.values()))
+        for source, value in parts.items():
+            metrics.voice_worker_load.labels(source=source).set(value)
+        metrics.voice_worker_load.labels(source="total").set(load)
+        metrics.voice_worker_active_sessions.set(sessions)
+        return load
+
+    def load_fnc(self, worker: Worker) -> float:
+        """``WorkerOptions.load_fnc``: called by the worker before each status update."""
+        if not self._started:
+            self._start()
+        self._worker = worker
+        self._sample_cpu()
+        return self.current()
+
+    async def request_fnc(self, request: JobRequest):
+        """``WorkerOptions.request_fnc``: admit the job unless it would push this worker past the threshold."""
+        load = self.current()
+        # One more session must still fit, so this check lands before the dispatcher sees us full
+        with_job = max(load, (self.sessions() + 1) / self.max_sessions)
+        if load >= self.threshold or with_job > 1.0:
+            metrics.voice_worker_jobs_total.labels(decision="rejected").inc()
+            logger.warning(
+                f"Rejecting job {request.job.id}: load={load:.2f} sessions={self.sessions()} cpu={self.cpu:.0%}"
+            )
+            await request.reject()
+            return
+
+        with self._admitted_lock:
+            self._admitted[request.job.id] = time.monotonic()
+        metrics.voice_worker_jobs_total.labels(decision="accepted").inc()
+        logger.info(f"Accepting job {request.job.id}: load={load:.2f} sessions={self.sessions()}")
+        await request.accept()
@@ -0,0 +1,146 @@
+"""
+Speculative RAG Prefetch
+
+Starts retrieval from interim and per-segment transcripts while the user
+is still speaking, so before_llm_cb can reuse the result instead of
+waiting for a fresh retrieval after the final transcript.
+"""
+import time
+import asyncio
+import logging
+import weakref
+from difflib import SequenceMatcher
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from rag.cache import normalize_query
+from settings import (
+    RAG_PREFETCH_MIN_WORDS,
+    RAG_PREFETCH_DEBOUNCE_MS,
+    RAG_PREFETCH_MATCH_THRESHOLD,
+)
+from observability.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_prefetchers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def attach_prefetcher(agent, prefetcher: "SpeculativePrefetcher"):
+    _prefetchers[agent] = prefetcher
+
+
+def get_prefetcher(agent) -> Optional["SpeculativePrefetcher"]:
+    return _prefetchers.get(agent)
+
+
+def transcript_similarity(a: str, b: str) -> float:
+    return SequenceMatcher(None, a.split(), b.split()).ratio()
+
+
+class SpeculativePrefetcher:
+    """Runs retrieval for the user's turn-so-far, keeping only the latest request.
+
+    A transcript has to stay unchanged for the debounce window before a
+    retrieval starts, and each new retrieval cancels the one it supersedes.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[str]],
+        min_words: int = RAG_PREFETCH_MIN_WORDS,
+        debounce_ms: float = RAG_PREFETCH_DEBOUNCE_MS,
+        match_threshold: float = RAG_PREFETCH_MATCH_THRESHOLD,
+    ):
+        self._fetch = fetch
+        self.min_words = min_words
+        self.debounce = debounce_ms / 1000
+        self.match_threshold = match_threshold
+        self._segments: List[str] = []
+        self._debounce_handle: Optional[asyncio.TimerHandle] = None
+        self._query: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def on_transcript(self, text: str, is_final: bool):
+        """Feed an STT transcript; final segments accumulate until the turn is taken."""
+        text = text.strip()
+        if not text:
+            return
+        if is_final:
+            self._segments.append(text)
+            self._schedule(" ".join(self._segments))
+        else:
+            self._schedule(" ".join([*self._segments, text]))
+
+    def _schedule(self, text: str):
+        if len(text.split()) < self.min_words:
+            return
+        if self._debounce_handle is not None:
+            self._debounce_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._debounce_handle = loop.call_later(self.debounce, self._launch, text)
+
+    def _launch(self, text: str):
+        self._debounce_handle = None
+        query = normalize_query(text)
+        if query == self._query:
+            return
+
+        self._cancel_task()
+        self._query = query
+        self._task = asyncio.ensure_future(self._run(text))
+        logger.debug(f"Prefetching RAG context for: {text}")
+
+    async def _run(self, text: str) -> Tuple[Optional[str], float, float]:
+        # Failures come back as None: a superseded task's exception is never awaited
+        started = time.perf_counter()
+        try:
+            context = await self._fetch(text)
+        except Exception as e:
+            logger.warning(f"Prefetched RAG retrieval failed: {e}")
+            context = None
+        return context, started, time.perf_counter()
+
+    def _cancel_task(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            metrics.voice_rag_prefetch_total.labels(outcome="cancelled").inc()
+        self._task = None
+        self._query = None
+
+    async def take(self, final_text: str) -> Optional[str]:
+        """Return the prefetched context if it was retrieved for a query close to ``final_text``.
+
+        Returns None on a miss, and when the prefetch failed or came back
+        empty (e.g. a partial transcript with no matches); the caller then
+        retrieves normally. Either way the prefetcher is reset for the next turn.
+        """
+        if self._debounce_handle is not None:
+            self._debounce_handle.cancel()
+            self._debounce_handle = None
+        task, query = self._task, self._query
+        self._task, self._query, self._segments = None, None, []
+
+        if task is None:
+            metrics.voice_rag_prefetch_total.labels(outcome="none").inc()
+            return None
+
+        if transcript_similarity(query, normalize_query(final_text)) < self.match_threshold:
+            if not task.done():
+                task.cancel()
+            metrics.voice_rag_prefetch_total.labels(outcome="miss").inc()
+            return None
+
+        waited_from = time.perf_counter()
+        context, started, finished = await task
+        if context is None:
+            metrics.voice_rag_prefetch_total.labels(outcome="error").inc()
+            return None
+        if not context:
+            metrics.voice_rag_prefetch_total.labels(outcome="empty").inc()
+            return None
+
+        # Retrieval time that overlapped the user's speech instead of delaying the reply
+        saved = (finished - started) - (time.perf_counter() - waited_from)
+        metrics.voice_rag_prefetch_total.labels(outcome="hit").inc()
+        metrics.voice_rag_prefetch_saved_seconds.observe(max(0.0, saved))
+        return context
@@ -0,0 +1,121 @@
+"""
+Agent Worker Prewarm
+
+LiveKit starts job processes ahead of demand and calls ``prewarm`` in each
+one while it is idle. Everything a session needs that does not depend on
+the room — VAD weights, the STT/LLM/TTS plugin instances and their shared
+OpenAI client, the in-process RAG model — is loaded there and kept in
+``proc.userdata``, so a new room only pays for connecting and building the
+pipeline. Prewarm does no network I/O; the system prompt is fetched by the
+job while the room connects. It must finish within AGENT_PREWARM_TIMEOUT
+(``initialize_process_timeout``), which has to cover the in-process RAG
+model load and BM25 index build on the real corpus.
+
+The shared plugin instances assume the default process executor, where
+a job process serves one session at a time: their HTTP connection pool
+is bound to the event loop of the job that first uses it.
+"""
+import time
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+from openai import AsyncClient
+from livekit.agents import JobProcess
+from livekit.plugins import silero
+
+from constants import OPENAI_HTTP_MAX_CONNECTIONS
+from settings import RAG_MODE, LLM_MODEL, HTTP_TIMEOUT_OPENAI_CONNECT
+from voice.stt import create_base_stt
+from voice.llm import create_llm, get_local_rag_service
+from voice.tts import create_tts
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Logs how long each startup step took and the total."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.steps: Dict[str, float] = {}
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, step: str):
+        now = time.perf_counter()
+        self.steps[step] = now - self._last
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return self._last - self._start
+
+    def log(self, **extra):
+        steps = ", ".join(f"{step}={seconds * 1000:.0f}ms" for step, seconds in self.steps.items())
+        details = "".join(f" {key}={value}" for key, value in extra.items())
+        logger.info(f"{self.label} took {self.total * 1000:.0f}ms ({steps}){details}")
+
+
+def create_openai_client() -> AsyncClient:
+    """One OpenAI client for the STT, LLM and TTS plugins, so they share warm connections."""
+    return AsyncClient(
+        max_retries=0,
+        http_client=httpx.AsyncClient(
+            timeout=httpx.Timeout(connect=HTTP_TIMEOUT_OPENAI_CONNECT, read=5.0, write=5.0, pool=5.0),
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=OPENAI_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=120,
+            ),
+        ),
+    )
+
+
+def load_components(timer: Optional[StartupTimer] = None, load_rag: bool = True) -> Dict[str, Any]:
+    """Load the room-independent pipeline components (no network access)."""
+    timer = timer or StartupTimer("Component load")
+    components: Dict[str, Any] = {}
+
+    components["vad"] = silero.VAD.load()
+    timer.mark("vad")
+
+    client = create_openai_client()
+    components["openai_client"] = client
+    components["stt"] = create_base_stt(client)
+    components["llm"] = create_llm(client)
+    components["tts"] = create_tts(client)
+    timer.mark("plugins")
+
+    if load_rag and RAG_MODE == "inprocess":
+        get_local_rag_service()
+        timer.mark("rag_model")
+    return components
+
+
+def prewarm(proc: JobProcess):
+    """``WorkerOptions.prewarm_fnc``: load shared components once per job process."""
+    timer = StartupTimer("Worker prewarm")
+    proc.userdata.update(load_components(timer))
+    timer.log(pid=proc.pid)
+
+
+async def warm_connections(client: AsyncClient):
+    """Open a connection to the OpenAI API from the job's event loop before the first turn."""
+    start = time.perf_counter()
+    try:
+        await client.models.retrieve(LLM_MODEL, timeout=HTTP_TIMEOUT_OPENAI_CONNECT)
+        logger.info(f"OpenAI connection warmed in {(time.perf_counter() - start) * 1000:.0f}ms")
+    except Exception as e:
+        logger.warning(f"OpenAI connection warm-up failed: {e}")
+
+
+def get_components(proc: JobProcess, timer: StartupTimer) -> Dict[str, Any]:
+    """The prewarmed components, or a cold load when the process was not prewarmed."""
+    if proc.userdata.get("vad") is not None:
+        return proc.userdata
+    logger.warning("Job process was not prewarmed; loading components cold")
+    # The RAG model is loaded off the event loop by the entrypoint
+    components = load_components(timer, load_rag=False)
+    proc.userdata.update(components)
+    return components
@@ -0,0 +1,77 @@
+"""
+System Prompt Watcher
+
+Keeps the worker's copy of the system prompt current by long-polling the
+backend's /prompt/watch endpoint, and pushes changes into the running
+session's chat context.
+"""
+import asyncio
+import logging
+from typing import Callable, Optional, Tuple
+
+from settings import HTTP_TIMEOUT_PROMPT, PROMPT_WATCH_TIMEOUT
+from voice import backend_client
+
+logger = logging.getLogger(__name__)
+
+_prompt: Optional[str] = None
+_etag: Optional[str] = None
+
+
+def cached_prompt() -> Tuple[Optional[str], Optional[str]]:
+    """The last prompt seen by this worker process and its ETag."""
+    return _prompt, _etag
+
+
+def remember(prompt: str, etag: Optional[str]):
+    global _prompt, _etag
+    _prompt, _etag = prompt, etag
+
+
+class PromptWatcher:
+    """Long-polls for prompt changes and calls ``on_change`` with each new prompt."""
+
+    def __init__(self, on_change: Callable[[str], None]):
+        self._on_change = on_change
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        failures = 0
+        while True:
+            _, etag = cached_prompt()
+            try:
+                resp = await backend_client.request(
+                    "GET", "/prompt/watch", endpoint="prompt_watch",
+                    timeout=PROMPT_WATCH_TIMEOUT + HTTP_TIMEOUT_PROMPT,
+                    params={"timeout": PROMPT_WATCH_TIMEOUT},
+                    headers={"If-None-Match": etag} if etag else None,
+                )
+            except Exception as e:
+                failures += 1
+                logger.warning(f"Prompt watch failed, retrying: {e}")
+                await asyncio.sleep(min(30.0, 2.0 ** failures))
+                continue
+
+            failures = 0
+            if resp.status_code == 200:
+                prompt = resp.json().get("system_prompt")
+                changed = prompt != cached_prompt()[0]
+                remember(prompt, resp.headers.get("etag"))
+                if changed:
+                    logger.info("System prompt changed on the backend")
+                    self._on_change(prompt)
+            elif resp.status_code != 304:
+                logger.warning(f"Prompt watch returned {resp.status_code}")
+                await asyncio.sleep(PROMPT_WATCH_TIMEOUT)
@@ -2,12 +2,81 @@
 STT (Speech-to-Text) Service Component
 """
 import logging
+from typing import Callable, List, Optional
+
+from openai import AsyncClient
+from livekit.agents import stt
 from livekit.plugins import openai
 from settings import STT_MODEL
 
 logger = logging.getLogger(__name__)
 
+TranscriptListener = Callable[[str, bool], None]
+
+
+class TranscriptTapSTT(stt.STT):
+    """Wraps an STT and reports every transcript it produces to listeners.
+
+    Listeners receive (text, is_final). Used to start speculative RAG
+    retrieval before the pipeline commits the user's turn.
+    """
+
+    def __init__(self, wrapped: stt.STT):
+        super().__init__(capabilities=wrapped.capabilities)
+        self._wrapped = wrapped
+        self._listeners: List[TranscriptListener] = []
+
+    def add_transcript_listener(self, listener: TranscriptListener):
+        self._listeners.append(listener)
+
+    def _notify(self, event: stt.SpeechEvent):
+        if not event.alternatives:
+            return
+        if event.type == stt.SpeechEventType.FINAL_TRANSCRIPT:
+            is_final = True
+        elif event.type == stt.SpeechEventType.INTERIM_TRANSCRIPT:
+            is_final = False
+        else:
+            return
+        for listener in self._listeners:
+            try:
+                listener(event.alternatives[0].text, is_final)
+            except Exception as e:
+                logger.warning(f"Transcript listener failed: {e}")
+
+    async def _recognize_impl(self, buffer, **kwargs) -> stt.SpeechEvent:
+        event = await self._wrapped.recognize(buffer, **kwargs)
+        self._notify(event)
+        return event
+
+    def stream(self, **kwargs):
+        return _TapSpeechStream(self._wrapped.stream(**kwargs), self._notify)
 
-def create_stt() -> openai.STT:
+
+class _TapSpeechStream:
+    """Delegating speech stream that reports each event it yields."""
+
+    def __init__(self, inner, notify: Callable[[stt.SpeechEvent], None]):
+        self._inner = inner
+        self._notify = notify
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> stt.SpeechEvent:
+        event = await self._inner.__anext__()
+        self._notify(event)
+        return event
+
+
+def create_base_stt(client: Optional[AsyncClient] = None) -> openai.STT:
     logger.info(f"Initializing STT service with model: {STT_MODEL}")
-    return openai.STT(model=STT_MODEL)
+    return openai.STT(model=STT_MODEL, client=client)
+
+
+def create_stt(wrapped: Optional[stt.STT] = None) -> TranscriptTapSTT:
+    """A per-session tap; transcript listeners belong to one session, the wrapped STT may be shared."""
+    return TranscriptTapSTT(wrapped or create_base_stt())
@@ -0,0 +1,107 @@
+"""
+Per-turn voice latency tracing.
+
+Builds one trace per user turn from VoicePipelineAgent events and the
+pipeline metrics it emits, then reports it to the backend:
+
+    vad       end of speech → end of utterance decided
+    stt       end of speech → final transcript
+    rag       retrieval inside before_llm_cb
+    llm_ttft  LLM time to first token
+    tts_ttfb  TTS time to first audio byte
+    e2e       user stopped speaking → agent audio started
+"""
+import time
+import uuid
+import asyncio
+import logging
+import weakref
+from typing import Optional, Set
+
+from settings import HTTP_TIMEOUT_TRACE, VOICE_TRACE_REPORT_ENABLED
+from voice import backend_client
+
+logger = logging.getLogger(__name__)
+
+_tracers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_tracer(agent) -> Optional["TurnTracer"]:
+    return _tracers.get(agent)
+
+
+async def report_turn(trace: dict):
+    """POST a finished turn to the backend ring buffer."""
+    try:
+        await backend_client.request(
+            "POST", "/voice/turns", endpoint="turns", timeout=HTTP_TIMEOUT_TRACE, json=trace,
+        )
+    except Exception as e:
+        logger.warning(f"Could not report turn trace: {e}")
+
+
+class TurnTracer:
+    """Collects stage timings for the turn in progress."""
+
+    def __init__(self, room: Optional[str] = None, report=report_turn):
+        self.room = room
+        self._report = report
+        self._turn: Optional[dict] = None
+        self._stopped_speaking_at: Optional[float] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    def attach(self, agent):
+        _tracers[agent] = self
+        agent.on("user_started_speaking", self._on_user_started)
+        agent.on("user_stopped_speaking", self._on_user_stopped)
+        agent.on("agent_started_speaking", self._on_agent_started)
+        agent.on("agent_stopped_speaking", self._on_agent_stopped)
+        agent.on("metrics_collected", self._on_metrics)
+
+    def record(self, stage: str, seconds: float):
+        if self._turn is not None:
+            self._turn["stages"][stage] = seconds
+
+    def _on_user_started(self, *_):
+        if self._turn is not None:
+            # The user spoke again before the agent finished: barge-in or a retried turn
+            self._turn["interrupted"] = True
+            self._finish()
+        self._turn = {
+            "turn_id": uuid.uuid4().hex,
+            "room": self.room,
+            "started_at": time.time(),
+            "interrupted": False,
+            "stages": {},
+        }
+        self._stopped_speaking_at = None
+
+    def _on_user_stopped(self, *_):
+        self._stopped_speaking_at = time.perf_counter()
+
+    def _on_agent_started(self, *_):
+        if self._turn is not None and self._stopped_speaking_at is not None:
+            self.record("e2e", time.perf_counter() - self._stopped_speaking_at)
+            self._stopped_speaking_at = None
+
+    def _on_agent_stopped(self, *_):
+        if self._turn is not None:
+            self._finish()
+
+    def _on_metrics(self, collected, *_):
+        if getattr(collected, "end_of_utterance_delay", None) is not None:
+            self.record("vad", collected.end_of_utterance_delay)
+            self.record("stt", collected.transcription_delay)
+        elif getattr(collected, "ttft", None) is not None:
+            self.record("llm_ttft", collected.ttft)
+        elif getattr(collected, "ttfb", None) is not None:
+            self.record("tts_ttfb", collected.ttfb)
+
+    def _finish(self):
+        trace, self._turn = self._turn, None
+        logger.debug(f"Turn trace: {trace}")
+        if not VOICE_TRACE_REPORT_ENABLED or not trace["stages"]:
+            return
+        task = asyncio.ensure_future(self._report(trace))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
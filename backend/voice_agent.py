@@ -8,19 +8,55 @@ Wires together the separate pipeline components:
   4. KB   (services.rag_service)      — Knowledge Base ingestion + retrieval
 
 The agent connects to a LiveKit room and runs the voice pipeline
-for each participant.
+for each participant. Room-independent components are loaded once per
+job process by the prewarm stage and shared across sessions, and the
+worker reports its load so the dispatcher spreads rooms across workers.
 """
+import os
+import shutil
+import asyncio
 import logging
+
+from settings import AGENT_METRICS_PORT, AGENT_METRICS_DIR
+
+if AGENT_METRICS_PORT:
+    # Sessions run in job processes, but only this process serves
+    # AGENT_METRICS_PORT: every process writes its samples to a shared
+    # directory instead. Must be set before prometheus_client is imported.
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        # Job processes re-import this module with the variable inherited;
+        # only the worker starts from an empty directory
+        shutil.rmtree(AGENT_METRICS_DIR, ignore_errors=True)
+        os.makedirs(AGENT_METRICS_DIR, exist_ok=True)
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = AGENT_METRICS_DIR
+
 from livekit.agents import AutoSubscribe, JobContext, WorkerOptions, cli, llm
 from livekit.agents.pipeline import VoicePipelineAgent
-from livekit.plugins import silero
 
+import executor
 from observability.logging_config import setup_logging
-from settings import LOG_LEVEL
+from observability.metrics import mark_process_exited
+from settings import LOG_LEVEL, RAG_MODE, RAG_PREFETCH_ENABLED, AGENT_PREWARM_TIMEOUT
 
 setup_logging(level=LOG_LEVEL)
 
-from voice import create_stt, create_llm, create_tts, fetch_system_prompt, before_llm_cb
+from voice import (
+    create_stt,
+    fetch_system_prompt,
+    before_llm_cb,
+    close_backend_client,
+    get_local_rag_service,
+    fetch_rag_context,
+    SpeculativePrefetcher,
+    attach_prefetcher,
+    TurnTracer,
+    PromptWatcher,
+    prewarm,
+    get_components,
+    warm_connections,
+    StartupTimer,
+    WorkerLoad,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,32 +64,88 @@ logger = logging.getLogger(__name__)
 async def entrypoint(ctx: JobContext):
     """Main entrypoint for LiveKit agent."""
     logger.info("Starting voice agent")
+    timer = StartupTimer(f"Session start for room {ctx.room.name}")
+    warm = ctx.proc.userdata.get("vad") is not None
+    components = get_components(ctx.proc, timer)
+
+    # Backend client is pooled per worker process; release it with the job
+    ctx.add_shutdown_callback(close_backend_client)
+
+    async def release_metrics():
+        mark_process_exited()
+
+    ctx.add_shutdown_callback(release_metrics)
+
+    # Handshake with OpenAI and revalidate the prompt while the room connects
+    warmup = asyncio.ensure_future(warm_connections(components["openai_client"]))
+    prompt_fetch = asyncio.ensure_future(fetch_system_prompt())
+
+    if RAG_MODE == "inprocess":
+        # Load the embedding model before the first user turn (no-op when prewarmed)
+        await executor.run("rag_load", get_local_rag_service)
+        timer.mark("rag_model")
 
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
+    timer.mark("connect")
 
     participant = await ctx.wait_for_participant()
     logger.info(f"Participant joined: {participant.identity}")
+    timer.mark("participant")
 
     # --- Build pipeline from separate components ---
-    system_prompt = await fetch_system_prompt()
+    system_prompt = await prompt_fetch
+    timer.mark("prompt")
 
     initial_ctx = llm.ChatContext()
     initial_ctx.append(role="system", text=system_prompt)
 
+    # The tap is per session: its transcript listeners belong to this room
+    stt = create_stt(components["stt"])
+    prefetcher = None
+    if RAG_PREFETCH_ENABLED:
+        # Start retrieval from interim transcripts, before the turn is committed
+        prefetcher = SpeculativePrefetcher(fetch_rag_context)
+        stt.add_transcript_listener(prefetcher.on_transcript)
+
     agent = VoicePipelineAgent(
-        vad=silero.VAD.load(),
-        stt=create_stt(),           # 1. STT component
-        llm=create_llm(),           # 2. LLM component
-        tts=create_tts(),           # 3. TTS component
+        vad=components["vad"],
+        stt=stt,                    # 1. STT component
+        llm=components["llm"],      # 2. LLM component
+        tts=components["tts"],      # 3. TTS component
         chat_ctx=initial_ctx,
         before_llm_cb=before_llm_cb,  # 4. KB/RAG injection
     )
 
+    if prefetcher:
+        attach_prefetcher(agent, prefetcher)
+    # Per-turn stage latencies, reported to the backend's /voice/turns buffer
+    TurnTracer(room=ctx.room.name).attach(agent)
+
+    def apply_prompt(prompt: str):
+        # The first message of the chat context is the system prompt
+        agent.chat_ctx.messages[0].content = prompt
+
+    # Push prompt edits into this session instead of re-fetching per turn
+    prompt_watcher = PromptWatcher(apply_prompt)
+    prompt_watcher.start()
+    ctx.add_shutdown_callback(prompt_watcher.stop)
+
     agent.start(ctx.room, participant)
+    timer.mark("agent_start")
+    timer.log(warm=warm, openai_warmed=warmup.done())
     logger.info("Voice agent started and ready")
 
 
 if __name__ == "__main__":
+    # Reports sessions and CPU to the dispatcher; refuses jobs when full
+    worker_load = WorkerLoad()
     cli.run_app(
-        WorkerOptions(entrypoint_fnc=entrypoint),
+        WorkerOptions(
+            entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
+            initialize_process_timeout=AGENT_PREWARM_TIMEOUT,
+            request_fnc=worker_load.request_fnc,
+            load_fnc=worker_load.load_fnc,
+            load_threshold=worker_load.threshold,
+        ),
     )
@@ -13,8 +13,15 @@ function App() {
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
 
-  const { documents, uploading, handleFileUpload, handleDeleteDocument } =
-    useDocuments({ setError, setSuccess });
+  const {
+    documents,
+    stats,
+    hasMoreDocuments,
+    loadMoreDocuments,
+    uploading,
+    handleFileUpload,
+    handleDeleteDocument,
+  } = useDocuments({ setError, setSuccess });
 
   const { systemPrompt, setSystemPrompt, handleUpdatePrompt } =
     usePrompt({ setError, setSuccess });
@@ -34,6 +41,9 @@ function App() {
 
         <KnowledgeBase
           documents={documents}
+          stats={stats}
+          hasMoreDocuments={hasMoreDocuments}
+          onLoadMore={loadMoreDocuments}
           uploading={uploading}
           onFileUpload={handleFileUpload}
           onDeleteDocument={handleDeleteDocument}
@@ -1,18 +1,29 @@
 import React from 'react';
 import styles from './KnowledgeBase.module.css';
 
-function KnowledgeBase({ documents, uploading, onFileUpload, onDeleteDocument }) {
+function KnowledgeBase({
+  documents,
+  stats,
+  hasMoreDocuments,
+  onLoadMore,
+  uploading,
+  onFileUpload,
+  onDeleteDocument,
+}) {
+  const documentCount = stats ? stats.document_count : documents.length;
+
   return (
     <section className="card">
       <h2>Knowledge Base</h2>
       <div className={styles.uploadSection}>
         <label htmlFor="file-upload" className={styles.uploadButton}>
-          {uploading ? 'Uploading...' : 'Upload Document (PDF/TXT)'}
+          {uploading ? 'Uploading...' : 'Upload Documents (PDF/TXT/ZIP)'}
         </label>
         <input
           id="file-upload"
           type="file"
-          accept=".pdf,.txt"
+          accept=".pdf,.txt,.zip"
+          multiple
           onChange={onFileUpload}
           disabled={uploading}
           style={{ display: 'none' }}
@@ -20,13 +31,18 @@ function KnowledgeBase({ documents, uploading, onFileUpload, onDeleteDocument })
       </div>
 
       <div className={styles.documentsList}>
-        <h3>Uploaded Documents ({documents.length})</h3>
+        <h3>Uploaded Documents ({documentCount})</h3>
+        {stats && (
+          <p className={styles.docMeta}>
+            {stats.total_chunks} chunks • {(stats.total_bytes / 1024).toFixed(1)} KB total
+          </p>
+        )}
         {documents.length === 0 ? (
           <p className="empty-state">No documents uploaded yet</p>
         ) : (
           <ul>
             {documents.map((doc, index) => (
-              <li key={index}>
+              <li key={`${doc.filename}-${index}`}>
                 <div className={styles.docInfo}>
                   <strong>{doc.filename}</strong>
                   <span className={styles.docMeta}>
@@ -47,6 +63,11 @@ function KnowledgeBase({ documents, uploading, onFileUpload, onDeleteDocument })
             ))}
           </ul>
         )}
+        {hasMoreDocuments && (
+          <button className={styles.loadMoreButton} onClick={onLoadMore}>
+            Load more
+          </button>
+        )}
       </div>
     </section>
   );
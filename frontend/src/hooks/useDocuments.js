@@ -1,29 +1,54 @@
 import { useState, useEffect, useCallback } from 'react';
 import api from '../services/apiClient';
 
+const PAGE_SIZE = 50;
+
 function useDocuments({ setError, setSuccess }) {
   const [documents, setDocuments] = useState([]);
+  const [stats, setStats] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
   const [uploading, setUploading] = useState(false);
 
+  // Refresh reloads only the first page; older documents are fetched on demand
   const loadDocuments = useCallback(async () => {
     try {
-      const response = await api.get('/documents');
-      setDocuments(response.data);
+      const [page, totals] = await Promise.all([
+        api.get('/documents', { params: { limit: PAGE_SIZE } }),
+        api.get('/documents/stats'),
+      ]);
+      setDocuments(page.data);
+      setNextCursor(page.headers['x-next-cursor'] || null);
+      setStats(totals.data);
     } catch (err) {
       console.error('Error loading documents:', err);
     }
   }, []);
 
+  const loadMoreDocuments = useCallback(async () => {
+    if (!nextCursor) return;
+    try {
+      const response = await api.get('/documents', {
+        params: { limit: PAGE_SIZE, cursor: nextCursor },
+      });
+      setDocuments((prev) => [...prev, ...response.data]);
+      setNextCursor(response.headers['x-next-cursor'] || null);
+    } catch (err) {
+      console.error('Error loading more documents:', err);
+    }
+  }, [nextCursor]);
+
   useEffect(() => {
     loadDocuments();
   }, [loadDocuments]);
 
   const handleFileUpload = useCallback(async (event) => {
-    const file = event.target.files[0];
-    if (!file) return;
+    const files = Array.from(event.target.files);
+    if (!files.length) return;
 
-    if (!file.name.endsWith('.pdf') && !file.name.endsWith('.txt')) {
-      setError('Only PDF and TXT files are supported');
+    const supported = files.filter((file) => /\.(pdf|txt|zip)$/.test(file.name));
+    if (supported.length < files.length) {
+      setError('Only PDF and TXT files (or zip archives of them) are supported');
+      event.target.value = '';
       return;
     }
 
@@ -32,19 +57,31 @@ function useDocuments({ setError, setSuccess }) {
 
     try {
       const formData = new FormData();
-      formData.append('file', file);
-
-      const response = await api.post('/upload-document', formData, {
-        headers: { 'Content-Type': 'multipart/form-data' },
-      });
-
-      setSuccess(`Document uploaded: ${response.data.chunks_created} chunks created`);
+      // A single document keeps the per-file endpoint; several go through bulk ingestion
+      if (files.length === 1 && !files[0].name.endsWith('.zip')) {
+        formData.append('file', files[0]);
+        const response = await api.post('/upload-document', formData, {
+          headers: { 'Content-Type': 'multipart/form-data' },
+        });
+        setSuccess(`Document uploaded: ${response.data.chunks_created} chunks created`);
+      } else {
+        files.forEach((file) => formData.append('files', file));
+        const response = await api.post('/upload-documents', formData, {
+          headers: { 'Content-Type': 'multipart/form-data' },
+        });
+        const { files_processed, files_failed, chunks_created, results } = response.data;
+        setSuccess(`${files_processed} documents uploaded: ${chunks_created} chunks created`);
+        if (files_failed) {
+          const failed = results.filter((result) => result.status !== 'success');
+          setError(`Failed: ${failed.map((result) => `${result.filename} (${result.error})`).join(', ')}`);
+        }
+      }
       setTimeout(() => setSuccess(''), 3000);
       await loadDocuments();
     } catch (err) {
-      console.error('Error uploading document:', err);
+      console.error('Error uploading documents:', err);
       const detail = err.response?.data?.detail;
-      setError(detail || 'Failed to upload document. Please check your connection and try again.');
+      setError(detail || 'Failed to upload documents. Please check your connection and try again.');
     } finally {
       setUploading(false);
       event.target.value = '';
@@ -65,7 +102,15 @@ function useDocuments({ setError, setSuccess }) {
     }
   }, [loadDocuments, setError, setSuccess]);
 
-  return { documents, uploading, handleFileUpload, handleDeleteDocument };
+  return {
+    documents,
+    stats,
+    hasMoreDocuments: Boolean(nextCursor),
+    loadMoreDocuments,
+    uploading,
+    handleFileUpload,
+    handleDeleteDocument,
+  };
 }
 
 export default useDocuments;